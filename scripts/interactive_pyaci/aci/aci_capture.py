@@ -0,0 +1,122 @@
+# Copyright (c) 2010 - 2019, Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of Nordic Semiconductor ASA nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY, AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL NORDIC SEMICONDUCTOR ASA OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Binary capture of the raw serial stream.
+
+A capture file starts with CAPTURE_MAGIC, followed by one record per frame:
+a little endian u64 timestamp in nanoseconds from the monotonic clock, a u8
+direction (RX or TX, as seen from the host) and the raw frame, whose first
+byte is its own length.
+"""
+
+import struct
+import threading
+import time
+
+from aci.aci_uart import CAPTURE_TX as TX
+from aci.aci_event_store import monotonic_ns
+
+
+CAPTURE_MAGIC = b"ACICAP\x01\x00"
+RECORD_HEADER = struct.Struct("<QB")
+
+
+class CaptureWriter(object):
+    """Capture sink for `Device.set_capture()`.
+
+    Records go through a large write buffer, so the cost per frame is a
+    struct pack and a memory copy. Frames may come from both the reader and
+    the writer thread.
+    """
+    def __init__(self, path, buffering=1 << 16):
+        self._file = open(path, "wb", buffering=buffering)
+        self._file.write(CAPTURE_MAGIC)
+        self._lock = threading.Lock()
+
+    def write(self, direction, frame):
+        header = RECORD_HEADER.pack(monotonic_ns(), direction)
+        with self._lock:
+            self._file.write(header)
+            self._file.write(frame)
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def read_capture(path):
+    """Yields (timestamp_ns, direction, frame) for each record in a capture."""
+    with open(path, "rb") as f:
+        if f.read(len(CAPTURE_MAGIC)) != CAPTURE_MAGIC:
+            raise ValueError("{} is not a capture file".format(path))
+
+        while True:
+            # The record header and the length byte of the frame
+            header = f.read(RECORD_HEADER.size + 1)
+            if len(header) < RECORD_HEADER.size + 1:
+                break
+            timestamp, direction = RECORD_HEADER.unpack_from(header)
+            frame = bytearray(header[-1:])
+            frame += f.read(frame[0])
+            if len(frame) < frame[0] + 1:
+                # Truncated by an unclean shutdown
+                break
+            yield timestamp, direction, frame
+
+
+def replay(device, path, realtime=False, speed=1.0):
+    """Feeds the frames received in a capture through the receive path of `device`.
+
+    Transmitted frames are passed to `device.process_command()`. With
+    `realtime`, the original pacing is kept (scaled by `speed`), otherwise
+    the frames are fed as fast as the device handles them. Returns the number
+    of events processed.
+    """
+    count = 0
+    start = None
+    for timestamp, direction, frame in read_capture(path):
+        if realtime:
+            if start is None:
+                start = (timestamp, time.monotonic())
+            delay = start[1] + (timestamp - start[0]) / (1e9 * speed) - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+        if direction == TX:
+            device.process_command(frame)
+            continue
+
+        if device._receive_frame(frame):
+            count += 1
+    return count
@@ -27,8 +27,8 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
-# This file was autogenerated by serial_doc_gen_pyaci.py at 2019-05-10 12:51:27.
-from aci.aci_utils import CommandPacket, ResponsePacket, value_to_barray, iterable_to_barray, barray_pop
+# This file was autogenerated by serial_doc_gen_pyaci.py at 2026-10-18 19:28:28.
+from aci.aci_utils import CommandPacket, ResponsePacket, iterable_to_barray
 from aci.aci_evt import CmdRsp
 import struct
 
@@ -74,6 +74,9 @@ class RadioReset(CommandPacket):
         super(RadioReset, self).__init__(0x0E, __data)
 
 
+_BEACON_START = struct.Struct("<B")
+
+
 class BeaconStart(CommandPacket):
     """Start an application controlled beacon with the given payload.
 
@@ -85,12 +88,15 @@ class BeaconStart(CommandPacket):
             Beacon payload.
     """
     def __init__(self, beacon_slot, data):
-        __data = bytearray()
-        __data += struct.pack("<B", beacon_slot)
+        __data = bytearray(_BEACON_START.size)
+        _BEACON_START.pack_into(__data, 0, beacon_slot)
         __data += iterable_to_barray(data)
         super(BeaconStart, self).__init__(0x10, __data)
 
 
+_BEACON_STOP = struct.Struct("<B")
+
+
 class BeaconStop(CommandPacket):
     """Stop transmitting the current beacon.
 
@@ -100,11 +106,14 @@ class BeaconStop(CommandPacket):
             Slot number of the beacon to stop.
     """
     def __init__(self, beacon_slot):
-        __data = bytearray()
-        __data += struct.pack("<B", beacon_slot)
+        __data = bytearray(_BEACON_STOP.size)
+        _BEACON_STOP.pack_into(__data, 0, beacon_slot)
         super(BeaconStop, self).__init__(0x11, __data)
 
 
+_BEACON_PARAMS_GET = struct.Struct("<B")
+
+
 class BeaconParamsGet(CommandPacket):
     """Set parameters for application controlled beacon.
 
@@ -114,11 +123,14 @@ class BeaconParamsGet(CommandPacket):
             Slot number of the beacon to get the parameters of.
     """
     def __init__(self, beacon_slot):
-        __data = bytearray()
-        __data += struct.pack("<B", beacon_slot)
+        __data = bytearray(_BEACON_PARAMS_GET.size)
+        _BEACON_PARAMS_GET.pack_into(__data, 0, beacon_slot)
         super(BeaconParamsGet, self).__init__(0x13, __data)
 
 
+_BEACON_PARAMS_SET = struct.Struct("<BBBI")
+
+
 class BeaconParamsSet(CommandPacket):
     """Set parameters for application controlled beacon.
 
@@ -134,11 +146,8 @@ class BeaconParamsSet(CommandPacket):
             TX interval in milliseconds.
     """
     def __init__(self, beacon_slot, tx_power, channel_map, interval_ms):
-        __data = bytearray()
-        __data += struct.pack("<B", beacon_slot)
-        __data += struct.pack("<B", tx_power)
-        __data += struct.pack("<B", channel_map)
-        __data += struct.pack("<I", interval_ms)
+        __data = bytearray(_BEACON_PARAMS_SET.size)
+        _BEACON_PARAMS_SET.pack_into(__data, 0, beacon_slot, tx_power, channel_map, interval_ms)
         super(BeaconParamsSet, self).__init__(0x12, __data)
 
 
@@ -184,6 +193,9 @@ class Continue(CommandPacket):
         super(Continue, self).__init__(0x22, __data)
 
 
+_ADV_ADDR_SET = struct.Struct("<B")
+
+
 class AdvAddrSet(CommandPacket):
     """Set the device's BLE advertisement address used for all BLE advertisment messages sent by
     the device.
@@ -196,8 +208,8 @@ class AdvAddrSet(CommandPacket):
             BLE advertising address.
     """
     def __init__(self, addr_type, adv_addr):
-        __data = bytearray()
-        __data += struct.pack("<B", addr_type)
+        __data = bytearray(_ADV_ADDR_SET.size)
+        _ADV_ADDR_SET.pack_into(__data, 0, addr_type)
         __data += iterable_to_barray(adv_addr)
         super(AdvAddrSet, self).__init__(0x40, __data)
 
@@ -209,6 +221,9 @@ class AdvAddrGet(CommandPacket):
         super(AdvAddrGet, self).__init__(0x41, __data)
 
 
+_CHANNEL_MAP_SET = struct.Struct("<B")
+
+
 class ChannelMapSet(CommandPacket):
     """Set the channel map for advertisement packets.
 
@@ -218,8 +233,8 @@ class ChannelMapSet(CommandPacket):
             Channel map bitfield for mesh to use, starting at channel 37.
     """
     def __init__(self, channel_map):
-        __data = bytearray()
-        __data += struct.pack("<B", channel_map)
+        __data = bytearray(_CHANNEL_MAP_SET.size)
+        _CHANNEL_MAP_SET.pack_into(__data, 0, channel_map)
         super(ChannelMapSet, self).__init__(0x42, __data)
 
 
@@ -230,6 +245,9 @@ class ChannelMapGet(CommandPacket):
         super(ChannelMapGet, self).__init__(0x43, __data)
 
 
+_TX_POWER_SET = struct.Struct("<B")
+
+
 class TxPowerSet(CommandPacket):
     """Set the transmission power of the radio.
 
@@ -239,8 +257,8 @@ class TxPowerSet(CommandPacket):
             Transmit power of radio, see @ref serial_cmd_tx_power_value_t for accepted values.
     """
     def __init__(self, tx_power):
-        __data = bytearray()
-        __data += struct.pack("<B", tx_power)
+        __data = bytearray(_TX_POWER_SET.size)
+        _TX_POWER_SET.pack_into(__data, 0, tx_power)
         super(TxPowerSet, self).__init__(0x44, __data)
 
 
@@ -286,6 +304,12 @@ class ScanStop(CommandPacket):
         super(ScanStop, self).__init__(0x62, __data)
 
 
+_PROVISION_0 = struct.Struct("<B")
+
+
+_PROVISION_1 = struct.Struct("<HIHBBB")
+
+
 class Provision(CommandPacket):
     """Start provisioning of a device.
 
@@ -311,16 +335,11 @@ class Provision(CommandPacket):
             Time in seconds during which the device will identify itself using any means it can.
     """
     def __init__(self, context_id, target_uuid, network_key, network_key_index, iv_index, address, iv_update_flag, key_refresh_flag, attention_duration_s):
-        __data = bytearray()
-        __data += struct.pack("<B", context_id)
+        __data = bytearray(_PROVISION_0.size)
+        _PROVISION_0.pack_into(__data, 0, context_id)
         __data += iterable_to_barray(target_uuid)
         __data += iterable_to_barray(network_key)
-        __data += struct.pack("<H", network_key_index)
-        __data += struct.pack("<I", iv_index)
-        __data += struct.pack("<H", address)
-        __data += struct.pack("<B", iv_update_flag)
-        __data += struct.pack("<B", key_refresh_flag)
-        __data += struct.pack("<B", attention_duration_s)
+        __data += _PROVISION_1.pack(network_key_index, iv_index, address, iv_update_flag, key_refresh_flag, attention_duration_s)
         super(Provision, self).__init__(0x63, __data)
 
 
@@ -331,6 +350,9 @@ class Listen(CommandPacket):
         super(Listen, self).__init__(0x64, __data)
 
 
+_OOB_USE = struct.Struct("<BBBB")
+
+
 class OobUse(CommandPacket):
     """Used to respond to the _Provisioning Capabilities Received_ event.
 
@@ -347,14 +369,14 @@ class OobUse(CommandPacket):
             Size of the OOB data.
     """
     def __init__(self, context_id, oob_method, oob_action, size):
-        __data = bytearray()
-        __data += struct.pack("<B", context_id)
-        __data += struct.pack("<B", oob_method)
-        __data += struct.pack("<B", oob_action)
-        __data += struct.pack("<B", size)
+        __data = bytearray(_OOB_USE.size)
+        _OOB_USE.pack_into(__data, 0, context_id, oob_method, oob_action, size)
         super(OobUse, self).__init__(0x66, __data)
 
 
+_AUTH_DATA = struct.Struct("<B")
+
+
 class AuthData(CommandPacket):
     """Used to respond to a _Provisioning Auth Request_ event.
 
@@ -366,12 +388,15 @@ class AuthData(CommandPacket):
             Authentication data.
     """
     def __init__(self, context_id, data):
-        __data = bytearray()
-        __data += struct.pack("<B", context_id)
+        __data = bytearray(_AUTH_DATA.size)
+        _AUTH_DATA.pack_into(__data, 0, context_id)
         __data += iterable_to_barray(data)
         super(AuthData, self).__init__(0x67, __data)
 
 
+_ECDH_SECRET = struct.Struct("<B")
+
+
 class EcdhSecret(CommandPacket):
     """Used to respond to a _Provisioning ECDH Request_ event.
 
@@ -383,8 +408,8 @@ class EcdhSecret(CommandPacket):
             ECDH shared secret.
     """
     def __init__(self, context_id, shared_secret):
-        __data = bytearray()
-        __data += struct.pack("<B", context_id)
+        __data = bytearray(_ECDH_SECRET.size)
+        _ECDH_SECRET.pack_into(__data, 0, context_id)
         __data += iterable_to_barray(shared_secret)
         super(EcdhSecret, self).__init__(0x68, __data)
 
@@ -406,6 +431,9 @@ class KeypairSet(CommandPacket):
         super(KeypairSet, self).__init__(0x69, __data)
 
 
+_CAPABILITIES_SET = struct.Struct("<BBBBHBH")
+
+
 class CapabilitiesSet(CommandPacket):
     """Used to set the out-of-band authentication capabilities of a device.
 
@@ -427,14 +455,8 @@ class CapabilitiesSet(CommandPacket):
             Available input actions for OOB authentication.
     """
     def __init__(self, num_elements, public_key_type, static_oob_types, output_oob_size, output_oob_actions, input_oob_size, input_oob_actions):
-        __data = bytearray()
-        __data += struct.pack("<B", num_elements)
-        __data += struct.pack("<B", public_key_type)
-        __data += struct.pack("<B", static_oob_types)
-        __data += struct.pack("<B", output_oob_size)
-        __data += struct.pack("<H", output_oob_actions)
-        __data += struct.pack("<B", input_oob_size)
-        __data += struct.pack("<H", input_oob_actions)
+        __data = bytearray(_CAPABILITIES_SET.size)
+        _CAPABILITIES_SET.pack_into(__data, 0, num_elements, public_key_type, static_oob_types, output_oob_size, output_oob_actions, input_oob_size, input_oob_actions)
         super(CapabilitiesSet, self).__init__(0x6A, __data)
 
 
@@ -557,6 +579,9 @@ class Disable(CommandPacket):
         super(Disable, self).__init__(0x91, __data)
 
 
+_SUBNET_ADD = struct.Struct("<H")
+
+
 class SubnetAdd(CommandPacket):
     """Add a mesh subnetwork to the device.
 
@@ -568,12 +593,15 @@ class SubnetAdd(CommandPacket):
             Key to add.
     """
     def __init__(self, net_key_index, key):
-        __data = bytearray()
-        __data += struct.pack("<H", net_key_index)
+        __data = bytearray(_SUBNET_ADD.size)
+        _SUBNET_ADD.pack_into(__data, 0, net_key_index)
         __data += iterable_to_barray(key)
         super(SubnetAdd, self).__init__(0x92, __data)
 
 
+_SUBNET_UPDATE = struct.Struct("<H")
+
+
 class SubnetUpdate(CommandPacket):
     """Update a mesh subnetwork's root key.
 
@@ -585,12 +613,15 @@ class SubnetUpdate(CommandPacket):
             Key to change to.
     """
     def __init__(self, subnet_handle, key):
-        __data = bytearray()
-        __data += struct.pack("<H", subnet_handle)
+        __data = bytearray(_SUBNET_UPDATE.size)
+        _SUBNET_UPDATE.pack_into(__data, 0, subnet_handle)
         __data += iterable_to_barray(key)
         super(SubnetUpdate, self).__init__(0x93, __data)
 
 
+_SUBNET_DELETE = struct.Struct("<H")
+
+
 class SubnetDelete(CommandPacket):
     """Delete a subnetwork from the device.
 
@@ -600,8 +631,8 @@ class SubnetDelete(CommandPacket):
             Handle of the subnet to delete.
     """
     def __init__(self, subnet_handle):
-        __data = bytearray()
-        __data += struct.pack("<H", subnet_handle)
+        __data = bytearray(_SUBNET_DELETE.size)
+        _SUBNET_DELETE.pack_into(__data, 0, subnet_handle)
         super(SubnetDelete, self).__init__(0x94, __data)
 
 
@@ -619,6 +650,9 @@ class SubnetCountMaxGet(CommandPacket):
         super(SubnetCountMaxGet, self).__init__(0x96, __data)
 
 
+_APPKEY_ADD = struct.Struct("<HH")
+
+
 class AppkeyAdd(CommandPacket):
     """Add a mesh application key to the device.
 
@@ -632,13 +666,15 @@ class AppkeyAdd(CommandPacket):
             Key to add.
     """
     def __init__(self, app_key_index, subnet_handle, key):
-        __data = bytearray()
-        __data += struct.pack("<H", app_key_index)
-        __data += struct.pack("<H", subnet_handle)
+        __data = bytearray(_APPKEY_ADD.size)
+        _APPKEY_ADD.pack_into(__data, 0, app_key_index, subnet_handle)
         __data += iterable_to_barray(key)
         super(AppkeyAdd, self).__init__(0x97, __data)
 
 
+_APPKEY_UPDATE = struct.Struct("<H")
+
+
 class AppkeyUpdate(CommandPacket):
     """Update a mesh application key.
 
@@ -650,12 +686,15 @@ class AppkeyUpdate(CommandPacket):
             Key to change to.
     """
     def __init__(self, appkey_handle, key):
-        __data = bytearray()
-        __data += struct.pack("<H", appkey_handle)
+        __data = bytearray(_APPKEY_UPDATE.size)
+        _APPKEY_UPDATE.pack_into(__data, 0, appkey_handle)
         __data += iterable_to_barray(key)
         super(AppkeyUpdate, self).__init__(0x98, __data)
 
 
+_APPKEY_DELETE = struct.Struct("<H")
+
+
 class AppkeyDelete(CommandPacket):
     """Delete a application key from the device.
 
@@ -665,11 +704,14 @@ class AppkeyDelete(CommandPacket):
             Handle of the appkey to delete.
     """
     def __init__(self, appkey_handle):
-        __data = bytearray()
-        __data += struct.pack("<H", appkey_handle)
+        __data = bytearray(_APPKEY_DELETE.size)
+        _APPKEY_DELETE.pack_into(__data, 0, appkey_handle)
         super(AppkeyDelete, self).__init__(0x99, __data)
 
 
+_APPKEY_GET_ALL = struct.Struct("<H")
+
+
 class AppkeyGetAll(CommandPacket):
     """Get all the application key indices of the stored application keys associated with a
     specific subnetwork.
@@ -680,8 +722,8 @@ class AppkeyGetAll(CommandPacket):
             Handle of the subnet to get all appkeys of.
     """
     def __init__(self, subnet_handle):
-        __data = bytearray()
-        __data += struct.pack("<H", subnet_handle)
+        __data = bytearray(_APPKEY_GET_ALL.size)
+        _APPKEY_GET_ALL.pack_into(__data, 0, subnet_handle)
         super(AppkeyGetAll, self).__init__(0x9A, __data)
 
 
@@ -692,6 +734,9 @@ class AppkeyCountMaxGet(CommandPacket):
         super(AppkeyCountMaxGet, self).__init__(0x9B, __data)
 
 
+_DEVKEY_ADD = struct.Struct("<HH")
+
+
 class DevkeyAdd(CommandPacket):
     """Add a mesh device key to the device.
 
@@ -705,13 +750,15 @@ class DevkeyAdd(CommandPacket):
             Key to add.
     """
     def __init__(self, owner_addr, subnet_handle, key):
-        __data = bytearray()
-        __data += struct.pack("<H", owner_addr)
-        __data += struct.pack("<H", subnet_handle)
+        __data = bytearray(_DEVKEY_ADD.size)
+        _DEVKEY_ADD.pack_into(__data, 0, owner_addr, subnet_handle)
         __data += iterable_to_barray(key)
         super(DevkeyAdd, self).__init__(0x9C, __data)
 
 
+_DEVKEY_DELETE = struct.Struct("<H")
+
+
 class DevkeyDelete(CommandPacket):
     """Delete a device key from the device.
 
@@ -721,8 +768,8 @@ class DevkeyDelete(CommandPacket):
             Handle of the devkey to delete.
     """
     def __init__(self, devkey_handle):
-        __data = bytearray()
-        __data += struct.pack("<H", devkey_handle)
+        __data = bytearray(_DEVKEY_DELETE.size)
+        _DEVKEY_DELETE.pack_into(__data, 0, devkey_handle)
         super(DevkeyDelete, self).__init__(0x9D, __data)
 
 
@@ -733,6 +780,9 @@ class DevkeyCountMaxGet(CommandPacket):
         super(DevkeyCountMaxGet, self).__init__(0x9E, __data)
 
 
+_ADDR_LOCAL_UNICAST_SET = struct.Struct("<HH")
+
+
 class AddrLocalUnicastSet(CommandPacket):
     """Set the start and count of the device's local unicast address.
 
@@ -744,9 +794,8 @@ class AddrLocalUnicastSet(CommandPacket):
             Number of addresses in the range of unicast addresses.
     """
     def __init__(self, start_address, count):
-        __data = bytearray()
-        __data += struct.pack("<H", start_address)
-        __data += struct.pack("<H", count)
+        __data = bytearray(_ADDR_LOCAL_UNICAST_SET.size)
+        _ADDR_LOCAL_UNICAST_SET.pack_into(__data, 0, start_address, count)
         super(AddrLocalUnicastSet, self).__init__(0x9F, __data)
 
 
@@ -757,6 +806,9 @@ class AddrLocalUnicastGet(CommandPacket):
         super(AddrLocalUnicastGet, self).__init__(0xA0, __data)
 
 
+_ADDR_GET = struct.Struct("<H")
+
+
 class AddrGet(CommandPacket):
     """Get the raw representation of the address with the given handle.
 
@@ -766,8 +818,8 @@ class AddrGet(CommandPacket):
             Handle of address to get raw representation of.
     """
     def __init__(self, address_handle):
-        __data = bytearray()
-        __data += struct.pack("<H", address_handle)
+        __data = bytearray(_ADDR_GET.size)
+        _ADDR_GET.pack_into(__data, 0, address_handle)
         super(AddrGet, self).__init__(0xA7, __data)
 
 
@@ -794,6 +846,9 @@ class AddrVirtualCountMaxGet(CommandPacket):
         super(AddrVirtualCountMaxGet, self).__init__(0xAA, __data)
 
 
+_ADDR_SUBSCRIPTION_ADD = struct.Struct("<H")
+
+
 class AddrSubscriptionAdd(CommandPacket):
     """Add the specified address to the set of active address subscriptions.
 
@@ -803,8 +858,8 @@ class AddrSubscriptionAdd(CommandPacket):
             Address to add as a subscription address.
     """
     def __init__(self, address):
-        __data = bytearray()
-        __data += struct.pack("<H", address)
+        __data = bytearray(_ADDR_SUBSCRIPTION_ADD.size)
+        _ADDR_SUBSCRIPTION_ADD.pack_into(__data, 0, address)
         super(AddrSubscriptionAdd, self).__init__(0xA1, __data)
 
 
@@ -823,6 +878,9 @@ class AddrSubscriptionAddVirtual(CommandPacket):
         super(AddrSubscriptionAddVirtual, self).__init__(0xA2, __data)
 
 
+_ADDR_SUBSCRIPTION_REMOVE = struct.Struct("<H")
+
+
 class AddrSubscriptionRemove(CommandPacket):
     """Remove the address with the given handle from the set of active address subscriptions.
 
@@ -832,11 +890,14 @@ class AddrSubscriptionRemove(CommandPacket):
             Handle of address to remove from address subscription list.
     """
     def __init__(self, address_handle):
-        __data = bytearray()
-        __data += struct.pack("<H", address_handle)
+        __data = bytearray(_ADDR_SUBSCRIPTION_REMOVE.size)
+        _ADDR_SUBSCRIPTION_REMOVE.pack_into(__data, 0, address_handle)
         super(AddrSubscriptionRemove, self).__init__(0xA3, __data)
 
 
+_ADDR_PUBLICATION_ADD = struct.Struct("<H")
+
+
 class AddrPublicationAdd(CommandPacket):
     """Add the specified address to the set of active publish addresses.
 
@@ -846,8 +907,8 @@ class AddrPublicationAdd(CommandPacket):
             Address to add as a publication address.
     """
     def __init__(self, address):
-        __data = bytearray()
-        __data += struct.pack("<H", address)
+        __data = bytearray(_ADDR_PUBLICATION_ADD.size)
+        _ADDR_PUBLICATION_ADD.pack_into(__data, 0, address)
         super(AddrPublicationAdd, self).__init__(0xA4, __data)
 
 
@@ -865,6 +926,9 @@ class AddrPublicationAddVirtual(CommandPacket):
         super(AddrPublicationAddVirtual, self).__init__(0xA5, __data)
 
 
+_ADDR_PUBLICATION_REMOVE = struct.Struct("<H")
+
+
 class AddrPublicationRemove(CommandPacket):
     """Remove the address with the specified handle from the set of active publish addresses.
 
@@ -874,11 +938,14 @@ class AddrPublicationRemove(CommandPacket):
             Handle of the address to remove from the publication address list.
     """
     def __init__(self, address_handle):
-        __data = bytearray()
-        __data += struct.pack("<H", address_handle)
+        __data = bytearray(_ADDR_PUBLICATION_REMOVE.size)
+        _ADDR_PUBLICATION_REMOVE.pack_into(__data, 0, address_handle)
         super(AddrPublicationRemove, self).__init__(0xA6, __data)
 
 
+_PACKET_SEND = struct.Struct("<HHHBBBB")
+
+
 class PacketSend(CommandPacket):
     """Send a mesh packet.
 
@@ -906,14 +973,8 @@ class PacketSend(CommandPacket):
             Payload of the packet.
     """
     def __init__(self, appkey_handle, src_addr, dst_addr_handle, ttl, force_segmented, transmic_size, friendship_credential_flag, data):
-        __data = bytearray()
-        __data += struct.pack("<H", appkey_handle)
-        __data += struct.pack("<H", src_addr)
-        __data += struct.pack("<H", dst_addr_handle)
-        __data += struct.pack("<B", ttl)
-        __data += struct.pack("<B", force_segmented)
-        __data += struct.pack("<B", transmic_size)
-        __data += struct.pack("<B", friendship_credential_flag)
+        __data = bytearray(_PACKET_SEND.size)
+        _PACKET_SEND.pack_into(__data, 0, appkey_handle, src_addr, dst_addr_handle, ttl, force_segmented, transmic_size, friendship_credential_flag)
         __data += iterable_to_barray(data)
         super(PacketSend, self).__init__(0xAB, __data)
 
@@ -932,6 +993,12 @@ class JumpToBootloader(CommandPacket):
         super(JumpToBootloader, self).__init__(0xD0, __data)
 
 
+_REQUEST_0 = struct.Struct("<B")
+
+
+_REQUEST_1 = struct.Struct("<I")
+
+
 class Request(CommandPacket):
     """Request a DFU transfer.
 
@@ -945,13 +1012,16 @@ class Request(CommandPacket):
             Address in which to bank firmware.
     """
     def __init__(self, dfu_type, fwid, bank_addr):
-        __data = bytearray()
-        __data += struct.pack("<B", dfu_type)
+        __data = bytearray(_REQUEST_0.size)
+        _REQUEST_0.pack_into(__data, 0, dfu_type)
         __data += fwid
-        __data += struct.pack("<I", bank_addr)
+        __data += _REQUEST_1.pack(bank_addr)
         super(Request, self).__init__(0xD1, __data)
 
 
+_RELAY = struct.Struct("<B")
+
+
 class Relay(CommandPacket):
     """Relay a DFU transfer.
 
@@ -963,8 +1033,8 @@ class Relay(CommandPacket):
             Firmware ID of firmware that should be relayed.
     """
     def __init__(self, dfu_type, fwid):
-        __data = bytearray()
-        __data += struct.pack("<B", dfu_type)
+        __data = bytearray(_RELAY.size)
+        _RELAY.pack_into(__data, 0, dfu_type)
         __data += fwid
         super(Relay, self).__init__(0xD2, __data)
 
@@ -976,6 +1046,9 @@ class Abort(CommandPacket):
         super(Abort, self).__init__(0xD3, __data)
 
 
+_BANK_INFO_GET = struct.Struct("<B")
+
+
 class BankInfoGet(CommandPacket):
     """Get information about the firmware bank of the given type, if it exists.
 
@@ -985,11 +1058,14 @@ class BankInfoGet(CommandPacket):
             DFU Firmware type to get bank info about.
     """
     def __init__(self, dfu_type):
-        __data = bytearray()
-        __data += struct.pack("<B", dfu_type)
+        __data = bytearray(_BANK_INFO_GET.size)
+        _BANK_INFO_GET.pack_into(__data, 0, dfu_type)
         super(BankInfoGet, self).__init__(0xD4, __data)
 
 
+_BANK_FLASH = struct.Struct("<B")
+
+
 class BankFlash(CommandPacket):
     """Flash the bank with the given firmware type.
 
@@ -999,8 +1075,8 @@ class BankFlash(CommandPacket):
             DFU Firmware type to flash.
     """
     def __init__(self, dfu_type):
-        __data = bytearray()
-        __data += struct.pack("<B", dfu_type)
+        __data = bytearray(_BANK_FLASH.size)
+        _BANK_FLASH.pack_into(__data, 0, dfu_type)
         super(BankFlash, self).__init__(0xD5, __data)
 
 
@@ -1011,6 +1087,9 @@ class StateGet(CommandPacket):
         super(StateGet, self).__init__(0xD6, __data)
 
 
+_MODEL_PUB_ADDR_SET = struct.Struct("<HH")
+
+
 class ModelPubAddrSet(CommandPacket):
     """Set the publish address for a model instance.
 
@@ -1022,12 +1101,14 @@ class ModelPubAddrSet(CommandPacket):
             Handle for a value (e.g. address) stored by the device state manager.
     """
     def __init__(self, model_handle, dsm_handle):
-        __data = bytearray()
-        __data += struct.pack("<H", model_handle)
-        __data += struct.pack("<H", dsm_handle)
+        __data = bytearray(_MODEL_PUB_ADDR_SET.size)
+        _MODEL_PUB_ADDR_SET.pack_into(__data, 0, model_handle, dsm_handle)
         super(ModelPubAddrSet, self).__init__(0xE0, __data)
 
 
+_MODEL_PUB_ADDR_GET = struct.Struct("<H")
+
+
 class ModelPubAddrGet(CommandPacket):
     """Get the publish address for a model instance.
 
@@ -1037,11 +1118,14 @@ class ModelPubAddrGet(CommandPacket):
             Handle of the model that the access module should operate on.
     """
     def __init__(self, handle):
-        __data = bytearray()
-        __data += struct.pack("<H", handle)
+        __data = bytearray(_MODEL_PUB_ADDR_GET.size)
+        _MODEL_PUB_ADDR_GET.pack_into(__data, 0, handle)
         super(ModelPubAddrGet, self).__init__(0xE1, __data)
 
 
+_MODEL_PUB_PERIOD_SET = struct.Struct("<HBB")
+
+
 class ModelPubPeriodSet(CommandPacket):
     """Set the publish address for a model instance.
 
@@ -1055,13 +1139,14 @@ class ModelPubPeriodSet(CommandPacket):
             Must not be larger than @ref ACCESS_PUBLISH_PERIOD_STEP_MAX.
     """
     def __init__(self, model_handle, resolution, step_number):
-        __data = bytearray()
-        __data += struct.pack("<H", model_handle)
-        __data += struct.pack("<B", resolution)
-        __data += struct.pack("<B", step_number)
+        __data = bytearray(_MODEL_PUB_PERIOD_SET.size)
+        _MODEL_PUB_PERIOD_SET.pack_into(__data, 0, model_handle, resolution, step_number)
         super(ModelPubPeriodSet, self).__init__(0xE2, __data)
 
 
+_MODEL_PUB_PERIOD_GET = struct.Struct("<H")
+
+
 class ModelPubPeriodGet(CommandPacket):
     """Get the publish period for a model instance.
 
@@ -1071,11 +1156,14 @@ class ModelPubPeriodGet(CommandPacket):
             Handle of the model that the access module should operate on.
     """
     def __init__(self, handle):
-        __data = bytearray()
-        __data += struct.pack("<H", handle)
+        __data = bytearray(_MODEL_PUB_PERIOD_GET.size)
+        _MODEL_PUB_PERIOD_GET.pack_into(__data, 0, handle)
         super(ModelPubPeriodGet, self).__init__(0xE3, __data)
 
 
+_MODEL_SUBS_ADD = struct.Struct("<HH")
+
+
 class ModelSubsAdd(CommandPacket):
     """Add a subscription address to a model instance.
 
@@ -1087,12 +1175,14 @@ class ModelSubsAdd(CommandPacket):
             Handle for a value (e.g. address) stored by the device state manager.
     """
     def __init__(self, model_handle, dsm_handle):
-        __data = bytearray()
-        __data += struct.pack("<H", model_handle)
-        __data += struct.pack("<H", dsm_handle)
+        __data = bytearray(_MODEL_SUBS_ADD.size)
+        _MODEL_SUBS_ADD.pack_into(__data, 0, model_handle, dsm_handle)
         super(ModelSubsAdd, self).__init__(0xE4, __data)
 
 
+_MODEL_SUBS_REMOVE = struct.Struct("<HH")
+
+
 class ModelSubsRemove(CommandPacket):
     """Remove a subscription address from a model instance.
 
@@ -1104,12 +1194,14 @@ class ModelSubsRemove(CommandPacket):
             Handle for a value (e.g. address) stored by the device state manager.
     """
     def __init__(self, model_handle, dsm_handle):
-        __data = bytearray()
-        __data += struct.pack("<H", model_handle)
-        __data += struct.pack("<H", dsm_handle)
+        __data = bytearray(_MODEL_SUBS_REMOVE.size)
+        _MODEL_SUBS_REMOVE.pack_into(__data, 0, model_handle, dsm_handle)
         super(ModelSubsRemove, self).__init__(0xE5, __data)
 
 
+_MODEL_SUBS_GET = struct.Struct("<H")
+
+
 class ModelSubsGet(CommandPacket):
     """Get the list of subscription addresses from a model instance.
 
@@ -1119,11 +1211,14 @@ class ModelSubsGet(CommandPacket):
             Handle of the model that the access module should operate on.
     """
     def __init__(self, handle):
-        __data = bytearray()
-        __data += struct.pack("<H", handle)
+        __data = bytearray(_MODEL_SUBS_GET.size)
+        _MODEL_SUBS_GET.pack_into(__data, 0, handle)
         super(ModelSubsGet, self).__init__(0xE6, __data)
 
 
+_MODEL_APP_BIND = struct.Struct("<HH")
+
+
 class ModelAppBind(CommandPacket):
     """Bind an application key to a model instance.
 
@@ -1135,12 +1230,14 @@ class ModelAppBind(CommandPacket):
             Handle for a value (e.g. address) stored by the device state manager.
     """
     def __init__(self, model_handle, dsm_handle):
-        __data = bytearray()
-        __data += struct.pack("<H", model_handle)
-        __data += struct.pack("<H", dsm_handle)
+        __data = bytearray(_MODEL_APP_BIND.size)
+        _MODEL_APP_BIND.pack_into(__data, 0, model_handle, dsm_handle)
         super(ModelAppBind, self).__init__(0xE7, __data)
 
 
+_MODEL_APP_UNBIND = struct.Struct("<HH")
+
+
 class ModelAppUnbind(CommandPacket):
     """Unbind an application key from a model instance.
 
@@ -1152,12 +1249,14 @@ class ModelAppUnbind(CommandPacket):
             Handle for a value (e.g. address) stored by the device state manager.
     """
     def __init__(self, model_handle, dsm_handle):
-        __data = bytearray()
-        __data += struct.pack("<H", model_handle)
-        __data += struct.pack("<H", dsm_handle)
+        __data = bytearray(_MODEL_APP_UNBIND.size)
+        _MODEL_APP_UNBIND.pack_into(__data, 0, model_handle, dsm_handle)
         super(ModelAppUnbind, self).__init__(0xE8, __data)
 
 
+_MODEL_APP_GET = struct.Struct("<H")
+
+
 class ModelAppGet(CommandPacket):
     """Get all the application keys bound to a model instance.
 
@@ -1167,11 +1266,14 @@ class ModelAppGet(CommandPacket):
             Handle of the model that the access module should operate on.
     """
     def __init__(self, handle):
-        __data = bytearray()
-        __data += struct.pack("<H", handle)
+        __data = bytearray(_MODEL_APP_GET.size)
+        _MODEL_APP_GET.pack_into(__data, 0, handle)
         super(ModelAppGet, self).__init__(0xE9, __data)
 
 
+_MODEL_PUB_APP_SET = struct.Struct("<HH")
+
+
 class ModelPubAppSet(CommandPacket):
     """Set the application key to be used when publishing for a model instance.
 
@@ -1183,12 +1285,14 @@ class ModelPubAppSet(CommandPacket):
             Handle for a value (e.g. address) stored by the device state manager.
     """
     def __init__(self, model_handle, dsm_handle):
-        __data = bytearray()
-        __data += struct.pack("<H", model_handle)
-        __data += struct.pack("<H", dsm_handle)
+        __data = bytearray(_MODEL_PUB_APP_SET.size)
+        _MODEL_PUB_APP_SET.pack_into(__data, 0, model_handle, dsm_handle)
         super(ModelPubAppSet, self).__init__(0xEA, __data)
 
 
+_MODEL_PUB_APP_GET = struct.Struct("<H")
+
+
 class ModelPubAppGet(CommandPacket):
     """Get the application key used when publishing for a model instance.
 
@@ -1198,11 +1302,14 @@ class ModelPubAppGet(CommandPacket):
             Handle of the model that the access module should operate on.
     """
     def __init__(self, handle):
-        __data = bytearray()
-        __data += struct.pack("<H", handle)
+        __data = bytearray(_MODEL_PUB_APP_GET.size)
+        _MODEL_PUB_APP_GET.pack_into(__data, 0, handle)
         super(ModelPubAppGet, self).__init__(0xEB, __data)
 
 
+_MODEL_PUB_TTL_SET = struct.Struct("<HB")
+
+
 class ModelPubTtlSet(CommandPacket):
     """Set the default TTL value used when publishing for a model instance.
 
@@ -1214,12 +1321,14 @@ class ModelPubTtlSet(CommandPacket):
             TTL for outgoing messages.
     """
     def __init__(self, model_handle, ttl):
-        __data = bytearray()
-        __data += struct.pack("<H", model_handle)
-        __data += struct.pack("<B", ttl)
+        __data = bytearray(_MODEL_PUB_TTL_SET.size)
+        _MODEL_PUB_TTL_SET.pack_into(__data, 0, model_handle, ttl)
         super(ModelPubTtlSet, self).__init__(0xEC, __data)
 
 
+_MODEL_PUB_TTL_GET = struct.Struct("<H")
+
+
 class ModelPubTtlGet(CommandPacket):
     """Get the default TTL value used when publishing for a model instance.
 
@@ -1229,11 +1338,14 @@ class ModelPubTtlGet(CommandPacket):
             Handle of the model that the access module should operate on.
     """
     def __init__(self, handle):
-        __data = bytearray()
-        __data += struct.pack("<H", handle)
+        __data = bytearray(_MODEL_PUB_TTL_GET.size)
+        _MODEL_PUB_TTL_GET.pack_into(__data, 0, handle)
         super(ModelPubTtlGet, self).__init__(0xED, __data)
 
 
+_ELEM_LOC_SET = struct.Struct("<HH")
+
+
 class ElemLocSet(CommandPacket):
     """Set the location descriptor for an element.
 
@@ -1245,12 +1357,14 @@ class ElemLocSet(CommandPacket):
             Location value for the element.
     """
     def __init__(self, element_index, location):
-        __data = bytearray()
-        __data += struct.pack("<H", element_index)
-        __data += struct.pack("<H", location)
+        __data = bytearray(_ELEM_LOC_SET.size)
+        _ELEM_LOC_SET.pack_into(__data, 0, element_index, location)
         super(ElemLocSet, self).__init__(0xEE, __data)
 
 
+_ELEM_LOC_GET = struct.Struct("<H")
+
+
 class ElemLocGet(CommandPacket):
     """Get the location descriptor for an element.
 
@@ -1260,11 +1374,14 @@ class ElemLocGet(CommandPacket):
             Index of the addressed element.
     """
     def __init__(self, element_index):
-        __data = bytearray()
-        __data += struct.pack("<H", element_index)
+        __data = bytearray(_ELEM_LOC_GET.size)
+        _ELEM_LOC_GET.pack_into(__data, 0, element_index)
         super(ElemLocGet, self).__init__(0xEF, __data)
 
 
+_ELEM_SIG_MODEL_COUNT_GET = struct.Struct("<H")
+
+
 class ElemSigModelCountGet(CommandPacket):
     """Get the number of Bluetooth SIG models for an element.
 
@@ -1274,11 +1391,14 @@ class ElemSigModelCountGet(CommandPacket):
             Index of the addressed element.
     """
     def __init__(self, element_index):
-        __data = bytearray()
-        __data += struct.pack("<H", element_index)
+        __data = bytearray(_ELEM_SIG_MODEL_COUNT_GET.size)
+        _ELEM_SIG_MODEL_COUNT_GET.pack_into(__data, 0, element_index)
         super(ElemSigModelCountGet, self).__init__(0xF0, __data)
 
 
+_ELEM_VENDOR_MODEL_COUNT_GET = struct.Struct("<H")
+
+
 class ElemVendorModelCountGet(CommandPacket):
     """Get the number of vendor specific models for an element.
 
@@ -1288,11 +1408,14 @@ class ElemVendorModelCountGet(CommandPacket):
             Index of the addressed element.
     """
     def __init__(self, element_index):
-        __data = bytearray()
-        __data += struct.pack("<H", element_index)
+        __data = bytearray(_ELEM_VENDOR_MODEL_COUNT_GET.size)
+        _ELEM_VENDOR_MODEL_COUNT_GET.pack_into(__data, 0, element_index)
         super(ElemVendorModelCountGet, self).__init__(0xF1, __data)
 
 
+_MODEL_ID_GET = struct.Struct("<H")
+
+
 class ModelIdGet(CommandPacket):
     """Get the model ID of a model instance.
 
@@ -1302,11 +1425,14 @@ class ModelIdGet(CommandPacket):
             Handle of the model that the access module should operate on.
     """
     def __init__(self, handle):
-        __data = bytearray()
-        __data += struct.pack("<H", handle)
+        __data = bytearray(_MODEL_ID_GET.size)
+        _MODEL_ID_GET.pack_into(__data, 0, handle)
         super(ModelIdGet, self).__init__(0xF2, __data)
 
 
+_HANDLE_GET = struct.Struct("<HI")
+
+
 class HandleGet(CommandPacket):
     """Get the handle assigned to the model instance of a model based on the element index and
     model ID.
@@ -1319,12 +1445,14 @@ class HandleGet(CommandPacket):
             Company and model IDs.
     """
     def __init__(self, element_index, model_id):
-        __data = bytearray()
-        __data += struct.pack("<H", element_index)
-        __data += struct.pack("<I", model_id)
+        __data = bytearray(_HANDLE_GET.size)
+        _HANDLE_GET.pack_into(__data, 0, element_index, model_id)
         super(HandleGet, self).__init__(0xF3, __data)
 
 
+_ELEM_MODELS_GET = struct.Struct("<H")
+
+
 class ElemModelsGet(CommandPacket):
     """Get the array of handles corresponding to an element.
 
@@ -1334,8 +1462,8 @@ class ElemModelsGet(CommandPacket):
             Index of the addressed element.
     """
     def __init__(self, element_index):
-        __data = bytearray()
-        __data += struct.pack("<H", element_index)
+        __data = bytearray(_ELEM_MODELS_GET.size)
+        _ELEM_MODELS_GET.pack_into(__data, 0, element_index)
         super(ElemModelsGet, self).__init__(0xF4, __data)
 
 
@@ -1370,6 +1498,9 @@ class Init(CommandPacket):
         super(Init, self).__init__(0xFD, __data)
 
 
+_COMMAND = struct.Struct("<H")
+
+
 class Command(CommandPacket):
     """Forward a model specific command to a model instance.
 
@@ -1381,466 +1512,761 @@ class Command(CommandPacket):
             Additional data provided to the event
     """
     def __init__(self, model_cmd_info, data):
-        __data = bytearray()
-        __data += struct.pack("<H", model_cmd_info)
+        __data = bytearray(_COMMAND.size)
+        _COMMAND.pack_into(__data, 0, model_cmd_info)
         __data += iterable_to_barray(data)
         super(Command, self).__init__(0xFE, __data)
 
 
 class EchoRsp(ResponsePacket):
     """Response to a(n) Echo command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["data"] = raw_data[0:]
-        super(EchoRsp, self).__init__("Echo", 0x02, __data)
+    _command_name = "Echo"
+    _opcode = 0x02
+    _fields = ("data",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.data = raw_data[offset + 0:]
+
+
+_SERIAL_VERSION_GET_RSP = struct.Struct("<H")
 
 
 class SerialVersionGetRsp(ResponsePacket):
     """Response to a(n) SerialVersionGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["serial_ver"], = struct.unpack("<H", raw_data[0:2])
-        super(SerialVersionGetRsp, self).__init__("SerialVersionGet", 0x09, __data)
+    _command_name = "SerialVersionGet"
+    _opcode = 0x09
+    _fields = ("serial_ver",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.serial_ver, = _SERIAL_VERSION_GET_RSP.unpack_from(raw_data, offset)
 
 
 class FwInfoGetRsp(ResponsePacket):
     """Response to a(n) FwInfoGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["fwid"] = raw_data[0:10]
-        super(FwInfoGetRsp, self).__init__("FwInfoGet", 0x0A, __data)
+    _command_name = "FwInfoGet"
+    _opcode = 0x0A
+    _fields = ("fwid",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.fwid = raw_data[offset + 0:offset + 10]
+
+
+_BEACON_PARAMS_GET_RSP = struct.Struct("<BBBI")
 
 
 class BeaconParamsGetRsp(ResponsePacket):
     """Response to a(n) BeaconParamsGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["beacon_slot"], = struct.unpack("<B", raw_data[0:1])
-        __data["tx_power"], = struct.unpack("<B", raw_data[1:2])
-        __data["channel_map"], = struct.unpack("<B", raw_data[2:3])
-        __data["interval_ms"], = struct.unpack("<I", raw_data[3:7])
-        super(BeaconParamsGetRsp, self).__init__("BeaconParamsGet", 0x13, __data)
+    _command_name = "BeaconParamsGet"
+    _opcode = 0x13
+    _fields = ("beacon_slot", "tx_power", "channel_map", "interval_ms")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.beacon_slot, self.tx_power, self.channel_map, self.interval_ms = _BEACON_PARAMS_GET_RSP.unpack_from(raw_data, offset)
+
+
+_HOUSEKEEPING_DATA_GET_RSP = struct.Struct("<I")
 
 
 class HousekeepingDataGetRsp(ResponsePacket):
     """Response to a(n) HousekeepingDataGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["alloc_fail_count"], = struct.unpack("<I", raw_data[0:4])
-        super(HousekeepingDataGetRsp, self).__init__("HousekeepingDataGet", 0x14, __data)
+    _command_name = "HousekeepingDataGet"
+    _opcode = 0x14
+    _fields = ("alloc_fail_count",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.alloc_fail_count, = _HOUSEKEEPING_DATA_GET_RSP.unpack_from(raw_data, offset)
+
+
+_ADV_ADDR_GET_RSP = struct.Struct("<B")
 
 
 class AdvAddrGetRsp(ResponsePacket):
     """Response to a(n) AdvAddrGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["addr_type"], = struct.unpack("<B", raw_data[0:1])
-        __data["addr"] = raw_data[1:7]
-        super(AdvAddrGetRsp, self).__init__("AdvAddrGet", 0x41, __data)
+    _command_name = "AdvAddrGet"
+    _opcode = 0x41
+    _fields = ("addr_type", "addr")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.addr_type, = _ADV_ADDR_GET_RSP.unpack_from(raw_data, offset)
+        self.addr = raw_data[offset + 1:offset + 7]
+
+
+_TX_POWER_GET_RSP = struct.Struct("<B")
 
 
 class TxPowerGetRsp(ResponsePacket):
     """Response to a(n) TxPowerGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["tx_power"], = struct.unpack("<B", raw_data[0:1])
-        super(TxPowerGetRsp, self).__init__("TxPowerGet", 0x45, __data)
+    _command_name = "TxPowerGet"
+    _opcode = 0x45
+    _fields = ("tx_power",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.tx_power, = _TX_POWER_GET_RSP.unpack_from(raw_data, offset)
 
 
 class UuidGetRsp(ResponsePacket):
     """Response to a(n) UuidGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["device_uuid"] = raw_data[0:16]
-        super(UuidGetRsp, self).__init__("UuidGet", 0x54, __data)
+    _command_name = "UuidGet"
+    _opcode = 0x54
+    _fields = ("device_uuid",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.device_uuid = raw_data[offset + 0:offset + 16]
+
+
+_PROVISION_RSP = struct.Struct("<B")
 
 
 class ProvisionRsp(ResponsePacket):
     """Response to a(n) Provision command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["context"], = struct.unpack("<B", raw_data[0:1])
-        super(ProvisionRsp, self).__init__("Provision", 0x63, __data)
+    _command_name = "Provision"
+    _opcode = 0x63
+    _fields = ("context",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.context, = _PROVISION_RSP.unpack_from(raw_data, offset)
+
+
+_OOB_USE_RSP = struct.Struct("<B")
 
 
 class OobUseRsp(ResponsePacket):
     """Response to a(n) OobUse command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["context"], = struct.unpack("<B", raw_data[0:1])
-        super(OobUseRsp, self).__init__("OobUse", 0x66, __data)
+    _command_name = "OobUse"
+    _opcode = 0x66
+    _fields = ("context",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.context, = _OOB_USE_RSP.unpack_from(raw_data, offset)
+
+
+_AUTH_DATA_RSP = struct.Struct("<B")
 
 
 class AuthDataRsp(ResponsePacket):
     """Response to a(n) AuthData command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["context"], = struct.unpack("<B", raw_data[0:1])
-        super(AuthDataRsp, self).__init__("AuthData", 0x67, __data)
+    _command_name = "AuthData"
+    _opcode = 0x67
+    _fields = ("context",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.context, = _AUTH_DATA_RSP.unpack_from(raw_data, offset)
+
+
+_ECDH_SECRET_RSP = struct.Struct("<B")
 
 
 class EcdhSecretRsp(ResponsePacket):
     """Response to a(n) EcdhSecret command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["context"], = struct.unpack("<B", raw_data[0:1])
-        super(EcdhSecretRsp, self).__init__("EcdhSecret", 0x68, __data)
+    _command_name = "EcdhSecret"
+    _opcode = 0x68
+    _fields = ("context",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.context, = _ECDH_SECRET_RSP.unpack_from(raw_data, offset)
+
+
+_SUBNET_ADD_RSP = struct.Struct("<H")
 
 
 class SubnetAddRsp(ResponsePacket):
     """Response to a(n) SubnetAdd command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["subnet_handle"], = struct.unpack("<H", raw_data[0:2])
-        super(SubnetAddRsp, self).__init__("SubnetAdd", 0x92, __data)
+    _command_name = "SubnetAdd"
+    _opcode = 0x92
+    _fields = ("subnet_handle",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.subnet_handle, = _SUBNET_ADD_RSP.unpack_from(raw_data, offset)
+
+
+_SUBNET_UPDATE_RSP = struct.Struct("<H")
 
 
 class SubnetUpdateRsp(ResponsePacket):
     """Response to a(n) SubnetUpdate command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["subnet_handle"], = struct.unpack("<H", raw_data[0:2])
-        super(SubnetUpdateRsp, self).__init__("SubnetUpdate", 0x93, __data)
+    _command_name = "SubnetUpdate"
+    _opcode = 0x93
+    _fields = ("subnet_handle",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.subnet_handle, = _SUBNET_UPDATE_RSP.unpack_from(raw_data, offset)
+
+
+_SUBNET_DELETE_RSP = struct.Struct("<H")
 
 
 class SubnetDeleteRsp(ResponsePacket):
     """Response to a(n) SubnetDelete command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["subnet_handle"], = struct.unpack("<H", raw_data[0:2])
-        super(SubnetDeleteRsp, self).__init__("SubnetDelete", 0x94, __data)
+    _command_name = "SubnetDelete"
+    _opcode = 0x94
+    _fields = ("subnet_handle",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.subnet_handle, = _SUBNET_DELETE_RSP.unpack_from(raw_data, offset)
 
 
 class SubnetGetAllRsp(ResponsePacket):
     """Response to a(n) SubnetGetAll command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["subnet_key_index"] = raw_data[0:252]
-        super(SubnetGetAllRsp, self).__init__("SubnetGetAll", 0x95, __data)
+    _command_name = "SubnetGetAll"
+    _opcode = 0x95
+    _fields = ("subnet_key_index",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.subnet_key_index = raw_data[offset + 0:offset + 252]
+
+
+_SUBNET_COUNT_MAX_GET_RSP = struct.Struct("<H")
 
 
 class SubnetCountMaxGetRsp(ResponsePacket):
     """Response to a(n) SubnetCountMaxGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["list_size"], = struct.unpack("<H", raw_data[0:2])
-        super(SubnetCountMaxGetRsp, self).__init__("SubnetCountMaxGet", 0x96, __data)
+    _command_name = "SubnetCountMaxGet"
+    _opcode = 0x96
+    _fields = ("list_size",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.list_size, = _SUBNET_COUNT_MAX_GET_RSP.unpack_from(raw_data, offset)
+
+
+_APPKEY_ADD_RSP = struct.Struct("<H")
 
 
 class AppkeyAddRsp(ResponsePacket):
     """Response to a(n) AppkeyAdd command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["appkey_handle"], = struct.unpack("<H", raw_data[0:2])
-        super(AppkeyAddRsp, self).__init__("AppkeyAdd", 0x97, __data)
+    _command_name = "AppkeyAdd"
+    _opcode = 0x97
+    _fields = ("appkey_handle",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.appkey_handle, = _APPKEY_ADD_RSP.unpack_from(raw_data, offset)
+
+
+_APPKEY_UPDATE_RSP = struct.Struct("<H")
 
 
 class AppkeyUpdateRsp(ResponsePacket):
     """Response to a(n) AppkeyUpdate command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["appkey_handle"], = struct.unpack("<H", raw_data[0:2])
-        super(AppkeyUpdateRsp, self).__init__("AppkeyUpdate", 0x98, __data)
+    _command_name = "AppkeyUpdate"
+    _opcode = 0x98
+    _fields = ("appkey_handle",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.appkey_handle, = _APPKEY_UPDATE_RSP.unpack_from(raw_data, offset)
+
+
+_APPKEY_DELETE_RSP = struct.Struct("<H")
 
 
 class AppkeyDeleteRsp(ResponsePacket):
     """Response to a(n) AppkeyDelete command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["appkey_handle"], = struct.unpack("<H", raw_data[0:2])
-        super(AppkeyDeleteRsp, self).__init__("AppkeyDelete", 0x99, __data)
+    _command_name = "AppkeyDelete"
+    _opcode = 0x99
+    _fields = ("appkey_handle",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.appkey_handle, = _APPKEY_DELETE_RSP.unpack_from(raw_data, offset)
+
+
+_APPKEY_GET_ALL_RSP = struct.Struct("<H")
 
 
 class AppkeyGetAllRsp(ResponsePacket):
     """Response to a(n) AppkeyGetAll command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["subnet_handle"], = struct.unpack("<H", raw_data[0:2])
-        __data["appkey_key_index"] = raw_data[2:252]
-        super(AppkeyGetAllRsp, self).__init__("AppkeyGetAll", 0x9A, __data)
+    _command_name = "AppkeyGetAll"
+    _opcode = 0x9A
+    _fields = ("subnet_handle", "appkey_key_index")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.subnet_handle, = _APPKEY_GET_ALL_RSP.unpack_from(raw_data, offset)
+        self.appkey_key_index = raw_data[offset + 2:offset + 252]
+
+
+_APPKEY_COUNT_MAX_GET_RSP = struct.Struct("<H")
 
 
 class AppkeyCountMaxGetRsp(ResponsePacket):
     """Response to a(n) AppkeyCountMaxGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["list_size"], = struct.unpack("<H", raw_data[0:2])
-        super(AppkeyCountMaxGetRsp, self).__init__("AppkeyCountMaxGet", 0x9B, __data)
+    _command_name = "AppkeyCountMaxGet"
+    _opcode = 0x9B
+    _fields = ("list_size",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.list_size, = _APPKEY_COUNT_MAX_GET_RSP.unpack_from(raw_data, offset)
+
+
+_DEVKEY_ADD_RSP = struct.Struct("<H")
 
 
 class DevkeyAddRsp(ResponsePacket):
     """Response to a(n) DevkeyAdd command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["devkey_handle"], = struct.unpack("<H", raw_data[0:2])
-        super(DevkeyAddRsp, self).__init__("DevkeyAdd", 0x9C, __data)
+    _command_name = "DevkeyAdd"
+    _opcode = 0x9C
+    _fields = ("devkey_handle",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.devkey_handle, = _DEVKEY_ADD_RSP.unpack_from(raw_data, offset)
+
+
+_DEVKEY_DELETE_RSP = struct.Struct("<H")
 
 
 class DevkeyDeleteRsp(ResponsePacket):
     """Response to a(n) DevkeyDelete command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["devkey_handle"], = struct.unpack("<H", raw_data[0:2])
-        super(DevkeyDeleteRsp, self).__init__("DevkeyDelete", 0x9D, __data)
+    _command_name = "DevkeyDelete"
+    _opcode = 0x9D
+    _fields = ("devkey_handle",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.devkey_handle, = _DEVKEY_DELETE_RSP.unpack_from(raw_data, offset)
+
+
+_DEVKEY_COUNT_MAX_GET_RSP = struct.Struct("<H")
 
 
 class DevkeyCountMaxGetRsp(ResponsePacket):
     """Response to a(n) DevkeyCountMaxGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["list_size"], = struct.unpack("<H", raw_data[0:2])
-        super(DevkeyCountMaxGetRsp, self).__init__("DevkeyCountMaxGet", 0x9E, __data)
+    _command_name = "DevkeyCountMaxGet"
+    _opcode = 0x9E
+    _fields = ("list_size",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.list_size, = _DEVKEY_COUNT_MAX_GET_RSP.unpack_from(raw_data, offset)
+
+
+_ADDR_LOCAL_UNICAST_GET_RSP = struct.Struct("<HH")
 
 
 class AddrLocalUnicastGetRsp(ResponsePacket):
     """Response to a(n) AddrLocalUnicastGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["address_start"], = struct.unpack("<H", raw_data[0:2])
-        __data["count"], = struct.unpack("<H", raw_data[2:4])
-        super(AddrLocalUnicastGetRsp, self).__init__("AddrLocalUnicastGet", 0xA0, __data)
+    _command_name = "AddrLocalUnicastGet"
+    _opcode = 0xA0
+    _fields = ("address_start", "count")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.address_start, self.count = _ADDR_LOCAL_UNICAST_GET_RSP.unpack_from(raw_data, offset)
+
+
+_ADDR_GET_RSP = struct.Struct("<HBBH")
 
 
 class AddrGetRsp(ResponsePacket):
     """Response to a(n) AddrGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["address_handle"], = struct.unpack("<H", raw_data[0:2])
-        __data["addr_type"], = struct.unpack("<B", raw_data[2:3])
-        __data["subscribed"], = struct.unpack("<B", raw_data[3:4])
-        __data["raw_short_addr"], = struct.unpack("<H", raw_data[4:6])
-        __data["virtual_uuid"] = raw_data[6:22]
-        super(AddrGetRsp, self).__init__("AddrGet", 0xA7, __data)
+    _command_name = "AddrGet"
+    _opcode = 0xA7
+    _fields = ("address_handle", "addr_type", "subscribed", "raw_short_addr", "virtual_uuid")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.address_handle, self.addr_type, self.subscribed, self.raw_short_addr = _ADDR_GET_RSP.unpack_from(raw_data, offset)
+        self.virtual_uuid = raw_data[offset + 6:offset + 22]
 
 
 class AddrGetAllRsp(ResponsePacket):
     """Response to a(n) AddrGetAll command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["address_handles"] = raw_data[0:252]
-        super(AddrGetAllRsp, self).__init__("AddrGetAll", 0xA8, __data)
+    _command_name = "AddrGetAll"
+    _opcode = 0xA8
+    _fields = ("address_handles",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.address_handles = raw_data[offset + 0:offset + 252]
+
+
+_ADDR_NONVIRTUAL_COUNT_MAX_GET_RSP = struct.Struct("<H")
 
 
 class AddrNonvirtualCountMaxGetRsp(ResponsePacket):
     """Response to a(n) AddrNonvirtualCountMaxGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["list_size"], = struct.unpack("<H", raw_data[0:2])
-        super(AddrNonvirtualCountMaxGetRsp, self).__init__("AddrNonvirtualCountMaxGet", 0xA9, __data)
+    _command_name = "AddrNonvirtualCountMaxGet"
+    _opcode = 0xA9
+    _fields = ("list_size",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.list_size, = _ADDR_NONVIRTUAL_COUNT_MAX_GET_RSP.unpack_from(raw_data, offset)
+
+
+_ADDR_VIRTUAL_COUNT_MAX_GET_RSP = struct.Struct("<H")
 
 
 class AddrVirtualCountMaxGetRsp(ResponsePacket):
     """Response to a(n) AddrVirtualCountMaxGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["list_size"], = struct.unpack("<H", raw_data[0:2])
-        super(AddrVirtualCountMaxGetRsp, self).__init__("AddrVirtualCountMaxGet", 0xAA, __data)
+    _command_name = "AddrVirtualCountMaxGet"
+    _opcode = 0xAA
+    _fields = ("list_size",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.list_size, = _ADDR_VIRTUAL_COUNT_MAX_GET_RSP.unpack_from(raw_data, offset)
+
+
+_ADDR_SUBSCRIPTION_ADD_RSP = struct.Struct("<H")
 
 
 class AddrSubscriptionAddRsp(ResponsePacket):
     """Response to a(n) AddrSubscriptionAdd command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["address_handle"], = struct.unpack("<H", raw_data[0:2])
-        super(AddrSubscriptionAddRsp, self).__init__("AddrSubscriptionAdd", 0xA1, __data)
+    _command_name = "AddrSubscriptionAdd"
+    _opcode = 0xA1
+    _fields = ("address_handle",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.address_handle, = _ADDR_SUBSCRIPTION_ADD_RSP.unpack_from(raw_data, offset)
+
+
+_ADDR_SUBSCRIPTION_ADD_VIRTUAL_RSP = struct.Struct("<H")
 
 
 class AddrSubscriptionAddVirtualRsp(ResponsePacket):
     """Response to a(n) AddrSubscriptionAddVirtual command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["address_handle"], = struct.unpack("<H", raw_data[0:2])
-        super(AddrSubscriptionAddVirtualRsp, self).__init__("AddrSubscriptionAddVirtual", 0xA2, __data)
+    _command_name = "AddrSubscriptionAddVirtual"
+    _opcode = 0xA2
+    _fields = ("address_handle",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.address_handle, = _ADDR_SUBSCRIPTION_ADD_VIRTUAL_RSP.unpack_from(raw_data, offset)
+
+
+_ADDR_SUBSCRIPTION_REMOVE_RSP = struct.Struct("<H")
 
 
 class AddrSubscriptionRemoveRsp(ResponsePacket):
     """Response to a(n) AddrSubscriptionRemove command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["address_handle"], = struct.unpack("<H", raw_data[0:2])
-        super(AddrSubscriptionRemoveRsp, self).__init__("AddrSubscriptionRemove", 0xA3, __data)
+    _command_name = "AddrSubscriptionRemove"
+    _opcode = 0xA3
+    _fields = ("address_handle",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.address_handle, = _ADDR_SUBSCRIPTION_REMOVE_RSP.unpack_from(raw_data, offset)
+
+
+_ADDR_PUBLICATION_ADD_RSP = struct.Struct("<H")
 
 
 class AddrPublicationAddRsp(ResponsePacket):
     """Response to a(n) AddrPublicationAdd command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["address_handle"], = struct.unpack("<H", raw_data[0:2])
-        super(AddrPublicationAddRsp, self).__init__("AddrPublicationAdd", 0xA4, __data)
+    _command_name = "AddrPublicationAdd"
+    _opcode = 0xA4
+    _fields = ("address_handle",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.address_handle, = _ADDR_PUBLICATION_ADD_RSP.unpack_from(raw_data, offset)
+
+
+_ADDR_PUBLICATION_ADD_VIRTUAL_RSP = struct.Struct("<H")
 
 
 class AddrPublicationAddVirtualRsp(ResponsePacket):
     """Response to a(n) AddrPublicationAddVirtual command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["address_handle"], = struct.unpack("<H", raw_data[0:2])
-        super(AddrPublicationAddVirtualRsp, self).__init__("AddrPublicationAddVirtual", 0xA5, __data)
+    _command_name = "AddrPublicationAddVirtual"
+    _opcode = 0xA5
+    _fields = ("address_handle",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.address_handle, = _ADDR_PUBLICATION_ADD_VIRTUAL_RSP.unpack_from(raw_data, offset)
+
+
+_ADDR_PUBLICATION_REMOVE_RSP = struct.Struct("<H")
 
 
 class AddrPublicationRemoveRsp(ResponsePacket):
     """Response to a(n) AddrPublicationRemove command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["address_handle"], = struct.unpack("<H", raw_data[0:2])
-        super(AddrPublicationRemoveRsp, self).__init__("AddrPublicationRemove", 0xA6, __data)
+    _command_name = "AddrPublicationRemove"
+    _opcode = 0xA6
+    _fields = ("address_handle",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.address_handle, = _ADDR_PUBLICATION_REMOVE_RSP.unpack_from(raw_data, offset)
+
+
+_PACKET_SEND_RSP = struct.Struct("<I")
 
 
 class PacketSendRsp(ResponsePacket):
     """Response to a(n) PacketSend command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["token"], = struct.unpack("<I", raw_data[0:4])
-        super(PacketSendRsp, self).__init__("PacketSend", 0xAB, __data)
+    _command_name = "PacketSend"
+    _opcode = 0xAB
+    _fields = ("token",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.token, = _PACKET_SEND_RSP.unpack_from(raw_data, offset)
+
+
+_BANK_INFO_GET_RSP = struct.Struct("<B10xBII")
 
 
 class BankInfoGetRsp(ResponsePacket):
     """Response to a(n) BankInfoGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["dfu_type"], = struct.unpack("<B", raw_data[0:1])
-        __data["fwid"] = raw_data[1:11]
-        __data["is_signed"], = struct.unpack("<B", raw_data[11:12])
-        __data["start_addr"], = struct.unpack("<I", raw_data[12:16])
-        __data["length"], = struct.unpack("<I", raw_data[16:20])
-        super(BankInfoGetRsp, self).__init__("BankInfoGet", 0xD4, __data)
+    _command_name = "BankInfoGet"
+    _opcode = 0xD4
+    _fields = ("dfu_type", "fwid", "is_signed", "start_addr", "length")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.dfu_type, self.is_signed, self.start_addr, self.length = _BANK_INFO_GET_RSP.unpack_from(raw_data, offset)
+        self.fwid = raw_data[offset + 1:offset + 11]
+
+
+_STATE_GET_RSP = struct.Struct("<BB10xBB")
 
 
 class StateGetRsp(ResponsePacket):
     """Response to a(n) StateGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["role"], = struct.unpack("<B", raw_data[0:1])
-        __data["type"], = struct.unpack("<B", raw_data[1:2])
-        __data["fwid"] = raw_data[2:12]
-        __data["state"], = struct.unpack("<B", raw_data[12:13])
-        __data["data_progress"], = struct.unpack("<B", raw_data[13:14])
-        super(StateGetRsp, self).__init__("StateGet", 0xD6, __data)
+    _command_name = "StateGet"
+    _opcode = 0xD6
+    _fields = ("role", "type", "fwid", "state", "data_progress")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.role, self.type, self.state, self.data_progress = _STATE_GET_RSP.unpack_from(raw_data, offset)
+        self.fwid = raw_data[offset + 2:offset + 12]
+
+
+_MODEL_PUB_ADDR_GET_RSP = struct.Struct("<H")
 
 
 class ModelPubAddrGetRsp(ResponsePacket):
     """Response to a(n) ModelPubAddrGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["addr_handle"], = struct.unpack("<H", raw_data[0:2])
-        super(ModelPubAddrGetRsp, self).__init__("ModelPubAddrGet", 0xE1, __data)
+    _command_name = "ModelPubAddrGet"
+    _opcode = 0xE1
+    _fields = ("addr_handle",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.addr_handle, = _MODEL_PUB_ADDR_GET_RSP.unpack_from(raw_data, offset)
+
+
+_MODEL_PUB_PERIOD_GET_RSP = struct.Struct("<BB")
 
 
 class ModelPubPeriodGetRsp(ResponsePacket):
     """Response to a(n) ModelPubPeriodGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["resolution"], = struct.unpack("<B", raw_data[0:1])
-        __data["step_number"], = struct.unpack("<B", raw_data[1:2])
-        super(ModelPubPeriodGetRsp, self).__init__("ModelPubPeriodGet", 0xE3, __data)
+    _command_name = "ModelPubPeriodGet"
+    _opcode = 0xE3
+    _fields = ("resolution", "step_number")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.resolution, self.step_number = _MODEL_PUB_PERIOD_GET_RSP.unpack_from(raw_data, offset)
+
+
+_MODEL_SUBS_GET_RSP = struct.Struct("<H")
 
 
 class ModelSubsGetRsp(ResponsePacket):
     """Response to a(n) ModelSubsGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["count"], = struct.unpack("<H", raw_data[0:2])
-        __data["address_handles"] = raw_data[2:252]
-        super(ModelSubsGetRsp, self).__init__("ModelSubsGet", 0xE6, __data)
+    _command_name = "ModelSubsGet"
+    _opcode = 0xE6
+    _fields = ("count", "address_handles")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.count, = _MODEL_SUBS_GET_RSP.unpack_from(raw_data, offset)
+        self.address_handles = raw_data[offset + 2:offset + 252]
+
+
+_MODEL_APP_GET_RSP = struct.Struct("<H")
 
 
 class ModelAppGetRsp(ResponsePacket):
     """Response to a(n) ModelAppGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["count"], = struct.unpack("<H", raw_data[0:2])
-        __data["appkey_handles"] = raw_data[2:252]
-        super(ModelAppGetRsp, self).__init__("ModelAppGet", 0xE9, __data)
+    _command_name = "ModelAppGet"
+    _opcode = 0xE9
+    _fields = ("count", "appkey_handles")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.count, = _MODEL_APP_GET_RSP.unpack_from(raw_data, offset)
+        self.appkey_handles = raw_data[offset + 2:offset + 252]
+
+
+_MODEL_PUB_APP_GET_RSP = struct.Struct("<H")
 
 
 class ModelPubAppGetRsp(ResponsePacket):
     """Response to a(n) ModelPubAppGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["appkey_handle"], = struct.unpack("<H", raw_data[0:2])
-        super(ModelPubAppGetRsp, self).__init__("ModelPubAppGet", 0xEB, __data)
+    _command_name = "ModelPubAppGet"
+    _opcode = 0xEB
+    _fields = ("appkey_handle",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.appkey_handle, = _MODEL_PUB_APP_GET_RSP.unpack_from(raw_data, offset)
+
+
+_MODEL_PUB_TTL_GET_RSP = struct.Struct("<B")
 
 
 class ModelPubTtlGetRsp(ResponsePacket):
     """Response to a(n) ModelPubTtlGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["ttl"], = struct.unpack("<B", raw_data[0:1])
-        super(ModelPubTtlGetRsp, self).__init__("ModelPubTtlGet", 0xED, __data)
+    _command_name = "ModelPubTtlGet"
+    _opcode = 0xED
+    _fields = ("ttl",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.ttl, = _MODEL_PUB_TTL_GET_RSP.unpack_from(raw_data, offset)
+
+
+_ELEM_LOC_GET_RSP = struct.Struct("<H")
 
 
 class ElemLocGetRsp(ResponsePacket):
     """Response to a(n) ElemLocGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["location"], = struct.unpack("<H", raw_data[0:2])
-        super(ElemLocGetRsp, self).__init__("ElemLocGet", 0xEF, __data)
+    _command_name = "ElemLocGet"
+    _opcode = 0xEF
+    _fields = ("location",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.location, = _ELEM_LOC_GET_RSP.unpack_from(raw_data, offset)
+
+
+_ELEM_SIG_MODEL_COUNT_GET_RSP = struct.Struct("<B")
 
 
 class ElemSigModelCountGetRsp(ResponsePacket):
     """Response to a(n) ElemSigModelCountGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["model_count"], = struct.unpack("<B", raw_data[0:1])
-        super(ElemSigModelCountGetRsp, self).__init__("ElemSigModelCountGet", 0xF0, __data)
+    _command_name = "ElemSigModelCountGet"
+    _opcode = 0xF0
+    _fields = ("model_count",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.model_count, = _ELEM_SIG_MODEL_COUNT_GET_RSP.unpack_from(raw_data, offset)
+
+
+_ELEM_VENDOR_MODEL_COUNT_GET_RSP = struct.Struct("<B")
 
 
 class ElemVendorModelCountGetRsp(ResponsePacket):
     """Response to a(n) ElemVendorModelCountGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["model_count"], = struct.unpack("<B", raw_data[0:1])
-        super(ElemVendorModelCountGetRsp, self).__init__("ElemVendorModelCountGet", 0xF1, __data)
+    _command_name = "ElemVendorModelCountGet"
+    _opcode = 0xF1
+    _fields = ("model_count",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.model_count, = _ELEM_VENDOR_MODEL_COUNT_GET_RSP.unpack_from(raw_data, offset)
+
+
+_MODEL_ID_GET_RSP = struct.Struct("<I")
 
 
 class ModelIdGetRsp(ResponsePacket):
     """Response to a(n) ModelIdGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["model_id"], = struct.unpack("<I", raw_data[0:4])
-        super(ModelIdGetRsp, self).__init__("ModelIdGet", 0xF2, __data)
+    _command_name = "ModelIdGet"
+    _opcode = 0xF2
+    _fields = ("model_id",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.model_id, = _MODEL_ID_GET_RSP.unpack_from(raw_data, offset)
+
+
+_HANDLE_GET_RSP = struct.Struct("<H")
 
 
 class HandleGetRsp(ResponsePacket):
     """Response to a(n) HandleGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["model_handle"], = struct.unpack("<H", raw_data[0:2])
-        super(HandleGetRsp, self).__init__("HandleGet", 0xF3, __data)
+    _command_name = "HandleGet"
+    _opcode = 0xF3
+    _fields = ("model_handle",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.model_handle, = _HANDLE_GET_RSP.unpack_from(raw_data, offset)
+
+
+_ELEM_MODELS_GET_RSP = struct.Struct("<H")
 
 
 class ElemModelsGetRsp(ResponsePacket):
     """Response to a(n) ElemModelsGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["count"], = struct.unpack("<H", raw_data[0:2])
-        __data["model_handles"] = raw_data[2:252]
-        super(ElemModelsGetRsp, self).__init__("ElemModelsGet", 0xF4, __data)
+    _command_name = "ElemModelsGet"
+    _opcode = 0xF4
+    _fields = ("count", "model_handles")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.count, = _ELEM_MODELS_GET_RSP.unpack_from(raw_data, offset)
+        self.model_handles = raw_data[offset + 2:offset + 252]
+
+
+_MODELS_GET_RSP = struct.Struct("<H")
 
 
 class ModelsGetRsp(ResponsePacket):
     """Response to a(n) ModelsGet command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["count"], = struct.unpack("<H", raw_data[0:2])
-        __data["model_ids"] = raw_data[2:250]
-        super(ModelsGetRsp, self).__init__("ModelsGet", 0xFC, __data)
+    _command_name = "ModelsGet"
+    _opcode = 0xFC
+    _fields = ("count", "model_ids")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.count, = _MODELS_GET_RSP.unpack_from(raw_data, offset)
+        self.model_ids = raw_data[offset + 2:offset + 250]
+
+
+_INIT_RSP = struct.Struct("<H")
 
 
 class InitRsp(ResponsePacket):
     """Response to a(n) Init command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["model_handle"], = struct.unpack("<H", raw_data[0:2])
-        super(InitRsp, self).__init__("Init", 0xFD, __data)
+    _command_name = "Init"
+    _opcode = 0xFD
+    _fields = ("model_handle",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.model_handle, = _INIT_RSP.unpack_from(raw_data, offset)
+
+
+_COMMAND_RSP = struct.Struct("<B")
 
 
 class CommandRsp(ResponsePacket):
     """Response to a(n) Command command."""
-    def __init__(self, raw_data):
-        __data = {}
-        __data["data_len"], = struct.unpack("<B", raw_data[0:1])
-        __data["data"] = raw_data[1:]
-        super(CommandRsp, self).__init__("Command", 0xFE, __data)
+    _command_name = "Command"
+    _opcode = 0xFE
+    _fields = ("data_len", "data")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.data_len, = _COMMAND_RSP.unpack_from(raw_data, offset)
+        self.data = raw_data[offset + 1:]
 
 
 RESPONSE_LUT = {
@@ -1901,15 +2327,20 @@ RESPONSE_LUT = {
 }
 
 
+# Response classes indexed by command opcode
+RESPONSE_TABLE = tuple(RESPONSE_LUT[opcode]["object"] if opcode in RESPONSE_LUT else None
+                       for opcode in range(256))
+
+
 def response_deserialize(rsp):
     if not isinstance(rsp, CmdRsp):
         raise TypeError("Expected a CmdRsp object.")
-    elif not rsp._data["opcode"] in RESPONSE_LUT:
-        return None
 
-    response = RESPONSE_LUT[rsp._data["opcode"]]
+    response = RESPONSE_TABLE[rsp.opcode]
+    if response is None:
+        return None
     # Response is always {opcode, status, [...]}
-    if len(rsp._data["data"]) > 0:
-        return response["object"](rsp._data["data"])
+    if len(rsp.data) > 0:
+        return response(rsp.data)
     else:
-        return response["name"]
+        return response._command_name
@@ -0,0 +1,614 @@
+# Copyright (c) 2010 - 2019, Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of Nordic Semiconductor ASA nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY, AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL NORDIC SEMICONDUCTOR ASA OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""Software stand-in for a mesh device running the serial example.
+
+`AciEmulator` implements the device side of the serial protocol: it answers
+the commands in `aci_cmd` the way the firmware does and keeps the device
+state manager (DSM) handle tables with the firmware's capacity limits. It can
+be attached to a host in two ways:
+
+- `EmulatedDevice` is an `aci_uart.Device` that talks to the emulator in
+  process, without any serial port.
+- `PtyEmulator` serves the emulator on a pseudo terminal, so that `Uart` can
+  open its `port` and be exercised end to end.
+"""
+
+import logging
+import os
+import queue
+import random
+import select
+import struct
+import threading
+import time
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import cmac
+from cryptography.hazmat.primitives.ciphers import algorithms
+
+from aci.aci_evt import Event
+from aci.aci_utils import LazyHex
+from aci.aci_sar import SarReassembler, event_frames, CMD_SAR_START, CMD_SAR_CONTINUE
+from aci.aci_uart import Device, PacketFramer, DEFAULT_WINDOW, CAPTURE_TX
+
+
+# Limits of the serial example, see examples/serial/include/nrf_mesh_config_app.h
+DSM_SUBNET_MAX = 8
+DSM_APP_MAX = 8
+DSM_DEVICE_MAX = 10
+DSM_VIRTUAL_ADDR_MAX = 8
+DSM_NONVIRTUAL_ADDR_MAX = 32
+
+SERIAL_API_VERSION = 10
+SERIAL_DEVICE_OPERATING_MODE_APPLICATION = 2
+NRF_MESH_SERIAL_PAYLOAD_MAXLEN = 254
+
+# Serial status codes, see STATUS_CODE_LUT
+SUCCESS = 0x00
+ERROR_INTERNAL = 0x81
+ERROR_CMD_UNKNOWN = 0x82
+ERROR_INVALID_LENGTH = 0x84
+ERROR_INVALID_PARAMETER = 0x85
+ERROR_INVALID_DATA = 0x87
+ERROR_REJECTED = 0x8E
+
+# nrf_mesh_address_type_t
+ADDRESS_TYPE_INVALID = 0
+ADDRESS_TYPE_UNICAST = 1
+ADDRESS_TYPE_VIRTUAL = 2
+ADDRESS_TYPE_GROUP = 3
+
+KEY_INDEX_MAX = 0x0FFF
+
+
+class _Reject(Exception):
+    """Aborts a command handler with the given serial status."""
+    def __init__(self, status):
+        super(_Reject, self).__init__(status)
+        self.status = status
+
+
+def address_type(address):
+    if address == 0:
+        return ADDRESS_TYPE_INVALID
+    elif address < 0x8000:
+        return ADDRESS_TYPE_UNICAST
+    elif address < 0xC000:
+        return ADDRESS_TYPE_VIRTUAL
+    else:
+        return ADDRESS_TYPE_GROUP
+
+
+def _aes_cmac(key, data):
+    c = cmac.CMAC(algorithms.AES(bytes(key)), backend=default_backend())
+    c.update(bytes(data))
+    return c.finalize()
+
+
+def virtual_address(label_uuid):
+    """Returns the virtual address of a label UUID (Mesh Profile 3.4.2.3)."""
+    salt = _aes_cmac(bytes(16), b"vtad")
+    digest = _aes_cmac(salt, label_uuid)
+    return 0x8000 | (struct.unpack(">H", digest[14:16])[0] & 0x3FFF)
+
+
+def event_frame(opcode, payload=b""):
+    return bytearray([len(payload) + 1, opcode]) + payload
+
+
+def mesh_message_received_frames(src, dst, data, appkey_handle=0, subnet_handle=0,
+                                 ttl=8, rssi=-40, subscription=False):
+    """Returns the frames of a received mesh message, segmented if the data is long."""
+    opcode = (Event.MESH_MESSAGE_RECEIVED_SUBSCRIPTION if subscription
+              else Event.MESH_MESSAGE_RECEIVED_UNICAST)
+    payload = struct.pack("<HHHHBB6sbH", src, dst, appkey_handle, subnet_handle,
+                          ttl, 0, bytes(6), rssi, len(data))
+    return event_frames(opcode, payload + bytes(data))
+
+
+def unprovisioned_received_frame(uuid, rssi=-40, gatt_supported=0):
+    payload = struct.pack("<16sbB6sB", bytes(uuid), rssi, gatt_supported, bytes(6), 0)
+    return event_frame(Event.PROV_UNPROVISIONED_RECEIVED, payload)
+
+
+def tx_complete_frame(token):
+    return event_frame(Event.MESH_TX_COMPLETE, struct.pack("<I", token))
+
+
+class _Injector(threading.Thread):
+    def __init__(self, emulator, factory, rate, count):
+        threading.Thread.__init__(self, daemon=True)
+        self.emulator = emulator
+        self.factory = factory
+        self.interval = 1.0 / rate
+        self.count = count
+        self.keep_running = True
+
+    def run(self):
+        sent = 0
+        deadline = time.monotonic()
+        while self.keep_running and (self.count is None or sent < self.count):
+            deadline += self.interval
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            for frame in self.factory():
+                self.emulator.emit(frame)
+            sent += 1
+
+
+class AciEmulator(object):
+    """Device side of the serial protocol.
+
+    Command frames are passed to `command()`; every event the emulated device
+    sends, be it a response or unsolicited, is handed to the `emit` callback
+    as a raw frame. Limits are read from `config` (an ApplicationConfig) when
+    given.
+    """
+    def __init__(self, emit, config=None, tx_complete=True):
+        self.emit = emit
+        self.subnet_max = getattr(config, "DSM_SUBNET_MAX", DSM_SUBNET_MAX)
+        self.app_max = getattr(config, "DSM_APP_MAX", DSM_APP_MAX)
+        self.device_max = getattr(config, "DSM_DEVICE_MAX", DSM_DEVICE_MAX)
+        self.virtual_max = getattr(config, "DSM_VIRTUAL_ADDR_MAX", DSM_VIRTUAL_ADDR_MAX)
+        self.nonvirtual_max = getattr(config, "DSM_NONVIRTUAL_ADDR_MAX", DSM_NONVIRTUAL_ADDR_MAX)
+        # Emit MeshTxComplete for every accepted PacketSend
+        self.tx_complete = tx_complete
+        self.uuid = bytes(random.getrandbits(8) for _ in range(16))
+        self._lock = threading.Lock()
+        self._injectors = []
+        self._sar = SarReassembler(CMD_SAR_START, CMD_SAR_CONTINUE)
+        self._handlers = {
+            0x02: self._echo,
+            0x09: self._serial_version_get,
+            0x0E: self._radio_reset,
+            0x54: self._uuid_get,
+            0x61: self._success,
+            0x62: self._success,
+            0x63: self._provision,
+            0x64: self._success,
+            0x66: self._success,
+            0x67: self._success,
+            0x68: self._success,
+            0x69: self._success,
+            0x6A: self._success,
+            0x90: self._success,
+            0x91: self._success,
+            0x92: self._subnet_add,
+            0x93: self._subnet_update,
+            0x94: self._subnet_delete,
+            0x95: self._subnet_get_all,
+            0x96: lambda data: struct.pack("<H", self.subnet_max),
+            0x97: self._appkey_add,
+            0x98: self._appkey_update,
+            0x99: self._appkey_delete,
+            0x9A: self._appkey_get_all,
+            0x9B: lambda data: struct.pack("<H", self.app_max),
+            0x9C: self._devkey_add,
+            0x9D: self._devkey_delete,
+            0x9E: lambda data: struct.pack("<H", self.device_max),
+            0x9F: self._addr_local_unicast_set,
+            0xA0: self._addr_local_unicast_get,
+            0xA1: lambda data: self._addr_add(data, subscription=True),
+            0xA2: lambda data: self._addr_add_virtual(data, subscription=True),
+            0xA3: lambda data: self._addr_remove(data, subscription=True),
+            0xA4: lambda data: self._addr_add(data, subscription=False),
+            0xA5: lambda data: self._addr_add_virtual(data, subscription=False),
+            0xA6: lambda data: self._addr_remove(data, subscription=False),
+            0xA7: self._addr_get,
+            0xA8: self._addr_get_all,
+            0xA9: lambda data: struct.pack("<H", self.nonvirtual_max),
+            0xAA: lambda data: struct.pack("<H", self.virtual_max),
+            0xAB: self._packet_send,
+            0xAC: self._state_clear,
+        }
+        self._sent_token = None
+        self._clear()
+
+    def _clear(self):
+        self.subnets = [None] * self.subnet_max
+        self.appkeys = [None] * self.app_max
+        self.devkeys = [None] * self.device_max
+        self.addresses = [None] * self.nonvirtual_max
+        self.virtual_addresses = [None] * self.virtual_max
+        self.local_unicast = (0, 0)
+        self.token = 0
+        self.context = 0
+
+    def state_clear(self):
+        with self._lock:
+            self._clear()
+
+    def reset(self):
+        """Reboots the emulated device. Volatile state is lost."""
+        self.state_clear()
+        self.emit(event_frame(Event.DEVICE_STARTED, bytes([
+            SERIAL_DEVICE_OPERATING_MODE_APPLICATION, 0, NRF_MESH_SERIAL_PAYLOAD_MAXLEN])))
+
+    def command(self, frame):
+        """Handles a single command frame (length byte included)."""
+        opcode = frame[1]
+        if self._sar.is_segment(frame):
+            packet = self._sar.feed(frame)
+            if packet is not None:
+                self.command(packet)
+            return
+
+        data = bytes(frame[2:])
+        handler = self._handlers.get(opcode)
+        if handler is None:
+            self.emit(self._cmd_rsp(opcode, ERROR_CMD_UNKNOWN))
+            return
+
+        try:
+            with self._lock:
+                rsp = handler(data)
+        except _Reject as e:
+            # The firmware never sends response data along with an error
+            self.emit(self._cmd_rsp(opcode, e.status))
+        except struct.error:
+            self.emit(self._cmd_rsp(opcode, ERROR_INVALID_LENGTH))
+        else:
+            if rsp is not None:
+                self.emit(self._cmd_rsp(opcode, SUCCESS, rsp))
+        self._after_command(opcode)
+
+    def _after_command(self, opcode):
+        if opcode == 0x0E:
+            self.reset()
+        elif opcode == 0xAB and self._sent_token is not None and self.tx_complete:
+            self.emit(tx_complete_frame(self._sent_token))
+
+    def inject(self, factory, rate, count=None):
+        """Emits the frames in the list returned by `factory()`, `rate` times per second.
+
+        Runs `count` times, or until `stop_injection()` if count is None.
+        """
+        injector = _Injector(self, factory, rate, count)
+        self._injectors.append(injector)
+        injector.start()
+        return injector
+
+    def inject_mesh_messages(self, rate, count=None, data=b"\x82\x04\x01",
+                             src=0x0002, dst=None, subscription=False):
+        if dst is None:
+            dst = 0xC000 if subscription else max(self.local_unicast[0], 1)
+        frames = mesh_message_received_frames(src, dst, data, subscription=subscription)
+        return self.inject(lambda: frames, rate, count)
+
+    def inject_unprovisioned_beacons(self, rate, count=None):
+        return self.inject(
+            lambda: [unprovisioned_received_frame(bytes(random.getrandbits(8) for _ in range(16)))],
+            rate, count)
+
+    def inject_tx_complete(self, rate, count=None):
+        def factory():
+            with self._lock:
+                self.token = (self.token + 1) & 0xFFFFFFFF
+                return [tx_complete_frame(self.token)]
+        return self.inject(factory, rate, count)
+
+    def stop_injection(self):
+        for injector in self._injectors:
+            injector.keep_running = False
+        for injector in self._injectors:
+            injector.join()
+        self._injectors = []
+
+    def _cmd_rsp(self, opcode, status, data=b""):
+        return event_frame(Event.CMD_RSP, bytes([opcode, status]) + data)
+
+    # Device commands
+
+    def _echo(self, data):
+        self.emit(event_frame(Event.DEVICE_ECHO_RSP, data))
+
+    def _radio_reset(self, data):
+        # Answered by DeviceStarted, see _after_command()
+        pass
+
+    def _serial_version_get(self, data):
+        return struct.pack("<H", SERIAL_API_VERSION)
+
+    def _uuid_get(self, data):
+        return self.uuid
+
+    def _success(self, data):
+        return b""
+
+    def _provision(self, data):
+        self.context += 1
+        return struct.pack("<B", self.context & 0xFF)
+
+    # Keys
+
+    def _key_add(self, table, index, key, owner):
+        if index > KEY_INDEX_MAX:
+            raise _Reject(ERROR_INVALID_PARAMETER)
+        for entry in table:
+            if entry and entry["index"] == index and entry["owner"] == owner:
+                # dsm returns NRF_ERROR_INTERNAL for a duplicate with the same key
+                raise _Reject(ERROR_INTERNAL if entry["key"] == key else ERROR_REJECTED)
+        return self._allocate(table, {"index": index, "key": key, "owner": owner})
+
+    def _allocate(self, table, entry):
+        for handle, existing in enumerate(table):
+            if existing is None:
+                table[handle] = entry
+                return handle
+        raise _Reject(ERROR_REJECTED)
+
+    def _entry(self, table, handle, offset=0):
+        handle -= offset
+        if not 0 <= handle < len(table) or table[handle] is None:
+            raise _Reject(ERROR_REJECTED)
+        return table[handle]
+
+    def _subnet_add(self, data):
+        index, key = struct.unpack("<H16s", data)
+        return struct.pack("<H", self._key_add(self.subnets, index, key, None))
+
+    def _subnet_update(self, data):
+        handle, key = struct.unpack("<H16s", data)
+        self._entry(self.subnets, handle)["key"] = key
+        return struct.pack("<H", handle)
+
+    def _subnet_delete(self, data):
+        handle, = struct.unpack("<H", data)
+        self._entry(self.subnets, handle)
+        self.subnets[handle] = None
+        return struct.pack("<H", handle)
+
+    def _subnet_get_all(self, data):
+        indexes = [e["index"] for e in self.subnets if e]
+        return struct.pack("<%dH" % len(indexes), *indexes)
+
+    def _appkey_add(self, data):
+        index, subnet_handle, key = struct.unpack("<HH16s", data)
+        self._entry(self.subnets, subnet_handle)
+        return struct.pack("<H", self._key_add(self.appkeys, index, key, subnet_handle))
+
+    def _appkey_update(self, data):
+        handle, key = struct.unpack("<H16s", data)
+        self._entry(self.appkeys, handle)["key"] = key
+        return struct.pack("<H", handle)
+
+    def _appkey_delete(self, data):
+        handle, = struct.unpack("<H", data)
+        self._entry(self.appkeys, handle)
+        self.appkeys[handle] = None
+        return struct.pack("<H", handle)
+
+    def _appkey_get_all(self, data):
+        subnet_handle, = struct.unpack("<H", data)
+        self._entry(self.subnets, subnet_handle)
+        indexes = [e["index"] for e in self.appkeys if e and e["owner"] == subnet_handle]
+        if not indexes:
+            # The firmware leaves out the subnet handle too
+            return b""
+        return struct.pack("<H%dH" % len(indexes), subnet_handle, *indexes)
+
+    def _devkey_add(self, data):
+        owner, subnet_handle, key = struct.unpack("<HH16s", data)
+        if address_type(owner) != ADDRESS_TYPE_UNICAST:
+            raise _Reject(ERROR_INVALID_DATA)
+        self._entry(self.subnets, subnet_handle)
+        if any(e and e["owner"] == owner for e in self.devkeys):
+            raise _Reject(ERROR_REJECTED)
+        handle = self._allocate(self.devkeys, {"index": None, "key": key, "owner": owner})
+        # Device keys share the handle space with application keys
+        return struct.pack("<H", self.app_max + handle)
+
+    def _devkey_delete(self, data):
+        handle, = struct.unpack("<H", data)
+        self._entry(self.devkeys, handle, self.app_max)
+        self.devkeys[handle - self.app_max] = None
+        return struct.pack("<H", handle)
+
+    # Addresses
+
+    def _addr_local_unicast_set(self, data):
+        start, count = struct.unpack("<HH", data)
+        if (count == 0 or address_type(start) != ADDRESS_TYPE_UNICAST
+                or address_type(start + count - 1) != ADDRESS_TYPE_UNICAST):
+            raise _Reject(ERROR_INVALID_DATA)
+        self.local_unicast = (start, count)
+        return b""
+
+    def _addr_local_unicast_get(self, data):
+        return struct.pack("<HH", *self.local_unicast)
+
+    def _addr_use(self, table, offset, entry, subscription):
+        for handle, existing in enumerate(table):
+            if existing and existing["address"] == entry["address"]:
+                break
+        else:
+            entry.update({"subscriptions": 0, "publications": 0})
+            handle = self._allocate(table, entry)
+            existing = entry
+        existing["subscriptions" if subscription else "publications"] += 1
+        return struct.pack("<H", offset + handle)
+
+    def _addr_add(self, data, subscription):
+        address, = struct.unpack("<H", data)
+        allowed = (ADDRESS_TYPE_GROUP,) if subscription else (ADDRESS_TYPE_GROUP, ADDRESS_TYPE_UNICAST)
+        if address_type(address) not in allowed:
+            raise _Reject(ERROR_INVALID_DATA)
+        return self._addr_use(self.addresses, 0, {"address": address, "uuid": None}, subscription)
+
+    def _addr_add_virtual(self, data, subscription):
+        uuid, = struct.unpack("<16s", data)
+        entry = {"address": virtual_address(uuid), "uuid": uuid}
+        return self._addr_use(self.virtual_addresses, self.nonvirtual_max, entry, subscription)
+
+    def _addr_lookup(self, handle):
+        if handle >= self.nonvirtual_max:
+            return self.virtual_addresses, handle - self.nonvirtual_max
+        return self.addresses, handle
+
+    def _addr_remove(self, data, subscription):
+        handle, = struct.unpack("<H", data)
+        table, slot = self._addr_lookup(handle)
+        entry = self._entry(table, slot)
+        key = "subscriptions" if subscription else "publications"
+        if entry[key] == 0:
+            raise _Reject(ERROR_REJECTED)
+        entry[key] -= 1
+        if entry["subscriptions"] == 0 and entry["publications"] == 0:
+            table[slot] = None
+        return b""
+
+    def _addr_get(self, data):
+        handle, = struct.unpack("<H", data)
+        table, slot = self._addr_lookup(handle)
+        entry = self._entry(table, slot)
+        rsp = struct.pack("<HBBH", handle, address_type(entry["address"]),
+                          int(entry["subscriptions"] > 0), entry["address"])
+        if entry["uuid"] is not None:
+            rsp += entry["uuid"]
+        return rsp
+
+    def _addr_get_all(self, data):
+        handles = [h for h, e in enumerate(self.addresses) if e]
+        handles += [self.nonvirtual_max + h for h, e in enumerate(self.virtual_addresses) if e]
+        return struct.pack("<%dH" % len(handles), *handles)
+
+    def _packet_send(self, data):
+        self._sent_token = None
+        appkey_handle, src, dst_handle, ttl, force_segmented, transmic_size, friendship = \
+            struct.unpack_from("<HHHBBBB", data)
+        if appkey_handle < self.app_max:
+            self._entry(self.appkeys, appkey_handle)
+        else:
+            self._entry(self.devkeys, appkey_handle, self.app_max)
+        table, slot = self._addr_lookup(dst_handle)
+        self._entry(table, slot)
+        start, count = self.local_unicast
+        if not start <= src < start + count:
+            raise _Reject(ERROR_INVALID_DATA)
+        self.token = (self.token + 1) & 0xFFFFFFFF
+        self._sent_token = self.token
+        return struct.pack("<I", self.token)
+
+    def _state_clear(self, data):
+        self._clear()
+        return b""
+
+
+class EmulatedDevice(Device):
+    """A Device backed by an in-process AciEmulator instead of a serial port.
+
+    Events are delivered from a dedicated thread, as they would be from the
+    reader thread of a Uart.
+    """
+    def __init__(self, device_name="emulator", window=DEFAULT_WINDOW, config=None, tx_complete=True, events=None):
+        self.device_name = device_name
+        self.logger = logging.getLogger(self.device_name)
+        self.emulator = AciEmulator(self._rx_queue_put, config, tx_complete)
+        self._rx_queue = queue.Queue()
+        self.keep_running = True
+        Device.__init__(self, self.device_name, window, events=events)
+        threading.Thread(target=self.__reader).start()
+
+    def _rx_queue_put(self, frame):
+        self._rx_queue.put(frame)
+
+    def __reader(self):
+        while True:
+            frame = self._rx_queue.get()
+            if frame is None:
+                return
+            self._receive_frame(frame)
+
+    def stop(self):
+        if self.keep_running:
+            self.keep_running = False
+            self.emulator.stop_injection()
+            self._rx_queue.put(None)
+        self.kill_writer()
+
+    def write_data(self, data):
+        if self.keep_running:
+            self.logger.debug("TX: %s", LazyHex(data))
+            if self.capture:
+                self.capture.write(CAPTURE_TX, data)
+            self.process_command(data)
+            self.emulator.command(bytearray(data))
+
+    def __repr__(self):
+        return '%s(device_name="%s")' % (self.__class__.__name__, self.device_name)
+
+
+class PtyEmulator(threading.Thread):
+    """Serves an AciEmulator on the master side of a pseudo terminal.
+
+    Open `port` with `Uart` (rtscts=False) to talk to the emulated device.
+    `baudrate` paces the emulated device's transmissions like a UART would,
+    0 sends as fast as the host reads.
+    """
+    def __init__(self, config=None, tx_complete=True, baudrate=0):
+        threading.Thread.__init__(self, daemon=True)
+        self.master, self._slave = os.openpty()
+        self.port = os.ttyname(self._slave)
+        self.baudrate = baudrate
+        self._write_lock = threading.Lock()
+        self.emulator = AciEmulator(self._write, config, tx_complete)
+        self.keep_running = True
+        self.start()
+
+    def _write(self, frame):
+        view = memoryview(frame)
+        with self._write_lock:
+            if self.baudrate:
+                # Start bit + 8 data bits + stop bit per byte
+                time.sleep(len(frame) * 10 / self.baudrate)
+            while view:
+                view = view[os.write(self.master, view):]
+
+    def run(self):
+        framer = PacketFramer()
+        while self.keep_running:
+            if not select.select([self.master], [], [], 0.1)[0]:
+                continue
+            try:
+                count = framer.read_from(self.master)
+            except OSError:
+                break
+            if not count:
+                break
+            for frame in framer.packets():
+                self.emulator.command(bytearray(frame))
+
+    def stop(self):
+        self.keep_running = False
+        self.emulator.stop_injection()
+        self.join()
+        os.close(self._slave)
+        os.close(self.master)
@@ -0,0 +1,157 @@
+# Copyright (c) 2010 - 2019, Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of Nordic Semiconductor ASA nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY, AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL NORDIC SEMICONDUCTOR ASA OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+import collections
+import mmap
+import struct
+import threading
+import time
+
+from aci.aci_evt import event_deserialize
+
+
+EVENT_STORE_SIZE = 1024
+
+# Spill file slots: sequence number + 1 (0 for an empty slot), timestamp in
+# ns and frame length, followed by room for the largest single frame.
+SLOT_HEADER = struct.Struct("<QQH")
+SLOT_DATA_SIZE = 256
+SLOT_SIZE = SLOT_HEADER.size + SLOT_DATA_SIZE
+
+if hasattr(time, "monotonic_ns"):
+    monotonic_ns = time.monotonic_ns
+else:
+    def monotonic_ns():
+        return int(time.monotonic() * 1e9)
+
+
+class EventStore(object):
+    """Bounded history of the received events.
+
+    The latest `size` frames are kept in memory and decoded only when read.
+    Older frames are moved to the spill file if one is given, a memory mapped
+    ring of `spill_slots` frames, and are dropped otherwise. Every frame gets
+    a sequence number, so consumers can page through the history with
+    `page()` without holding it all in memory.
+    """
+    def __init__(self, size=EVENT_STORE_SIZE, spill_path=None, spill_slots=65536):
+        self.size = size
+        self._lock = threading.Lock()
+        self._ring = collections.deque()
+        self.next_seq = 0
+        # Frames moved to the spill file, and frames no longer available
+        self.spilled = 0
+        self.dropped = 0
+        self._spill = None
+        self._spill_slots = spill_slots
+        if spill_path:
+            self._spill_file = open(spill_path, "w+b")
+            self._spill_file.truncate(spill_slots * SLOT_SIZE)
+            self._spill = mmap.mmap(self._spill_file.fileno(), spill_slots * SLOT_SIZE)
+
+    def close(self):
+        with self._lock:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill_file.close()
+                self._spill = None
+
+    def __len__(self):
+        return self.next_seq - self.first_seq()
+
+    def first_seq(self):
+        """Returns the sequence number of the oldest frame that is still available."""
+        with self._lock:
+            if self._spill is not None:
+                return max(self.next_seq - len(self._ring) - self._spill_slots, 0)
+            return self.next_seq - len(self._ring)
+
+    def append(self, frame):
+        """Adds a received frame. The store keeps a reference, not a copy."""
+        timestamp = monotonic_ns()
+        with self._lock:
+            self._ring.append((self.next_seq, timestamp, frame))
+            self.next_seq += 1
+            if len(self._ring) > self.size:
+                self._evict(*self._ring.popleft())
+
+    def _evict(self, seq, timestamp, frame):
+        if self._spill is None or len(frame) > SLOT_DATA_SIZE:
+            self.dropped += 1
+            return
+        offset = (seq % self._spill_slots) * SLOT_SIZE
+        old_seq, = struct.unpack_from("<Q", self._spill, offset)
+        if old_seq:
+            self.dropped += 1
+        SLOT_HEADER.pack_into(self._spill, offset, seq + 1, timestamp, len(frame))
+        self.spilled += 1
+        start = offset + SLOT_HEADER.size
+        self._spill[start:start + len(frame)] = frame
+
+    def _spilled(self, seq):
+        offset = (seq % self._spill_slots) * SLOT_SIZE
+        stored, timestamp, length = SLOT_HEADER.unpack_from(self._spill, offset)
+        if stored != seq + 1:
+            return None
+        start = offset + SLOT_HEADER.size
+        return timestamp, bytearray(self._spill[start:start + length])
+
+    def page(self, start=None, count=None):
+        """Returns up to `count` events from sequence number `start` on.
+
+        Events are returned as (sequence number, timestamp in ns, event)
+        tuples. By default, the `count` latest events are returned, or all
+        the events still in memory if `count` is None as well. Sequence
+        numbers are skipped for frames that are no longer available or can't
+        be decoded.
+        """
+        with self._lock:
+            if count is None:
+                count = len(self._ring)
+            if start is None:
+                start = max(self.next_seq - count, 0)
+            end = min(start + count, self.next_seq)
+            ring_start = self.next_seq - len(self._ring)
+
+            records = []
+            for seq in range(start, min(end, ring_start)):
+                if self._spill is not None:
+                    record = self._spilled(seq)
+                    if record:
+                        records.append((seq,) + record)
+            for i in range(max(start, ring_start) - ring_start, end - ring_start):
+                records.append(self._ring[i])
+
+        events = []
+        for seq, timestamp, frame in records:
+            event = event_deserialize(bytearray(frame))
+            if event is not None:
+                events.append((seq, timestamp, event))
+        return events
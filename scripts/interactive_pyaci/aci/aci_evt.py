@@ -27,10 +27,13 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
-# This file was autogenerated by serial_doc_gen_pyaci.py at 2019-05-10 12:51:27.
-from aci.aci_utils import EventPacket, barray_pop
+# This file was autogenerated by serial_doc_gen_pyaci.py at 2026-10-18 19:28:28.
+from aci.aci_utils import EventPacket
 import struct
 
+_CMD_RSP = struct.Struct("<BB")
+
+
 class CmdRsp(EventPacket):
     """Command response.
 
@@ -43,12 +46,17 @@ class CmdRsp(EventPacket):
         data : uint8_t[252]
             Optional command response data.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["opcode"], = struct.unpack("<B", raw_data[0:1])
-        __data["status"], = struct.unpack("<B", raw_data[1:2])
-        __data["data"] = raw_data[2:]
-        super(CmdRsp, self).__init__("CmdRsp", 0x84, __data)
+    _event_name = "CmdRsp"
+    _opcode = 0x84
+    _fields = ("opcode", "status", "data")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.opcode, self.status = _CMD_RSP.unpack_from(raw_data, offset)
+        self.data = raw_data[offset + 2:]
+
+
+_DEVICE_STARTED = struct.Struct("<BBB")
 
 
 class DeviceStarted(EventPacket):
@@ -64,12 +72,13 @@ class DeviceStarted(EventPacket):
         data_credit_available : uint8_t
             The number of bytes available in each of the tx and rx buffers.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["operating_mode"], = struct.unpack("<B", raw_data[0:1])
-        __data["hw_error"], = struct.unpack("<B", raw_data[1:2])
-        __data["data_credit_available"], = struct.unpack("<B", raw_data[2:3])
-        super(DeviceStarted, self).__init__("DeviceStarted", 0x81, __data)
+    _event_name = "DeviceStarted"
+    _opcode = 0x81
+    _fields = ("operating_mode", "hw_error", "data_credit_available")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.operating_mode, self.hw_error, self.data_credit_available = _DEVICE_STARTED.unpack_from(raw_data, offset)
 
 
 class DeviceEchoRsp(EventPacket):
@@ -80,10 +89,16 @@ class DeviceEchoRsp(EventPacket):
         data : uint8_t[254]
             Data received in the echo command.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["data"] = raw_data[0:]
-        super(DeviceEchoRsp, self).__init__("DeviceEchoRsp", 0x82, __data)
+    _event_name = "DeviceEchoRsp"
+    _opcode = 0x82
+    _fields = ("data",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.data = raw_data[offset + 0:]
+
+
+_DEVICE_INTERNAL_EVENT = struct.Struct("<BBB")
 
 
 class DeviceInternalEvent(EventPacket):
@@ -100,13 +115,14 @@ class DeviceInternalEvent(EventPacket):
         packet : uint8_t[31]
             Event data.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["event_type"], = struct.unpack("<B", raw_data[0:1])
-        __data["state"], = struct.unpack("<B", raw_data[1:2])
-        __data["packet_size"], = struct.unpack("<B", raw_data[2:3])
-        __data["packet"] = raw_data[3:34]
-        super(DeviceInternalEvent, self).__init__("DeviceInternalEvent", 0x83, __data)
+    _event_name = "DeviceInternalEvent"
+    _opcode = 0x83
+    _fields = ("event_type", "state", "packet_size", "packet")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.event_type, self.state, self.packet_size = _DEVICE_INTERNAL_EVENT.unpack_from(raw_data, offset)
+        self.packet = raw_data[offset + 3:offset + 34]
 
 
 class Application(EventPacket):
@@ -117,24 +133,38 @@ class Application(EventPacket):
         data : uint8_t[254]
             Application data.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["data"] = raw_data[0:]
-        super(Application, self).__init__("Application", 0x8A, __data)
+    _event_name = "Application"
+    _opcode = 0x8A
+    _fields = ("data",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.data = raw_data[offset + 0:]
 
 
 class SarStart(EventPacket):
     """Start of a Segmentation and Reassembly message from the device."""
-    def __init__(self, raw_data):
-        __data = {}
-        super(SarStart, self).__init__("SarStart", 0x8B, __data)
+    _event_name = "SarStart"
+    _opcode = 0x8B
+    _fields = ()
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        pass
 
 
 class SarContinue(EventPacket):
     """Continuation of a Segmentation and Reassembly message from the device."""
-    def __init__(self, raw_data):
-        __data = {}
-        super(SarContinue, self).__init__("SarContinue", 0x8C, __data)
+    _event_name = "SarContinue"
+    _opcode = 0x8C
+    _fields = ()
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        pass
+
+
+_DFU_REQ_RELAY = struct.Struct("<B10xB")
 
 
 class DfuReqRelay(EventPacket):
@@ -149,12 +179,17 @@ class DfuReqRelay(EventPacket):
         authority : uint8_t
             Authority level of the transfer.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["dfu_type"], = struct.unpack("<B", raw_data[0:1])
-        __data["fwid"] = raw_data[1:11]
-        __data["authority"], = struct.unpack("<B", raw_data[11:12])
-        super(DfuReqRelay, self).__init__("DfuReqRelay", 0xA0, __data)
+    _event_name = "DfuReqRelay"
+    _opcode = 0xA0
+    _fields = ("dfu_type", "fwid", "authority")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.dfu_type, self.authority = _DFU_REQ_RELAY.unpack_from(raw_data, offset)
+        self.fwid = raw_data[offset + 1:offset + 11]
+
+
+_DFU_REQ_SOURCE = struct.Struct("<B")
 
 
 class DfuReqSource(EventPacket):
@@ -165,10 +200,16 @@ class DfuReqSource(EventPacket):
         dfu_type : uint8_t
             DFU type of the transfer. See @ref nrf_mesh_dfu_type_t.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["dfu_type"], = struct.unpack("<B", raw_data[0:1])
-        super(DfuReqSource, self).__init__("DfuReqSource", 0xA1, __data)
+    _event_name = "DfuReqSource"
+    _opcode = 0xA1
+    _fields = ("dfu_type",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.dfu_type, = _DFU_REQ_SOURCE.unpack_from(raw_data, offset)
+
+
+_DFU_START = struct.Struct("<BB")
 
 
 class DfuStart(EventPacket):
@@ -183,12 +224,17 @@ class DfuStart(EventPacket):
         fwid : nrf_mesh_fwid_t
             Firmware ID of the transfer.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["role"], = struct.unpack("<B", raw_data[0:1])
-        __data["dfu_type"], = struct.unpack("<B", raw_data[1:2])
-        __data["fwid"] = raw_data[2:12]
-        super(DfuStart, self).__init__("DfuStart", 0xA2, __data)
+    _event_name = "DfuStart"
+    _opcode = 0xA2
+    _fields = ("role", "dfu_type", "fwid")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.role, self.dfu_type = _DFU_START.unpack_from(raw_data, offset)
+        self.fwid = raw_data[offset + 2:offset + 12]
+
+
+_DFU_END = struct.Struct("<BB10xB")
 
 
 class DfuEnd(EventPacket):
@@ -205,13 +251,17 @@ class DfuEnd(EventPacket):
         end_reason : uint8_t
             Reason for ending the transfer. See @ref nrf_mesh_dfu_end_t.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["role"], = struct.unpack("<B", raw_data[0:1])
-        __data["dfu_type"], = struct.unpack("<B", raw_data[1:2])
-        __data["fwid"] = raw_data[2:12]
-        __data["end_reason"], = struct.unpack("<B", raw_data[12:13])
-        super(DfuEnd, self).__init__("DfuEnd", 0xA3, __data)
+    _event_name = "DfuEnd"
+    _opcode = 0xA3
+    _fields = ("role", "dfu_type", "fwid", "end_reason")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.role, self.dfu_type, self.end_reason = _DFU_END.unpack_from(raw_data, offset)
+        self.fwid = raw_data[offset + 2:offset + 12]
+
+
+_DFU_BANK_AVAILABLE = struct.Struct("<B10xIIB")
 
 
 class DfuBankAvailable(EventPacket):
@@ -230,14 +280,17 @@ class DfuBankAvailable(EventPacket):
         is_signed : uint8_t
             Whether the bank is signed or not.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["dfu_type"], = struct.unpack("<B", raw_data[0:1])
-        __data["fwid"] = raw_data[1:11]
-        __data["start_addr"], = struct.unpack("<I", raw_data[11:15])
-        __data["length"], = struct.unpack("<I", raw_data[15:19])
-        __data["is_signed"], = struct.unpack("<B", raw_data[19:20])
-        super(DfuBankAvailable, self).__init__("DfuBankAvailable", 0xA4, __data)
+    _event_name = "DfuBankAvailable"
+    _opcode = 0xA4
+    _fields = ("dfu_type", "fwid", "start_addr", "length", "is_signed")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.dfu_type, self.start_addr, self.length, self.is_signed = _DFU_BANK_AVAILABLE.unpack_from(raw_data, offset)
+        self.fwid = raw_data[offset + 1:offset + 11]
+
+
+_DFU_FIRMWARE_OUTDATED = struct.Struct("<B")
 
 
 class DfuFirmwareOutdated(EventPacket):
@@ -252,12 +305,18 @@ class DfuFirmwareOutdated(EventPacket):
         current_fwid : nrf_mesh_fwid_t
             Firmware ID of the current version of the outdated firmware.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["dfu_type"], = struct.unpack("<B", raw_data[0:1])
-        __data["available_fwid"] = raw_data[1:11]
-        __data["current_fwid"] = raw_data[11:21]
-        super(DfuFirmwareOutdated, self).__init__("DfuFirmwareOutdated", 0xA5, __data)
+    _event_name = "DfuFirmwareOutdated"
+    _opcode = 0xA5
+    _fields = ("dfu_type", "available_fwid", "current_fwid")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.dfu_type, = _DFU_FIRMWARE_OUTDATED.unpack_from(raw_data, offset)
+        self.available_fwid = raw_data[offset + 1:offset + 11]
+        self.current_fwid = raw_data[offset + 11:offset + 21]
+
+
+_DFU_FIRMWARE_OUTDATED_NO_AUTH = struct.Struct("<B")
 
 
 class DfuFirmwareOutdatedNoAuth(EventPacket):
@@ -274,40 +333,62 @@ class DfuFirmwareOutdatedNoAuth(EventPacket):
         current_fwid : nrf_mesh_fwid_t
             Firmware ID of the current version of the outdated firmware.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["dfu_type"], = struct.unpack("<B", raw_data[0:1])
-        __data["available_fwid"] = raw_data[1:11]
-        __data["current_fwid"] = raw_data[11:21]
-        super(DfuFirmwareOutdatedNoAuth, self).__init__("DfuFirmwareOutdatedNoAuth", 0xA6, __data)
+    _event_name = "DfuFirmwareOutdatedNoAuth"
+    _opcode = 0xA6
+    _fields = ("dfu_type", "available_fwid", "current_fwid")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.dfu_type, = _DFU_FIRMWARE_OUTDATED_NO_AUTH.unpack_from(raw_data, offset)
+        self.available_fwid = raw_data[offset + 1:offset + 11]
+        self.current_fwid = raw_data[offset + 11:offset + 21]
 
 
 class OpenmeshNew(EventPacket):
     """Not implemented."""
-    def __init__(self, raw_data):
-        __data = {}
-        super(OpenmeshNew, self).__init__("OpenmeshNew", 0xB3, __data)
+    _event_name = "OpenmeshNew"
+    _opcode = 0xB3
+    _fields = ()
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        pass
 
 
 class OpenmeshUpdate(EventPacket):
     """Not implemented."""
-    def __init__(self, raw_data):
-        __data = {}
-        super(OpenmeshUpdate, self).__init__("OpenmeshUpdate", 0xB4, __data)
+    _event_name = "OpenmeshUpdate"
+    _opcode = 0xB4
+    _fields = ()
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        pass
 
 
 class OpenmeshConflicting(EventPacket):
     """Not implemented."""
-    def __init__(self, raw_data):
-        __data = {}
-        super(OpenmeshConflicting, self).__init__("OpenmeshConflicting", 0xB5, __data)
+    _event_name = "OpenmeshConflicting"
+    _opcode = 0xB5
+    _fields = ()
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        pass
 
 
 class OpenmeshTx(EventPacket):
     """Not implemented."""
-    def __init__(self, raw_data):
-        __data = {}
-        super(OpenmeshTx, self).__init__("OpenmeshTx", 0xB6, __data)
+    _event_name = "OpenmeshTx"
+    _opcode = 0xB6
+    _fields = ()
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        pass
+
+
+_PROV_UNPROVISIONED_RECEIVED = struct.Struct("<16xbBB")
 
 
 class ProvUnprovisionedReceived(EventPacket):
@@ -326,14 +407,18 @@ class ProvUnprovisionedReceived(EventPacket):
         adv_addr : uint8_t[6]
             The advertisement address of the sender of the unprovisioned beacon.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["uuid"] = raw_data[0:16]
-        __data["rssi"], = struct.unpack("<b", raw_data[16:17])
-        __data["gatt_supported"], = struct.unpack("<B", raw_data[17:18])
-        __data["adv_addr_type"], = struct.unpack("<B", raw_data[18:19])
-        __data["adv_addr"] = raw_data[19:25]
-        super(ProvUnprovisionedReceived, self).__init__("ProvUnprovisionedReceived", 0xC0, __data)
+    _event_name = "ProvUnprovisionedReceived"
+    _opcode = 0xC0
+    _fields = ("uuid", "rssi", "gatt_supported", "adv_addr_type", "adv_addr")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.rssi, self.gatt_supported, self.adv_addr_type = _PROV_UNPROVISIONED_RECEIVED.unpack_from(raw_data, offset)
+        self.uuid = raw_data[offset + 0:offset + 16]
+        self.adv_addr = raw_data[offset + 19:offset + 25]
+
+
+_PROV_LINK_ESTABLISHED = struct.Struct("<B")
 
 
 class ProvLinkEstablished(EventPacket):
@@ -344,10 +429,16 @@ class ProvLinkEstablished(EventPacket):
         context_id : uint8_t
             Context ID of the established link.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["context_id"], = struct.unpack("<B", raw_data[0:1])
-        super(ProvLinkEstablished, self).__init__("ProvLinkEstablished", 0xC1, __data)
+    _event_name = "ProvLinkEstablished"
+    _opcode = 0xC1
+    _fields = ("context_id",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.context_id, = _PROV_LINK_ESTABLISHED.unpack_from(raw_data, offset)
+
+
+_PROV_LINK_CLOSED = struct.Struct("<BB")
 
 
 class ProvLinkClosed(EventPacket):
@@ -360,11 +451,16 @@ class ProvLinkClosed(EventPacket):
         close_reason : uint8_t
             Reason for closing the link.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["context_id"], = struct.unpack("<B", raw_data[0:1])
-        __data["close_reason"], = struct.unpack("<B", raw_data[1:2])
-        super(ProvLinkClosed, self).__init__("ProvLinkClosed", 0xC2, __data)
+    _event_name = "ProvLinkClosed"
+    _opcode = 0xC2
+    _fields = ("context_id", "close_reason")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.context_id, self.close_reason = _PROV_LINK_CLOSED.unpack_from(raw_data, offset)
+
+
+_PROV_CAPS_RECEIVED = struct.Struct("<BBBBBHBH")
 
 
 class ProvCapsReceived(EventPacket):
@@ -390,17 +486,16 @@ class ProvCapsReceived(EventPacket):
         input_oob_actions : uint16_t
             Available OOB input actions.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["context_id"], = struct.unpack("<B", raw_data[0:1])
-        __data["num_elements"], = struct.unpack("<B", raw_data[1:2])
-        __data["public_key_type"], = struct.unpack("<B", raw_data[2:3])
-        __data["static_oob_types"], = struct.unpack("<B", raw_data[3:4])
-        __data["output_oob_size"], = struct.unpack("<B", raw_data[4:5])
-        __data["output_oob_actions"], = struct.unpack("<H", raw_data[5:7])
-        __data["input_oob_size"], = struct.unpack("<B", raw_data[7:8])
-        __data["input_oob_actions"], = struct.unpack("<H", raw_data[8:10])
-        super(ProvCapsReceived, self).__init__("ProvCapsReceived", 0xC3, __data)
+    _event_name = "ProvCapsReceived"
+    _opcode = 0xC3
+    _fields = ("context_id", "num_elements", "public_key_type", "static_oob_types", "output_oob_size", "output_oob_actions", "input_oob_size", "input_oob_actions")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.context_id, self.num_elements, self.public_key_type, self.static_oob_types, self.output_oob_size, self.output_oob_actions, self.input_oob_size, self.input_oob_actions = _PROV_CAPS_RECEIVED.unpack_from(raw_data, offset)
+
+
+_PROV_INVITE_RECEIVED = struct.Struct("<BB")
 
 
 class ProvInviteReceived(EventPacket):
@@ -414,11 +509,16 @@ class ProvInviteReceived(EventPacket):
         attention_duration_s : uint8_t
             Time in seconds during which the device will identify itself using any means it can.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["context_id"], = struct.unpack("<B", raw_data[0:1])
-        __data["attention_duration_s"], = struct.unpack("<B", raw_data[1:2])
-        super(ProvInviteReceived, self).__init__("ProvInviteReceived", 0xC4, __data)
+    _event_name = "ProvInviteReceived"
+    _opcode = 0xC4
+    _fields = ("context_id", "attention_duration_s")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.context_id, self.attention_duration_s = _PROV_INVITE_RECEIVED.unpack_from(raw_data, offset)
+
+
+_PROV_START_RECEIVED = struct.Struct("<B")
 
 
 class ProvStartReceived(EventPacket):
@@ -430,10 +530,16 @@ class ProvStartReceived(EventPacket):
         context_id : uint8_t
             Context ID of the provisioning link.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["context_id"], = struct.unpack("<B", raw_data[0:1])
-        super(ProvStartReceived, self).__init__("ProvStartReceived", 0xCA, __data)
+    _event_name = "ProvStartReceived"
+    _opcode = 0xCA
+    _fields = ("context_id",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.context_id, = _PROV_START_RECEIVED.unpack_from(raw_data, offset)
+
+
+_PROV_COMPLETE = struct.Struct("<BIHHBB")
 
 
 class ProvComplete(EventPacket):
@@ -458,17 +564,18 @@ class ProvComplete(EventPacket):
         net_key : uint8_t[16]
             The network key of the provisioned device.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["context_id"], = struct.unpack("<B", raw_data[0:1])
-        __data["iv_index"], = struct.unpack("<I", raw_data[1:5])
-        __data["net_key_index"], = struct.unpack("<H", raw_data[5:7])
-        __data["address"], = struct.unpack("<H", raw_data[7:9])
-        __data["iv_update_flag"], = struct.unpack("<B", raw_data[9:10])
-        __data["key_refresh_flag"], = struct.unpack("<B", raw_data[10:11])
-        __data["device_key"] = raw_data[11:27]
-        __data["net_key"] = raw_data[27:43]
-        super(ProvComplete, self).__init__("ProvComplete", 0xC5, __data)
+    _event_name = "ProvComplete"
+    _opcode = 0xC5
+    _fields = ("context_id", "iv_index", "net_key_index", "address", "iv_update_flag", "key_refresh_flag", "device_key", "net_key")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.context_id, self.iv_index, self.net_key_index, self.address, self.iv_update_flag, self.key_refresh_flag = _PROV_COMPLETE.unpack_from(raw_data, offset)
+        self.device_key = raw_data[offset + 11:offset + 27]
+        self.net_key = raw_data[offset + 27:offset + 43]
+
+
+_PROV_AUTH_REQUEST = struct.Struct("<BBBB")
 
 
 class ProvAuthRequest(EventPacket):
@@ -485,13 +592,16 @@ class ProvAuthRequest(EventPacket):
         size : uint8_t
             Authentication size.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["context_id"], = struct.unpack("<B", raw_data[0:1])
-        __data["method"], = struct.unpack("<B", raw_data[1:2])
-        __data["action"], = struct.unpack("<B", raw_data[2:3])
-        __data["size"], = struct.unpack("<B", raw_data[3:4])
-        super(ProvAuthRequest, self).__init__("ProvAuthRequest", 0xC6, __data)
+    _event_name = "ProvAuthRequest"
+    _opcode = 0xC6
+    _fields = ("context_id", "method", "action", "size")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.context_id, self.method, self.action, self.size = _PROV_AUTH_REQUEST.unpack_from(raw_data, offset)
+
+
+_PROV_ECDH_REQUEST = struct.Struct("<B")
 
 
 class ProvEcdhRequest(EventPacket):
@@ -506,12 +616,18 @@ class ProvEcdhRequest(EventPacket):
         node_private : uint8_t[32]
             ECDH private key.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["context_id"], = struct.unpack("<B", raw_data[0:1])
-        __data["peer_public"] = raw_data[1:65]
-        __data["node_private"] = raw_data[65:97]
-        super(ProvEcdhRequest, self).__init__("ProvEcdhRequest", 0xC7, __data)
+    _event_name = "ProvEcdhRequest"
+    _opcode = 0xC7
+    _fields = ("context_id", "peer_public", "node_private")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.context_id, = _PROV_ECDH_REQUEST.unpack_from(raw_data, offset)
+        self.peer_public = raw_data[offset + 1:offset + 65]
+        self.node_private = raw_data[offset + 65:offset + 97]
+
+
+_PROV_OUTPUT_REQUEST = struct.Struct("<BB")
 
 
 class ProvOutputRequest(EventPacket):
@@ -526,12 +642,17 @@ class ProvOutputRequest(EventPacket):
         data : uint8_t[16]
             Data for the output request.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["context_id"], = struct.unpack("<B", raw_data[0:1])
-        __data["output_action"], = struct.unpack("<B", raw_data[1:2])
-        __data["data"] = raw_data[2:]
-        super(ProvOutputRequest, self).__init__("ProvOutputRequest", 0xC8, __data)
+    _event_name = "ProvOutputRequest"
+    _opcode = 0xC8
+    _fields = ("context_id", "output_action", "data")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.context_id, self.output_action = _PROV_OUTPUT_REQUEST.unpack_from(raw_data, offset)
+        self.data = raw_data[offset + 2:]
+
+
+_PROV_FAILED = struct.Struct("<BB")
 
 
 class ProvFailed(EventPacket):
@@ -544,11 +665,16 @@ class ProvFailed(EventPacket):
         error_code : uint8_t
             Provisioning error code.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["context_id"], = struct.unpack("<B", raw_data[0:1])
-        __data["error_code"], = struct.unpack("<B", raw_data[1:2])
-        super(ProvFailed, self).__init__("ProvFailed", 0xC9, __data)
+    _event_name = "ProvFailed"
+    _opcode = 0xC9
+    _fields = ("context_id", "error_code")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.context_id, self.error_code = _PROV_FAILED.unpack_from(raw_data, offset)
+
+
+_MESH_MESSAGE_RECEIVED_UNICAST = struct.Struct("<HHHHBB6xbH")
 
 
 class MeshMessageReceivedUnicast(EventPacket):
@@ -579,19 +705,18 @@ class MeshMessageReceivedUnicast(EventPacket):
         data : uint8_t[235]
             Data payload of the packet.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["src"], = struct.unpack("<H", raw_data[0:2])
-        __data["dst"], = struct.unpack("<H", raw_data[2:4])
-        __data["appkey_handle"], = struct.unpack("<H", raw_data[4:6])
-        __data["subnet_handle"], = struct.unpack("<H", raw_data[6:8])
-        __data["ttl"], = struct.unpack("<B", raw_data[8:9])
-        __data["adv_addr_type"], = struct.unpack("<B", raw_data[9:10])
-        __data["adv_addr"] = raw_data[10:16]
-        __data["rssi"], = struct.unpack("<b", raw_data[16:17])
-        __data["actual_length"], = struct.unpack("<H", raw_data[17:19])
-        __data["data"] = raw_data[19:]
-        super(MeshMessageReceivedUnicast, self).__init__("MeshMessageReceivedUnicast", 0xD0, __data)
+    _event_name = "MeshMessageReceivedUnicast"
+    _opcode = 0xD0
+    _fields = ("src", "dst", "appkey_handle", "subnet_handle", "ttl", "adv_addr_type", "adv_addr", "rssi", "actual_length", "data")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.src, self.dst, self.appkey_handle, self.subnet_handle, self.ttl, self.adv_addr_type, self.rssi, self.actual_length = _MESH_MESSAGE_RECEIVED_UNICAST.unpack_from(raw_data, offset)
+        self.adv_addr = raw_data[offset + 10:offset + 16]
+        self.data = raw_data[offset + 19:]
+
+
+_MESH_MESSAGE_RECEIVED_SUBSCRIPTION = struct.Struct("<HHHHBB6xbH")
 
 
 class MeshMessageReceivedSubscription(EventPacket):
@@ -622,19 +747,18 @@ class MeshMessageReceivedSubscription(EventPacket):
         data : uint8_t[235]
             Data payload of the packet.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["src"], = struct.unpack("<H", raw_data[0:2])
-        __data["dst"], = struct.unpack("<H", raw_data[2:4])
-        __data["appkey_handle"], = struct.unpack("<H", raw_data[4:6])
-        __data["subnet_handle"], = struct.unpack("<H", raw_data[6:8])
-        __data["ttl"], = struct.unpack("<B", raw_data[8:9])
-        __data["adv_addr_type"], = struct.unpack("<B", raw_data[9:10])
-        __data["adv_addr"] = raw_data[10:16]
-        __data["rssi"], = struct.unpack("<b", raw_data[16:17])
-        __data["actual_length"], = struct.unpack("<H", raw_data[17:19])
-        __data["data"] = raw_data[19:]
-        super(MeshMessageReceivedSubscription, self).__init__("MeshMessageReceivedSubscription", 0xD1, __data)
+    _event_name = "MeshMessageReceivedSubscription"
+    _opcode = 0xD1
+    _fields = ("src", "dst", "appkey_handle", "subnet_handle", "ttl", "adv_addr_type", "adv_addr", "rssi", "actual_length", "data")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.src, self.dst, self.appkey_handle, self.subnet_handle, self.ttl, self.adv_addr_type, self.rssi, self.actual_length = _MESH_MESSAGE_RECEIVED_SUBSCRIPTION.unpack_from(raw_data, offset)
+        self.adv_addr = raw_data[offset + 10:offset + 16]
+        self.data = raw_data[offset + 19:]
+
+
+_MESH_TX_COMPLETE = struct.Struct("<I")
 
 
 class MeshTxComplete(EventPacket):
@@ -645,10 +769,16 @@ class MeshTxComplete(EventPacket):
         token : nrf_mesh_tx_token_t
             TX token for the completed packet.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["token"], = struct.unpack("<I", raw_data[0:4])
-        super(MeshTxComplete, self).__init__("MeshTxComplete", 0xD2, __data)
+    _event_name = "MeshTxComplete"
+    _opcode = 0xD2
+    _fields = ("token",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.token, = _MESH_TX_COMPLETE.unpack_from(raw_data, offset)
+
+
+_MESH_IV_UPDATE_NOTIFICATION = struct.Struct("<I")
 
 
 class MeshIvUpdateNotification(EventPacket):
@@ -659,10 +789,16 @@ class MeshIvUpdateNotification(EventPacket):
         iv_index : uint32_t
             IV index updated to.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["iv_index"], = struct.unpack("<I", raw_data[0:4])
-        super(MeshIvUpdateNotification, self).__init__("MeshIvUpdateNotification", 0xD3, __data)
+    _event_name = "MeshIvUpdateNotification"
+    _opcode = 0xD3
+    _fields = ("iv_index",)
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.iv_index, = _MESH_IV_UPDATE_NOTIFICATION.unpack_from(raw_data, offset)
+
+
+_MESH_KEY_REFRESH_NOTIFICATION = struct.Struct("<HB")
 
 
 class MeshKeyRefreshNotification(EventPacket):
@@ -675,18 +811,24 @@ class MeshKeyRefreshNotification(EventPacket):
         phase : uint8_t
             Current key refresh phase for the network key being updated.
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["netkey_index"], = struct.unpack("<H", raw_data[0:2])
-        __data["phase"], = struct.unpack("<B", raw_data[2:3])
-        super(MeshKeyRefreshNotification, self).__init__("MeshKeyRefreshNotification", 0xD4, __data)
+    _event_name = "MeshKeyRefreshNotification"
+    _opcode = 0xD4
+    _fields = ("netkey_index", "phase")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.netkey_index, self.phase = _MESH_KEY_REFRESH_NOTIFICATION.unpack_from(raw_data, offset)
 
 
 class MeshSarFailed(EventPacket):
     """A Mesh transmission of a SAR packet failed."""
-    def __init__(self, raw_data):
-        __data = {}
-        super(MeshSarFailed, self).__init__("MeshSarFailed", 0xD7, __data)
+    _event_name = "MeshSarFailed"
+    _opcode = 0xD7
+    _fields = ()
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        pass
 
 
 class ModelSpecific(EventPacket):
@@ -699,11 +841,14 @@ class ModelSpecific(EventPacket):
         data : uint8_t[249]
             Additional data provided by the event
     """
-    def __init__(self, raw_data):
-        __data = {}
-        __data["model_evt_info"] = raw_data[0:5]
-        __data["data"] = raw_data[5:]
-        super(ModelSpecific, self).__init__("ModelSpecific", 0xF0, __data)
+    _event_name = "ModelSpecific"
+    _opcode = 0xF0
+    _fields = ("model_evt_info", "data")
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):
+        self.model_evt_info = raw_data[offset + 0:offset + 5]
+        self.data = raw_data[offset + 5:]
 
 
 class Event(object):
@@ -784,12 +929,15 @@ EVENT_LUT = {
     Event.SAR_START: SarStart
 }
 
+# Event classes indexed by opcode
+EVENT_TABLE = tuple(EVENT_LUT.get(opcode) for opcode in range(256))
+
 
 def event_deserialize(data):
     if not isinstance(data, bytearray):
         raise TypeError("Expected bytearray")
 
-    if data[1] in EVENT_LUT:
-        return EVENT_LUT[data[1]](data[2:])
-    else:
+    event = EVENT_TABLE[data[1]]
+    if event is None:
         return None
+    return event(data, 2)
@@ -0,0 +1,198 @@
+# Copyright (c) 2010 - 2019, Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of Nordic Semiconductor ASA nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY, AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL NORDIC SEMICONDUCTOR ASA OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+import collections
+import logging
+import threading
+import traceback
+
+
+# Overflow policies
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP = "drop"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+
+
+def event_key(event):
+    """Default ordering key: the source address of mesh messages, the context
+    of provisioning events and the opcode of anything else."""
+    fields = getattr(event, "_fields", ())
+    if "src" in fields:
+        return ("src", event.src)
+    elif "context_id" in fields:
+        return ("context", event.context_id)
+    return ("opcode", event._opcode)
+
+
+class OrderedExecutor(object):
+    """Runs event handlers on a bounded pool of worker threads.
+
+    Tasks with the same key run one at a time in submission order, tasks
+    with different keys run in parallel. At most `max_queue` tasks wait at
+    any time; when full, `overflow` decides whether submit() blocks
+    (OVERFLOW_BLOCK), discards the new task (OVERFLOW_DROP) or discards the
+    oldest waiting task (OVERFLOW_DROP_OLDEST).
+    """
+    def __init__(self, workers=4, max_queue=1024, overflow=OVERFLOW_DROP, name="executor"):
+        if overflow not in (OVERFLOW_BLOCK, OVERFLOW_DROP, OVERFLOW_DROP_OLDEST):
+            raise ValueError("Unknown overflow policy {}".format(overflow))
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.logger = logging.getLogger(name)
+        self._lock = threading.Lock()
+        # Signalled when there is work, and when there is room in the queue
+        self._work = threading.Condition(self._lock)
+        self._space = threading.Condition(self._lock)
+        # Waiting tasks per key, and the keys that have tasks but no worker
+        self._queues = {}
+        self._ready = collections.deque()
+        # The waiting tasks in submission order, only for OVERFLOW_DROP_OLDEST
+        self._order = collections.deque()
+        self.depth = 0
+        self.max_depth = 0
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0
+        self.keep_running = True
+        self._workers = [threading.Thread(target=self.__worker, name="%s-%d" % (name, i), daemon=True)
+                         for i in range(workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, key, fn, *args):
+        """Queues `fn(*args)` behind the other tasks with the same key.
+
+        Returns False if the task was dropped.
+        """
+        task = [key, fn, args]
+        with self._lock:
+            while self.depth >= self.max_queue and self.keep_running:
+                if self.overflow == OVERFLOW_DROP:
+                    self.dropped += 1
+                    return False
+                elif self.overflow == OVERFLOW_DROP_OLDEST:
+                    self._drop_oldest()
+                else:
+                    self._space.wait()
+            if not self.keep_running:
+                return False
+
+            queue = self._queues.get(key)
+            if queue is None:
+                queue = self._queues[key] = collections.deque()
+                self._ready.append(key)
+                self._work.notify()
+            queue.append(task)
+            if self.overflow == OVERFLOW_DROP_OLDEST:
+                self._order.append(task)
+            self.depth += 1
+            self.submitted += 1
+            self.max_depth = max(self.max_depth, self.depth)
+        return True
+
+    def _drop_oldest(self):
+        while self._order:
+            task = self._order.popleft()
+            # Tasks that have been started are marked by clearing the function
+            if task[1] is not None:
+                key = task[0]
+                queue = self._queues[key]
+                queue.remove(task)
+                if not queue:
+                    # Not running either, or the running task would be in the queue
+                    del self._queues[key]
+                    self._ready.remove(key)
+                task[1] = None
+                self.depth -= 1
+                self.dropped += 1
+                return
+
+    def recipient(self, handler, key=event_key):
+        """Returns a packet recipient that runs `handler(event)` on the pool.
+
+        Use with Device.add_packet_recipient(). Events with the same
+        `key(event)` are handled in the order they were received.
+        """
+        def submit(event):
+            if not self.submit(key(event), handler, event):
+                self.logger.debug("Dropped event %r", event)
+        return submit
+
+    def stats(self):
+        with self._lock:
+            return {"depth": self.depth,
+                    "max_depth": self.max_depth,
+                    "keys": len(self._queues),
+                    "submitted": self.submitted,
+                    "completed": self.completed,
+                    "dropped": self.dropped}
+
+    def shutdown(self, wait=True):
+        """Stops the workers. Tasks that have not started are discarded."""
+        with self._lock:
+            self.keep_running = False
+            self._work.notify_all()
+            self._space.notify_all()
+        if wait:
+            for worker in self._workers:
+                if worker is not threading.current_thread():
+                    worker.join()
+
+    def __worker(self):
+        while True:
+            with self._lock:
+                while not self._ready and self.keep_running:
+                    self._work.wait()
+                if not self.keep_running:
+                    return
+                key = self._ready.popleft()
+                queue = self._queues[key]
+                task = queue[0]
+                _, fn, args = task
+                task[1] = None
+                self.depth -= 1
+                while self._order and self._order[0][1] is None:
+                    self._order.popleft()
+                self._space.notify()
+
+            try:
+                fn(*args)
+            except:
+                self.logger.error('Exception in handler %r', fn)
+                self.logger.error('traceback: %s', traceback.format_exc())
+
+            with self._lock:
+                self.completed += 1
+                queue.popleft()
+                if queue:
+                    self._ready.append(key)
+                    self._work.notify()
+                else:
+                    del self._queues[key]
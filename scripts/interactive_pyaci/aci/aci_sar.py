@@ -0,0 +1,150 @@
+# Copyright (c) 2010 - 2019, Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of Nordic Semiconductor ASA nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY, AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL NORDIC SEMICONDUCTOR ASA OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""Serial level segmentation and reassembly (SAR).
+
+The firmware reserves the SarStart and SarContinue opcodes (0x21 and 0x22
+for commands, 0x8B and 0x8C for events) without defining their parameters,
+so the format is defined here:
+
+- A packet that does not fit in one frame is sent as its opcode followed by
+  its parameters, split over one SarStart and as many SarContinue frames as
+  needed.
+- SarStart carries the total length of the segmented packet (opcode and
+  parameters) as a little endian u16, followed by the first segment.
+- SarContinue carries the next segment.
+- Only one segmented packet is in flight per direction at a time.
+"""
+
+import logging
+import struct
+
+from aci.aci_evt import Event
+
+
+# NRF_MESH_SERIAL_PAYLOAD_MAXLEN: bytes after the opcode in a single frame
+SERIAL_PAYLOAD_MAXLEN = 254
+SAR_START_HEADER = struct.Struct("<H")
+
+CMD_SAR_START = 0x21
+CMD_SAR_CONTINUE = 0x22
+EVT_SAR_START = Event.SAR_START
+EVT_SAR_CONTINUE = Event.SAR_CONTINUE
+
+
+def segment(opcode, params, sar_start, sar_continue):
+    """Returns the frames for a packet, segmented if it doesn't fit in one frame."""
+    if len(params) <= SERIAL_PAYLOAD_MAXLEN:
+        return [bytearray([len(params) + 1, opcode]) + params]
+
+    total = len(params) + 1
+    if total > 0xFFFF:
+        raise ValueError("Packet too long for SAR: {} bytes".format(total))
+
+    view = memoryview(params)
+    # The opcode leads the segmented packet, and the first segment
+    chunk = SERIAL_PAYLOAD_MAXLEN - SAR_START_HEADER.size - 1
+    frames = [bytearray([SERIAL_PAYLOAD_MAXLEN + 1, sar_start])
+              + SAR_START_HEADER.pack(total) + bytes([opcode]) + view[:chunk]]
+    for offset in range(chunk, len(params), SERIAL_PAYLOAD_MAXLEN):
+        part = view[offset:offset + SERIAL_PAYLOAD_MAXLEN]
+        frames.append(bytearray([len(part) + 1, sar_continue]) + part)
+    return frames
+
+
+def command_frames(cmd):
+    """Returns the frames for a CommandPacket, segmented if needed."""
+    if len(cmd) <= SERIAL_PAYLOAD_MAXLEN + 1:
+        return [cmd.serialize()]
+    return segment(cmd._opcode, cmd._data, CMD_SAR_START, CMD_SAR_CONTINUE)
+
+
+def event_frames(opcode, params):
+    """Returns the frames for an event, segmented if needed."""
+    return segment(opcode, params, EVT_SAR_START, EVT_SAR_CONTINUE)
+
+
+class SarReassembler(object):
+    """Reassembles segmented packets from SarStart and SarContinue frames.
+
+    Segments are written straight into a buffer of the announced size. The
+    reassembled packet is returned in frame layout, with the opcode at index
+    1, but its length byte is 0, as the length does not fit in it.
+    """
+    def __init__(self, sar_start=EVT_SAR_START, sar_continue=EVT_SAR_CONTINUE, logger=None):
+        self.sar_start = sar_start
+        self.sar_continue = sar_continue
+        self.logger = logger if logger is not None else logging.getLogger(__name__)
+        self._buf = None
+        self._view = None
+        self._offset = 0
+
+    def is_segment(self, frame):
+        return frame[1] == self.sar_start or frame[1] == self.sar_continue
+
+    def feed(self, frame):
+        """Adds a SarStart or SarContinue frame.
+
+        Returns the reassembled packet when the frame completes it, otherwise
+        None.
+        """
+        if frame[1] == self.sar_start:
+            if self._buf is not None:
+                self.logger.warning("SAR packet aborted after %d of %d bytes",
+                                    self._offset - 1, len(self._buf) - 1)
+            if len(frame) < 2 + SAR_START_HEADER.size:
+                self.logger.error("Invalid SAR start: %s", bytes(frame).hex())
+                self._buf = None
+                return None
+            total, = SAR_START_HEADER.unpack_from(frame, 2)
+            self._buf = bytearray(1 + total)
+            self._view = memoryview(self._buf)
+            self._offset = 1
+            segment = memoryview(frame)[2 + SAR_START_HEADER.size:]
+        elif self._buf is None:
+            self.logger.error("SAR continuation without a start")
+            return None
+        else:
+            segment = memoryview(frame)[2:]
+
+        end = self._offset + len(segment)
+        if end > len(self._buf):
+            self.logger.error("SAR packet overflows its length of %d bytes", len(self._buf) - 1)
+            self._buf = None
+            return None
+        self._view[self._offset:end] = segment
+        self._offset = end
+        if end < len(self._buf):
+            return None
+
+        packet = self._buf
+        self._buf = None
+        self._view = None
+        return packet
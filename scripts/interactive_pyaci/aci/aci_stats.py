@@ -0,0 +1,197 @@
+# Copyright (c) 2010 - 2019, Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of Nordic Semiconductor ASA nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY, AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL NORDIC SEMICONDUCTOR ASA OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+import threading
+
+from aci.aci_cmd import RESPONSE_LUT
+
+
+# Values below 2**SUB_BUCKET_BITS are counted exactly, larger ones with the
+# same relative precision (about 1.6 %), like an HDR histogram.
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_HALF = 1 << (SUB_BUCKET_BITS - 1)
+
+
+class Histogram(object):
+    """Log-linear histogram of non-negative integer values."""
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.max = 0
+
+    @staticmethod
+    def bucket(value):
+        shift = value.bit_length() - SUB_BUCKET_BITS
+        if shift <= 0:
+            return value
+        return shift * SUB_BUCKET_HALF + (value >> shift)
+
+    @staticmethod
+    def bucket_value(index):
+        """Returns the highest value counted in a bucket."""
+        if index < 2 * SUB_BUCKET_HALF:
+            return index
+        shift = (index - SUB_BUCKET_HALF) // SUB_BUCKET_HALF
+        return (((index - shift * SUB_BUCKET_HALF) + 1) << shift) - 1
+
+    def record(self, value):
+        index = self.bucket(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, percent):
+        if not self.count:
+            return None
+        target = self.count * percent / 100.0
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self.bucket_value(index), self.max)
+        return self.max
+
+
+# Bounds of the response timeouts derived from the round trip time, seconds
+MIN_TIMEOUT = 0.5
+MAX_TIMEOUT = 16.0
+
+
+class RoundTripEstimator(object):
+    """Response timeout per opcode from its smoothed round trip time.
+
+    As for TCP (RFC 6298), the timeout is SRTT + 4 * RTTVAR within
+    [min_timeout, max_timeout], and it doubles on every timeout until the
+    next sample. Opcodes without samples start at `initial`. Not thread
+    safe, the Device calls it with its write condition held.
+    """
+    ALPHA = 1 / 8.0
+    BETA = 1 / 4.0
+
+    def __init__(self, initial, min_timeout=MIN_TIMEOUT, max_timeout=MAX_TIMEOUT):
+        self.initial = initial
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        # opcode: [srtt, rttvar, timeout], srtt is None before the first sample
+        self._estimates = {}
+
+    def timeout(self, opcode):
+        estimate = self._estimates.get(opcode)
+        return estimate[2] if estimate else self.initial
+
+    def sample(self, opcode, seconds):
+        estimate = self._estimates.get(opcode)
+        if estimate is None or estimate[0] is None:
+            srtt = seconds
+            rttvar = seconds / 2
+        else:
+            srtt, rttvar, _ = estimate
+            rttvar = (1 - self.BETA) * rttvar + self.BETA * abs(srtt - seconds)
+            srtt = (1 - self.ALPHA) * srtt + self.ALPHA * seconds
+        timeout = min(max(srtt + 4 * rttvar, self.min_timeout), self.max_timeout)
+        self._estimates[opcode] = [srtt, rttvar, timeout]
+
+    def backoff(self, opcode):
+        estimate = self._estimates.setdefault(opcode, [None, None, self.initial])
+        estimate[2] = min(estimate[2] * 2, self.max_timeout)
+
+    def stats(self):
+        """Returns {opcode: {"srtt", "rttvar", "timeout"}}, times in ms."""
+        def ms(value):
+            return value * 1000.0 if value is not None else None
+
+        return {opcode: {"srtt": ms(srtt), "rttvar": ms(rttvar), "timeout": ms(timeout)}
+                for opcode, (srtt, rttvar, timeout) in self._estimates.items()}
+
+
+class CommandLatency(object):
+    """Round trip time from writing each command to its response, per command.
+
+    Times are kept in microseconds. Commands are named after RESPONSE_LUT,
+    or their class for commands that are not listed there.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._timeouts = {}
+
+    @staticmethod
+    def name(cmd):
+        entry = RESPONSE_LUT.get(cmd._opcode)
+        return entry["name"] if entry else cmd.__class__.__name__
+
+    def record(self, cmd, seconds):
+        name = self.name(cmd)
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.record(int(seconds * 1e6))
+
+    def timeout(self, cmd):
+        name = self.name(cmd)
+        with self._lock:
+            self._timeouts[name] = self._timeouts.get(name, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+            self._timeouts = {}
+
+    def stats(self):
+        """Returns {name: {"count", "timeouts", "p50", "p99", "max"}}, times in ms."""
+        result = {}
+        with self._lock:
+            for name in set(self._histograms) | set(self._timeouts):
+                histogram = self._histograms.get(name, Histogram())
+                p50 = histogram.percentile(50)
+                p99 = histogram.percentile(99)
+                result[name] = {
+                    "count": histogram.count,
+                    "timeouts": self._timeouts.get(name, 0),
+                    "p50": p50 / 1000.0 if p50 is not None else None,
+                    "p99": p99 / 1000.0 if p99 is not None else None,
+                    "max": histogram.max / 1000.0 if histogram.count else None}
+        return result
+
+    def dump(self):
+        """Returns the statistics as a table."""
+        def ms(value):
+            return "{:9.3f}".format(value) if value is not None else "{:>9}".format("-")
+
+        lines = ["{:<28} {:>7} {:>8} {:>9} {:>9} {:>9}".format(
+            "command", "count", "timeouts", "p50 ms", "p99 ms", "max ms")]
+        stats = self.stats()
+        for name in sorted(stats):
+            s = stats[name]
+            lines.append("{:<28} {:>7} {:>8} {} {} {}".format(
+                name, s["count"], s["timeouts"], ms(s["p50"]), ms(s["p99"]), ms(s["max"])))
+        return "\n".join(lines)
@@ -27,63 +27,448 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+import asyncio
 import logging
+import os
+import selectors
+import socket
 import traceback
 import threading
 import collections
+import time
+from concurrent.futures import Future, TimeoutError
 from serial import Serial
-from aci.aci_cmd import CommandPacket
-from aci.aci_evt import event_deserialize
-import queue
+from aci.aci_utils import STATUS_CODE_LUT, LazyHex
+from aci.aci_cmd import CommandPacket, response_deserialize
+from aci.aci_evt import Event, event_deserialize
+from aci.aci_stats import CommandLatency, RoundTripEstimator
+from aci.aci_sar import SarReassembler, command_frames, SERIAL_PAYLOAD_MAXLEN
+from aci.aci_event_store import EventStore
 
 EVT_Q_BUF = 128
+RX_BUF_SIZE = 4096
+# Length byte + up to 255 bytes of opcode and payload
+MAX_PACKET_LEN = 256
 
+# Seconds to wait for the response to a command, until its round trip time
+# has been measured, see Device.rtt
+CMD_TIMEOUT = 2
+DEFAULT_WINDOW = 1
 
-class Device(object):
-    def __init__(self, device_name):
+# The firmware's serial RX buffer holds two maximum size packets with their
+# packet_buffer headers, see RX_BUFFER_SIZE in mesh/serial/src/serial_bearer.c
+FIRMWARE_RX_BUFFER_SIZE = 2 * (MAX_PACKET_LEN + 4)
+
+# Command queue lanes, served in this order, see Device.write_aci_cmd()
+PRIORITY_CRITICAL = 0
+PRIORITY_CONTROL = 1
+PRIORITY_BULK = 2
+
+# Commands answering the device during provisioning, which it times out on
+CRITICAL_OPCODES = frozenset([
+    0x63,  # Provision
+    0x66,  # OobUse
+    0x67,  # AuthData
+    0x68,  # EcdhSecret
+])
+BULK_OPCODES = frozenset([
+    0xAB,  # PacketSend
+])
+
+# Commands that can safely be sent again if their response is lost, see
+# Device.retransmit_limit
+IDEMPOTENT_OPCODES = frozenset([
+    0x02,  # Echo
+    0x09,  # SerialVersionGet
+    0x0A,  # FwInfoGet
+    0x12,  # BeaconParamsSet
+    0x13,  # BeaconParamsGet
+    0x40,  # AdvAddrSet
+    0x41,  # AdvAddrGet
+    0x42,  # ChannelMapSet
+    0x43,  # ChannelMapGet
+    0x44,  # TxPowerSet
+    0x45,  # TxPowerGet
+    0x53,  # UuidSet
+    0x54,  # UuidGet
+    0x77,  # FlagGet
+    0x7A,  # ValueGet
+    0x7B,  # BuildVersionGet
+    0x7C,  # AccessAddrGet
+    0x7D,  # ChannelGet
+    0x7F,  # IntervalMinMsGet
+    0x95,  # SubnetGetAll
+    0x96,  # SubnetCountMaxGet
+    0x9A,  # AppkeyGetAll
+    0x9B,  # AppkeyCountMaxGet
+    0x9E,  # DevkeyCountMaxGet
+    0xA0,  # AddrLocalUnicastGet
+    0xA7,  # AddrGet
+    0xA8,  # AddrGetAll
+    0xA9,  # AddrNonvirtualCountMaxGet
+    0xAA,  # AddrVirtualCountMaxGet
+    0xD4,  # BankInfoGet
+    0xD6,  # StateGet
+    0xE1,  # ModelPubAddrGet
+    0xE3,  # ModelPubPeriodGet
+    0xE6,  # ModelSubsGet
+    0xE9,  # ModelAppGet
+    0xEB,  # ModelPubAppGet
+    0xED,  # ModelPubTtlGet
+    0xEF,  # ElemLocGet
+    0xF0,  # ElemSigModelCountGet
+    0xF1,  # ElemVendorModelCountGet
+    0xF2,  # ModelIdGet
+    0xF3,  # HandleGet
+    0xF4,  # ElemModelsGet
+    0xFC,  # ModelsGet
+])
+
+# A queued command is served ahead of higher lanes once it has waited this long
+STARVATION_TIMEOUT = 0.5
+
+# Capture directions, see aci_capture
+CAPTURE_RX = 0
+CAPTURE_TX = 1
+
+# Commands that are answered by another event than CmdRsp
+RESPONSE_EVENT_LUT = {
+    Event.DEVICE_ECHO_RSP: 0x02,    # Echo
+    Event.DEVICE_STARTED: 0x0E      # RadioReset
+}
+
+# Events the reader always decodes, as they answer commands or carry segments
+ALWAYS_ACCEPTED = frozenset([Event.CMD_RSP, Event.SAR_START, Event.SAR_CONTINUE]
+                            + list(RESPONSE_EVENT_LUT))
+
+
+class PacketFramer(object):
+    """Splits the raw serial byte stream into length prefixed ACI packets.
+
+    The serial port reads straight into a preallocated buffer (see
+    `free_space()` and `commit()`), and `packets()` returns the complete
+    packets as memoryview slices of that buffer. A packet is only valid until
+    the next call to `free_space()`, so take a copy if it has to be kept.
+    """
+    def __init__(self, size=RX_BUF_SIZE):
+        if size < 2 * MAX_PACKET_LEN:
+            raise ValueError("Buffer must hold at least two packets")
+        self._buf = bytearray(size)
+        self._view = memoryview(self._buf)
+        self._start = 0
+        self._end = 0
+
+    def free_space(self):
+        if self._start == self._end:
+            self._start = self._end = 0
+        elif len(self._buf) - self._end < MAX_PACKET_LEN:
+            # Move the incomplete packet to the front of the buffer. It is
+            # never longer than one packet, so this copy is cheap.
+            pending = self._end - self._start
+            self._buf[:pending] = self._view[self._start:self._end].tobytes()
+            self._start = 0
+            self._end = pending
+        return self._view[self._end:]
+
+    def commit(self, count):
+        self._end += count
+
+    def read_from(self, fd):
+        """Reads everything pending on a non-blocking file descriptor."""
+        count = os.readv(fd, [self.free_space()])
+        self.commit(count)
+        return count
+
+    def packets(self):
+        buf = self._buf
+        start = self._start
+        while start < self._end:
+            pkt_end = start + buf[start] + 1
+            if pkt_end > self._end:
+                break
+            self._start = pkt_end
+            yield self._view[start:pkt_end]
+            start = pkt_end
+
+
+class CommandError(Exception):
+    """The device answered a command with an error status."""
+    def __init__(self, cmd, status):
+        if status in STATUS_CODE_LUT:
+            status_str = STATUS_CODE_LUT[status]["code"]
+        else:
+            status_str = "0x{:02X}".format(status)
+        super(CommandError, self).__init__(
+            "{}: {}".format(cmd.__class__.__name__, status_str))
+        self.cmd = cmd
+        self.status = status
+
+
+def serial_open(port, baudrate, rtscts, timeout):
+    # We change the baudrate around to reset the UART state.
+    # This is a trick to force detection of flow control settings etc.
+    _trick_baudrate = 9600
+    if baudrate == _trick_baudrate:
+        _trick_baudrate = 115200
+    serial = Serial(port=port, baudrate=_trick_baudrate, rtscts=rtscts, timeout=timeout)
+    serial.baudrate = baudrate
+    return serial
+
+
+def packet_deserialize(pkt, logger, events=None):
+    """Deserializes a received packet, logging it if it can't be parsed.
+
+    Parsed packets are added to the EventStore `events`.
+    """
+    try:
+        if len(pkt) < 2:
+            logger.error('Invalid packet: %r', pkt)
+            return None
+        parsed_packet = event_deserialize(pkt)
+        if not parsed_packet:
+            logger.error("Unable to deserialize %s", pkt.hex())
+        elif events is not None:
+            events.append(pkt)
+        return parsed_packet
+
+    except Exception:
+        logger.error('Exception with packet %s', pkt.hex())
+        logger.error('traceback: %s', traceback.format_exc())
+        return None
+
+
+def command_priority(cmd):
+    if cmd._opcode in CRITICAL_OPCODES:
+        return PRIORITY_CRITICAL
+    elif cmd._opcode in BULK_OPCODES:
+        return PRIORITY_BULK
+    return PRIORITY_CONTROL
+
+
+class PendingCommand(object):
+    """A command on its way to the device, and the future for its response."""
+    def __init__(self, cmd, future=None):
+        self.cmd = cmd
+        self.opcode = cmd._opcode
+        self.future = future if future is not None else Future()
+        self.deadline = None
+        self.sent = None
+        self.queued = None
+        self.priority = PRIORITY_CONTROL
+        self.retries = 0
+        # Bytes of the device's receive buffer the command occupies until answered
+        self.cost = len(cmd) - 1
+
+    def resolve(self, event):
+        if event._opcode != Event.CMD_RSP:
+            self.future.set_result(event)
+        elif event.status != 0:
+            self.future.set_exception(CommandError(self.cmd, event.status))
+        else:
+            try:
+                self.future.set_result(response_deserialize(event))
+            except Exception as e:
+                self.future.set_exception(e)
+
+
+class FrameReceiver(object):
+    """The receive path shared by Device and AsyncUart.
+
+    Transports pass every frame they read to _receive_frame().
+    """
+    def __init__(self, device_name, events=None):
         self.device_name = device_name
         self.logger = logging.getLogger(self.device_name)
+        # Opcodes of the frames to deserialize, the others are dropped
+        self.accepted = bytes([1]) * 256
+        # Frames dropped, as no one wanted their opcode
+        self.filtered = 0
+        self.capture = None
+        # History of the received events, an EventStore of the default size
+        # unless one is given
+        self.events = events if events is not None else EventStore()
+        # Packets longer than one frame are only segmented and reassembled
+        # when set. The firmware doesn't implement SAR, see aci.aci_sar.
+        self.segmentation = False
+        self._sar = SarReassembler(logger=self.logger)
+
+    def set_capture(self, sink):
+        """Records every raw frame to `sink`, see aci_capture.CaptureWriter.
+
+        The sink is called as `sink.write(direction, frame)`. Pass None to
+        stop capturing. Returns the previous sink.
+        """
+        previous, self.capture = self.capture, sink
+        return previous
+
+    def _receive_frame(self, frame):
+        """Captures, filters, deserializes and processes a received frame.
+
+        `frame` may be a view into the transport's receive buffer. Returns
+        the parsed packet, or None if there is none.
+        """
+        if self.capture:
+            self.capture.write(CAPTURE_RX, frame)
+        if len(frame) > 1 and self.segmentation and self._sar.is_segment(frame):
+            frame = self._sar.feed(frame)
+            if frame is None:
+                return None
+        if len(frame) > 1 and not self.accepted[frame[1]]:
+            self.filtered += 1
+            return None
+        # The event needs its own copy of a view
+        pkt = frame if isinstance(frame, bytearray) else bytearray(frame)
+        self.logger.debug("RX: %s", LazyHex(pkt))
+        parsed_packet = packet_deserialize(pkt, self.logger, self.events)
+        if parsed_packet:
+            self.logger.debug('parsed_packet %r', parsed_packet)
+            self.process_packet(parsed_packet)
+        return parsed_packet
+
+
+class SerialWriter(object):
+    """The writes of a Device on the pyserial port `serial`.
+
+    Frames written together go out in one write, under `_write_lock`.
+    """
+    def write_data(self, data):
+        self.write_frames([data])
+
+    def write_frames(self, frames, data=None):
+        if data is None:
+            data = b"".join(frames)
+        with self._write_lock:
+            if self.keep_running:
+                self.logger.debug("TX: %s", LazyHex(data))
+                if self.capture:
+                    for frame in frames:
+                        self.capture.write(CAPTURE_TX, frame)
+                self.serial.write(data)
+                for frame in frames:
+                    self.process_command(frame)
+
+
+class Device(FrameReceiver):
+    def __init__(self, device_name, window=DEFAULT_WINDOW, start_writer=True, events=None):
+        FrameReceiver.__init__(self, device_name, events)
+        # (function, opcodes, exclude) in subscription order, see add_packet_recipient()
         self._pack_recipients = []
+        # Recipients per event opcode and the opcodes that anyone needs,
+        # rebuilt on every subscription change
+        self._dispatch = ((),) * 256
+        self.accepted = bytes(1 if opcode in ALWAYS_ACCEPTED else 0 for opcode in range(256))
         self._cmd_recipients = []
-        self.lock = threading.Event()
-        self.events = list()
-        self.__write_queue = queue.Queue()
+        # Number of commands that may be awaiting a response at the same time
+        self.window = window
+        # Frames written together are gathered into writes of at most
+        # tx_batch_bytes (0 writes every frame on its own). With tx_linger
+        # set, the writer waits up to that many seconds for more commands to
+        # fill a batch.
+        self.tx_batch_bytes = FIRMWARE_RX_BUFFER_SIZE
+        self.tx_linger = 0
+        # Credit based flow control: the payload bytes of unanswered commands
+        # are kept within the data_credit_available reported by DeviceStarted.
+        # None until the device has reported it, or to disable flow control.
+        self.credits = None
+        self.credits_in_flight = 0
+        # Number of times sending stopped to wait for credits
+        self.credit_stalls = 0
+        self._credit_stalled = False
+        self._credit_refused = False
+        self._write_cond = threading.Condition()
+        # One queue per priority lane
+        self.__write_queues = (collections.deque(), collections.deque(), collections.deque())
+        self.__pending = collections.deque()
         self.writer_alive = True
-        threading.Thread(target=self.__writer).start()
+        # Sees every queued command and its future, see mesh.journal.StateJournal
+        self.journal = None
+        # Round trip time of every command, see latency_stats()
+        self.latency = CommandLatency()
+        # Response timeouts follow the round trip time of each opcode. Timed
+        # out IDEMPOTENT_OPCODES are sent up to retransmit_limit more times
+        # (0 disables retransmission) before their future fails, if no other
+        # command with the same opcode is in flight. A copy is sent once the
+        # late response to the previous one is no longer expected.
+        self.rtt = RoundTripEstimator(CMD_TIMEOUT)
+        self.retransmit_limit = 0
+        self.retransmits = 0
+        self.giveups = 0
+        # Timed out commands whose response may still come, as deques of
+        # (expiry, PendingCommand) per opcode, see _late_response()
+        self.__late = {}
+        self.late_responses = 0
+        # Without a writer thread, the owner must call service_writes() when
+        # woken up through _writer_notify() and before each returned timeout.
+        if start_writer:
+            threading.Thread(target=self.__writer).start()
 
     def __del__(self):
         self.kill_writer()
 
     def kill_writer(self):
-        self.writer_alive = False
-        self.__write_queue.put(None)
+        with self._write_cond:
+            self.writer_alive = False
+            lost = list(self.__pending)
+            self.__pending.clear()
+            for queue in self.__write_queues:
+                lost += queue
+                queue.clear()
+            self.credits_in_flight = 0
+            self.__late.clear()
+            self._writer_notify()
+        for pending in lost:
+            pending.future.cancel()
 
-    def __wait(self, timeout=2):
-        if len(self.events) == 0:
-            self.lock.wait(timeout)
-        self.lock.clear()
+    def add_packet_recipient(self, function, opcodes=None, exclude=None):
+        """Calls `function(event)` for every received event.
 
-        if len(self.events) == 0:
-            return None
-        else:
-            event = self.events[:]
-            self.events.clear()
-            return event
+        If `opcodes` is given, only events with one of those opcodes are
+        passed to the function, and events with an opcode in `exclude` never
+        are. Adding a function again replaces its subscription.
 
-    def add_packet_recipient(self, function):
-        self._pack_recipients.append(function)
+        Frames with an opcode that no recipient needs are dropped by the
+        reader before they are deserialized.
+        """
+        recipient = (function,
+                     frozenset(opcodes) if opcodes is not None else None,
+                     frozenset(exclude) if exclude else None)
+        recipients = list(self._pack_recipients)
+        for i, (fun, _, _) in enumerate(recipients):
+            if fun == function:
+                recipients[i] = recipient
+                break
+        else:
+            recipients.append(recipient)
+        self._pack_recipients = recipients
+        self._build_dispatch()
 
     def remove_packet_recipient(self, function):
-        if function in self._pack_recipients:
-            self._pack_recipients.remove(function)
+        self._pack_recipients = [recipient for recipient in self._pack_recipients
+                                 if recipient[0] != function]
+        self._build_dispatch()
+
+    def _build_dispatch(self):
+        # The tables are replaced rather than modified, so that the reader can
+        # use them without a lock or a copy.
+        dispatch = tuple(
+            tuple(fun for fun, opcodes, exclude in self._pack_recipients
+                  if (opcodes is None or opcode in opcodes)
+                  and not (exclude and opcode in exclude))
+            for opcode in range(256))
+        self._dispatch = dispatch
+        self.accepted = bytes(1 if dispatch[opcode] or opcode in ALWAYS_ACCEPTED else 0
+                              for opcode in range(256))
 
     def add_command_recipient(self, function):
+        """Calls `function(frame)` for every frame written to the device.
+
+        The frame is a bytearray of its own, that the recipient may keep.
+        """
         self._cmd_recipients.append(function)
 
     def process_packet(self, packet):
-        self.events.append(packet)
-        self.lock.set()
-        for fun in self._pack_recipients[:]:
+        self._command_response(packet)
+        for fun in self._dispatch[packet._opcode]:
             try:
                 fun(packet)
             except:
@@ -91,52 +476,336 @@ class Device(object):
                 self.logger.error('traceback: %s', traceback.format_exc())
 
     def process_command(self, command):
-        for fun in self._cmd_recipients[:]:
+        recipients = self._cmd_recipients[:]
+        if recipients and not isinstance(command, bytearray):
+            # Written frames are views into the batch buffer
+            command = bytearray(command)
+        for fun in recipients:
             try:
                 fun(command)
             except:
                 self.logger.error('Exception in pkt handler %r', fun)
                 self.logger.error('traceback: %s', traceback.format_exc())
 
+    def _command_response(self, event):
+        if event._opcode == Event.CMD_RSP:
+            opcode = event.opcode
+        elif event._opcode in RESPONSE_EVENT_LUT:
+            opcode = RESPONSE_EVENT_LUT[event._opcode]
+        else:
+            return
+
+        lost = []
+        late = False
+        with self._write_cond:
+            if event._opcode != Event.DEVICE_STARTED and self._late_held(opcode, time.monotonic()):
+                late = True
+                answered = self._late_response(opcode)
+            else:
+                answered = None
+                for pending in self.__pending:
+                    if pending.opcode == opcode:
+                        answered = pending
+                        break
+
+                if event._opcode == Event.DEVICE_STARTED:
+                    # The device has been reset, nothing else in flight will be answered.
+                    lost = [p for p in self.__pending if p is not answered]
+                    self.__pending.clear()
+                    self.__late.clear()
+                    self.credits_in_flight = 0
+                    self.credits = event.data_credit_available
+                elif answered:
+                    self.__pending.remove(answered)
+                    self.credits_in_flight -= answered.cost
+                else:
+                    return
+                # A response to a retransmitted command may answer any of its
+                # copies, so it doesn't tell the round trip time (Karn's algorithm).
+                if answered and answered.sent is not None and not answered.retries:
+                    self.rtt.sample(answered.opcode, time.perf_counter() - answered.sent)
+            self._writer_notify()
+
+        for pending in lost:
+            pending.future.cancel()
+        if answered:
+            if answered.sent is not None and not late:
+                self.latency.record(answered.cmd, time.perf_counter() - answered.sent)
+            answered.resolve(event)
+
+    def _late_response(self, opcode):
+        """Takes a response to a command that has timed out.
+
+        Responses only carry the opcode, and come in the order the commands
+        were sent. A late response is older than any pending command's, so it
+        is taken before matching, or every later response with the same
+        opcode would resolve the wrong command. Returns the command if it is
+        waiting to be retransmitted, as the response answers it, or None if
+        the response is dropped. Called with the write condition held.
+        """
+        _, pending = self.__late[opcode].popleft()
+        self.late_responses += 1
+        if not pending.future.done():
+            self.__write_queues[pending.priority].remove(pending)
+            self.logger.debug('Late response to 0x%02X, not retransmitting it', opcode)
+            return pending
+        self.logger.debug('Dropped the late response to a 0x%02X command', opcode)
+        return None
+
+    def _late_held(self, opcode, now):
+        """Tells if responses to timed out commands with the opcode are still
+        expected. Expired entries are dropped. Called with the write condition
+        held.
+        """
+        late = self.__late.get(opcode)
+        if not late:
+            return False
+        while late and late[0][0] <= now:
+            late.popleft()
+        if not late:
+            del self.__late[opcode]
+            return False
+        return True
+
+    def _writer_notify(self):
+        """Wakes up the writer. Called with the write condition held."""
+        self._write_cond.notify()
+
+    def _next_commands(self):
+        """Moves queued commands to the pending list as far as the window allows.
+
+        Must be called with the write condition held. Returns the pending
+        commands that should be written to the device, and the number of seconds until the
+        first pending command times out or a held opcode is released (None if
+        there is nothing to wait for).
+        """
+        now = time.monotonic()
+        # Timeouts differ per opcode, so the deadlines are not in order
+        for pending in [p for p in self.__pending if p.deadline <= now]:
+            self.__pending.remove(pending)
+            self.credits_in_flight -= pending.cost
+            self.latency.timeout(pending.cmd)
+            self.rtt.backoff(pending.opcode)
+            name = pending.cmd.__class__.__name__
+            # The response may still come, give it another timeout period
+            late = self.__late.setdefault(pending.opcode, collections.deque())
+            late.append((now + self.rtt.timeout(pending.opcode), pending))
+            # A copy is only told apart from other commands with the same
+            # opcode if none of them is in flight. It waits for the late
+            # response of the original, see _late_response().
+            if (pending.retries < self.retransmit_limit and pending.opcode in IDEMPOTENT_OPCODES
+                    and not any(p.opcode == pending.opcode for p in self.__pending)):
+                pending.retries += 1
+                self.retransmits += 1
+                self.logger.info('cmd %s, timeout waiting for response, retransmission %d', name, pending.retries)
+                self.__write_queues[pending.priority].appendleft(pending)
+                continue
+            if pending.retries:
+                self.giveups += 1
+            self.logger.info('cmd %s, timeout waiting for response', name)
+            pending.future.set_exception(TimeoutError("No response to {}".format(name)))
+
+        cmds = []
+        self._credit_refused = False
+        while True:
+            queue = self._next_lane(now)
+            if queue is None:
+                break
+            pending = queue.popleft()
+            pending.deadline = now + self.rtt.timeout(pending.opcode)
+            self.__pending.append(pending)
+            self.credits_in_flight += pending.cost
+            cmds.append(pending)
+
+        if cmds:
+            self._credit_stalled = False
+        if self._credit_refused and not self._credit_stalled:
+            self._credit_stalled = True
+            self.credit_stalls += 1
+
+        # Held opcodes are released when their late responses expire
+        deadlines = [p.deadline for p in self.__pending]
+        deadlines += [late[0][0] for opcode, late in list(self.__late.items())
+                      if self._late_held(opcode, now)]
+        if deadlines:
+            return cmds, min(deadlines) - now
+        return cmds, None
+
+    def _next_lane(self, now):
+        """Returns the queue whose first command is sent next, None if no
+        command can be sent now.
+
+        Lanes are served in priority order, except that commands that have
+        waited STARVATION_TIMEOUT go first, oldest first. A lane whose first
+        command can't be sent yet is skipped, so that it doesn't hold up the
+        others. Called with the write condition held.
+        """
+        lanes = []
+        for index, queue in enumerate(self.__write_queues):
+            if queue:
+                if now - queue[0].queued >= STARVATION_TIMEOUT:
+                    lanes.append(((0, queue[0].queued), queue))
+                else:
+                    lanes.append(((1, index), queue))
+        lanes.sort(key=lambda lane: lane[0])
+        for _, queue in lanes:
+            if self._window_open(queue[0], now):
+                return queue
+        return None
+
+    def _window_open(self, pending, now):
+        """Tells if a command may be sent now. Called with the write condition held."""
+        if len(self.__pending) >= self.window:
+            return False
+        if self._late_held(pending.opcode, now):
+            # Its response could not be told apart from the late one
+            return False
+        if (self.credits is not None and self.__pending
+                and self.credits_in_flight + pending.cost > self.credits):
+            # Out of credits. A single command is always let through, even
+            # if it is larger than the device's buffer.
+            self._credit_refused = True
+            return False
+        return True
+
+    def _linger(self, cmds):
+        """Waits up to tx_linger seconds for more commands to fill a batch.
+
+        Must be called with the write condition held.
+        """
+        size = sum(len(pending.cmd) + 1 for pending in cmds)
+        deadline = time.monotonic() + self.tx_linger
+        while (size < self.tx_batch_bytes and self.writer_alive
+               and len(self.__pending) < self.window):
+            if self.credits is not None and self.credits_in_flight >= self.credits:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._write_cond.wait(remaining)
+            more, _ = self._next_commands()
+            cmds += more
+            size += sum(len(pending.cmd) + 1 for pending in more)
+        return cmds
+
+    def _write_commands(self, cmds):
+        # Called outside the lock, so that the reader can keep matching responses
+        batch = []
+        size = 0
+        for pending in cmds:
+            pending.cmd.logger = self.logger
+            if len(pending.cmd) <= SERIAL_PAYLOAD_MAXLEN + 1:
+                # Serialized straight into the batch buffer, see _write_batch()
+                frames = [(pending.cmd, len(pending.cmd) + 1)]
+            else:
+                frames = [(frame, len(frame)) for frame in command_frames(pending.cmd)]
+            pending.sent = time.perf_counter()
+            for frame, length in frames:
+                if batch and size + length > self.tx_batch_bytes:
+                    self._write_batch(batch, size)
+                    batch = []
+                    size = 0
+                batch.append((frame, length))
+                size += length
+        if batch:
+            self._write_batch(batch, size)
+
+    def _write_batch(self, batch, size):
+        """Lays out commands and frames in one buffer, and writes them."""
+        data = bytearray(size)
+        view = memoryview(data)
+        frames = []
+        offset = 0
+        for item, length in batch:
+            end = offset + length
+            if isinstance(item, CommandPacket):
+                item.serialize_into(data, offset)
+            else:
+                data[offset:end] = item
+            frames.append(view[offset:end])
+            offset = end
+        self.write_frames(frames, data)
+
+    def write_frames(self, frames, data=None):
+        """Writes a list of frames. Transports may gather them into one write.
+
+        `data` is the frames back to back, if the caller has them in one buffer.
+        """
+        for frame in frames:
+            self.write_data(frame)
+
+    def service_writes(self):
+        """Writes whatever the window allows without blocking on the queue.
+
+        Returns the number of seconds until this must be called again to
+        handle command timeouts, or None if nothing is pending.
+        """
+        with self._write_cond:
+            cmds, timeout = self._next_commands()
+        self._write_commands(cmds)
+        return timeout
+
     def __writer(self):
-        while self.writer_alive:
-            cmd = self.__write_queue.get()
-            if cmd is None:
-                return
-            cmd.logger = self.logger
-            self.write_data(cmd.serialize())
-            retval = self.__wait()
-            if retval == None:
-                self.logger.info('cmd %s, timeout waiting for event' % (cmd.__class__.__name__))
-
-    def write_aci_cmd(self, cmd):
+        while True:
+            with self._write_cond:
+                cmds, timeout = self._next_commands()
+                while not cmds and self.writer_alive:
+                    self._write_cond.wait(timeout)
+                    cmds, timeout = self._next_commands()
+                if not self.writer_alive:
+                    return
+                if self.tx_linger:
+                    cmds = self._linger(cmds)
+            self._write_commands(cmds)
+
+    def latency_stats(self):
+        """Returns the round trip statistics per command, see CommandLatency.stats()."""
+        return self.latency.stats()
+
+    def write_aci_cmd(self, cmd, priority=None):
+        """Queues a command for the device.
+
+        `priority` picks the queue lane: PRIORITY_CRITICAL, PRIORITY_CONTROL
+        or PRIORITY_BULK. By default, provisioning replies are critical,
+        PacketSend is bulk and anything else is control.
+
+        Returns a concurrent.futures.Future that resolves to the decoded
+        response (see `response_deserialize()`), or to the answering event for
+        commands not answered by a CmdRsp. The future raises CommandError if
+        the device rejects the command, TimeoutError if it does not respond,
+        and is cancelled if the device resets or the writer is stopped first.
+        """
         if isinstance(cmd, CommandPacket):
-            self.__write_queue.put(cmd)
+            if len(cmd) > SERIAL_PAYLOAD_MAXLEN + 1 and not self.segmentation:
+                raise ValueError("Command too long for one frame: {} bytes".format(len(cmd) + 1))
+            if priority is None:
+                priority = command_priority(cmd)
+            pending = PendingCommand(cmd)
+            pending.queued = time.monotonic()
+            pending.priority = priority
+            if self.journal is not None:
+                self.journal.command(cmd, pending.future)
+            with self._write_cond:
+                self.__write_queues[priority].append(pending)
+                self._writer_notify()
+            return pending.future
         else:
             self.logger.error('The command provided is not valid: %s\nIt must be an instance of the CommandPacket class (or one of its subclasses)', str(cmd))
 
 
-class Uart(threading.Thread, Device):
-    def __init__(self, port, baudrate=115200, device_name=None, rtscts=True):
-        self.events_queue = collections.deque(maxlen=EVT_Q_BUF)
+class Uart(threading.Thread, SerialWriter, Device):
+    def __init__(self, port, baudrate=115200, device_name=None, rtscts=True, window=DEFAULT_WINDOW, events=None):
         threading.Thread.__init__(self)
         if not device_name:
             device_name = port
         self.device_name = device_name
         self.logger = logging.getLogger(self.device_name)
-        Device.__init__(self, self.device_name)
+        Device.__init__(self, self.device_name, window, events=events)
 
         self._write_lock = threading.Lock()
 
         self.logger.debug("log Opening port %s, baudrate %s, rtscts %s", port, baudrate, rtscts)
-
-        # We change the baudrate around to reset the UART state.
-        # This is a trick to force detection of flow control settings etc.
-        _trick_baudrate = 9600
-        if baudrate == _trick_baudrate:
-            _trick_baudrate = 115200
-        self.serial = Serial(port=port, baudrate=_trick_baudrate, rtscts=rtscts, timeout=0.1)
-        self.serial.baudrate = baudrate
+        self.serial = serial_open(port, baudrate, rtscts, timeout=0.1)
 
         self.keep_running = True
         self.start()
@@ -149,47 +818,357 @@ class Uart(threading.Thread, Device):
         self.kill_writer()
 
     def get_packet_from_uart(self):
-        tmp = bytearray([])
+        framer = PacketFramer()
         while self.keep_running:
-            tmp += bytearray(self.serial.read())
-            tmp_len = len(tmp)
-            if tmp_len > 0:
-                pkt_len = tmp[0]
-                if tmp_len > pkt_len:
-                    data = tmp[:pkt_len+1]
-                    yield data
-                    tmp = tmp[pkt_len+1:]
+            space = framer.free_space()
+            # Block (with timeout) for the first byte, then pick up everything
+            # that is already pending in a single read.
+            count = min(max(self.serial.in_waiting, 1), len(space))
+            count = self.serial.readinto(space[:count])
+            if count:
+                framer.commit(count)
+                yield from framer.packets()
 
     def run(self):
-        for pkt in self.get_packet_from_uart():
-            self.logger.debug("RX: %s", pkt.hex())
+        for frame in self.get_packet_from_uart():
+            self._receive_frame(frame)
+
+        self.serial.close()
+        self.logger.debug("exited read event")
+
+    def __repr__(self):
+        return '%s(port="%s", baudrate=%s, device_name="%s")' % (self.__class__.__name__, self.serial.port, self.serial.baudrate, self.device_name)
+
+
+class HubUart(SerialWriter, Device):
+    """A serial device served by a UartHub instead of its own threads."""
+    def __init__(self, hub, port, baudrate=115200, device_name=None, rtscts=True, window=DEFAULT_WINDOW, events=None):
+        if not device_name:
+            device_name = port
+        Device.__init__(self, device_name, window, start_writer=False, events=events)
+        self.hub = hub
+        self._write_lock = threading.Lock()
+        self.logger.debug("log Opening port %s, baudrate %s, rtscts %s", port, baudrate, rtscts)
+        self.serial = serial_open(port, baudrate, rtscts, timeout=0)
+        self._fd = self.serial.fileno()
+        os.set_blocking(self._fd, False)
+        self._framer = PacketFramer()
+        self.keep_running = True
+        self.hub.attach(self)
+
+    def __del__(self):
+        self.stop()
+
+    def stop(self):
+        if self.keep_running:
+            self.keep_running = False
+            self.hub.detach(self)
             try:
-                if len(pkt) < 2:
-                    self.logger.error('Invalid packet: %r', pkt)
+                self.serial.close()
+            except OSError:
+                # The port is gone already
+                pass
+        self.kill_writer()
+
+    def _writer_notify(self):
+        # Responses are matched on the hub thread, which services the writes
+        # right after anyway.
+        if threading.current_thread() is not self.hub:
+            self.hub.wakeup()
+
+    def read_ready(self):
+        try:
+            count = self._framer.read_from(self._fd)
+        except BlockingIOError:
+            return
+        except OSError:
+            self.logger.error('Serial port closed: %s', traceback.format_exc())
+            self.stop()
+            return
+        if not count:
+            # Readable without data: the device has been disconnected
+            self.logger.error('Serial port closed: no data on a ready read')
+            self.stop()
+            return
+        for frame in self._framer.packets():
+            self._receive_frame(frame)
+
+    def __repr__(self):
+        return '%s(port="%s", baudrate=%s, device_name="%s")' % (self.__class__.__name__, self.serial.port, self.serial.baudrate, self.device_name)
+
+
+class UartHub(threading.Thread):
+    """Serves the serial ports of many devices from a single thread.
+
+    Reads, writes and command timeouts of all the attached devices are
+    multiplexed on one selector, where every Uart would otherwise run its own
+    reader and writer thread. Events are delivered through the regular Device
+    recipient API of each device, on the hub thread. Serial ports must be
+    selectable, so this is POSIX only.
+    """
+    def __init__(self):
+        threading.Thread.__init__(self)
+        self.logger = logging.getLogger("hub")
+        self.devices = []
+        self._selector = selectors.DefaultSelector()
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_r.setblocking(False)
+        self._wakeup_w.setblocking(False)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ, None)
+        self.keep_running = True
+        self.start()
+
+    def open(self, port, baudrate=115200, device_name=None, rtscts=True, window=DEFAULT_WINDOW, events=None):
+        return HubUart(self, port, baudrate, device_name, rtscts, window, events)
+
+    def attach(self, device):
+        self.devices.append(device)
+        self._selector.register(device._fd, selectors.EVENT_READ, device)
+        self.wakeup()
+
+    def detach(self, device):
+        if device in self.devices:
+            self.devices.remove(device)
+            self._selector.unregister(device._fd)
+            self.wakeup()
+
+    def wakeup(self):
+        try:
+            self._wakeup_w.send(b"\0")
+        except BlockingIOError:
+            # The hub has a wakeup pending already
+            pass
+        except OSError:
+            # The socket is closed once the hub has stopped, there is no one
+            # left to wake up
+            if self.keep_running:
+                raise
+
+    def stop(self):
+        for device in self.devices[:]:
+            device.stop()
+        self.keep_running = False
+        self.wakeup()
+
+    def _device_failed(self, device):
+        # Only the failing device is stopped, which cancels its pending
+        # commands, the others are still served
+        self.logger.error('Device %s failed: %s', device.device_name, traceback.format_exc())
+        device.stop()
+
+    def run(self):
+        while self.keep_running:
+            timeout = None
+            for device in self.devices[:]:
+                try:
+                    device_timeout = device.service_writes()
+                except Exception:
+                    self._device_failed(device)
                     continue
-                parsed_packet = event_deserialize(pkt)
-                if not parsed_packet:
-                    self.logger.error("Unable to deserialize %s", pkt.hex())
+                if device_timeout is not None and (timeout is None or device_timeout < timeout):
+                    timeout = device_timeout
 
-            except Exception:
-                self.logger.error('Exception with packet %s', pkt.hex())
-                self.logger.error('traceback: %s', traceback.format_exc())
-                parsed_packet = None
+            for key, _ in self._selector.select(timeout):
+                if key.data is None:
+                    try:
+                        self._wakeup_r.recv(4096)
+                    except BlockingIOError:
+                        pass
+                elif key.data in self.devices:
+                    try:
+                        key.data.read_ready()
+                    except Exception:
+                        self._device_failed(key.data)
+
+        self._selector.close()
+        self._wakeup_r.close()
+        self._wakeup_w.close()
+        self.logger.debug("exited hub")
+
+
+class AsyncUart(FrameReceiver):
+    """The asyncio counterpart of Uart.
+
+    Received events are consumed with `async for event in device`, and
+    `await device.send(cmd)` returns the same result as the future from
+    Device.write_aci_cmd(). Must be created and used from the event loop's
+    thread.
+
+    The port is registered with the event loop instead of being served by
+    threads, so this requires an event loop with add_reader() support (any
+    selector based loop on POSIX).
+    """
+    def __init__(self, port, baudrate=115200, device_name=None, rtscts=True, loop=None, events=None):
+        if not device_name:
+            device_name = port
+        FrameReceiver.__init__(self, device_name, events)
+        self.loop = loop if loop is not None else asyncio.get_event_loop()
+        self._events = asyncio.Queue(maxsize=EVT_Q_BUF)
+        self._pending = collections.deque()
+        # Timed out commands whose response may still come, as deques of
+        # futures per opcode that are done once the response is no longer
+        # expected, see _hold()
+        self._late = {}
+        self.late_responses = 0
+        self.logger.debug("log Opening port %s, baudrate %s, rtscts %s", port, baudrate, rtscts)
+        self.serial = serial_open(port, baudrate, rtscts, timeout=0)
+        self._fd = self.serial.fileno()
+        os.set_blocking(self._fd, False)
+        self._framer = PacketFramer()
+        self._tx_buf = bytearray()
+        self.loop.add_reader(self._fd, self._read_ready)
 
-            if parsed_packet:
-                self.events_queue.append(parsed_packet)
-                self.logger.debug('parsed_packet %r', parsed_packet)
-                self.process_packet(parsed_packet)
+    def __aiter__(self):
+        return self
 
+    async def __anext__(self):
+        event = await self._events.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+    def close(self):
+        self.loop.remove_reader(self._fd)
+        self.loop.remove_writer(self._fd)
         self.serial.close()
-        self.logger.debug("exited read event")
+        for pending in self._pending:
+            pending.future.cancel()
+        self._pending.clear()
+        for late in self._late.values():
+            for released in late:
+                released.cancel()
+        self._late.clear()
+        self._event_put(None)
+
+    def _event_put(self, event):
+        if self._events.full():
+            # Same policy as the EventStore: the oldest event is dropped
+            self._events.get_nowait()
+        self._events.put_nowait(event)
+
+    def process_packet(self, packet):
+        if packet._opcode == Event.CMD_RSP:
+            opcode = packet.opcode
+        else:
+            opcode = RESPONSE_EVENT_LUT.get(packet._opcode)
+
+        late = self._late.get(opcode)
+        if late and packet._opcode != Event.DEVICE_STARTED:
+            # Responses come in order, so this one is for the timed out command
+            self.late_responses += 1
+            self._release(opcode, late[0])
+            self._event_put(packet)
+            return
+
+        answered = None
+        for pending in self._pending:
+            if pending.opcode == opcode:
+                answered = pending
+                break
+
+        lost = []
+        if packet._opcode == Event.DEVICE_STARTED:
+            # The device has been reset, nothing else in flight will be answered.
+            lost = [p for p in self._pending if p is not answered]
+            self._pending.clear()
+            for late_opcode, late in list(self._late.items()):
+                for released in list(late):
+                    self._release(late_opcode, released)
+        elif answered:
+            self._pending.remove(answered)
+
+        if answered and not answered.future.done():
+            answered.resolve(packet)
+        for pending in lost:
+            pending.future.cancel()
+        self._event_put(packet)
+
+    async def send(self, cmd, timeout=CMD_TIMEOUT):
+        """Writes a command to the device and waits for its response.
+
+        Raises CommandError if the device rejects the command,
+        asyncio.TimeoutError if there is no response within the timeout, and
+        asyncio.CancelledError if the device resets or is closed first.
+
+        After a timeout, commands with the same opcode wait up to one more
+        timeout for the late response before they are written, as their
+        responses could not be told apart.
+        """
+        if not isinstance(cmd, CommandPacket):
+            raise TypeError("The command must be an instance of the CommandPacket class")
+        if len(cmd) > SERIAL_PAYLOAD_MAXLEN + 1 and not self.segmentation:
+            raise ValueError("Command too long for one frame: {} bytes".format(len(cmd) + 1))
+        while cmd._opcode in self._late:
+            await asyncio.shield(self._late[cmd._opcode][-1])
+        pending = PendingCommand(cmd, self.loop.create_future())
+        self._pending.append(pending)
+        for frame in command_frames(cmd):
+            self.write_data(frame)
+        try:
+            return await asyncio.wait_for(pending.future, timeout)
+        except asyncio.TimeoutError:
+            self._hold(cmd._opcode, timeout)
+            raise
+        finally:
+            if pending in self._pending:
+                self._pending.remove(pending)
+
+    def _hold(self, opcode, timeout):
+        """Expects a late response to a timed out command for another `timeout` seconds."""
+        released = self.loop.create_future()
+        self._late.setdefault(opcode, collections.deque()).append(released)
+        self.loop.call_later(timeout, self._release, opcode, released)
+
+    def _release(self, opcode, released):
+        late = self._late.get(opcode)
+        if late and released in late:
+            late.remove(released)
+            if not late:
+                del self._late[opcode]
+        if not released.done():
+            released.set_result(None)
+
+    def _read_ready(self):
+        try:
+            count = self._framer.read_from(self._fd)
+        except BlockingIOError:
+            return
+        except OSError:
+            self.logger.error('Serial port closed: %s', traceback.format_exc())
+            self.close()
+            return
+        if not count:
+            # Readable without data: the device has been disconnected
+            self.logger.error('Serial port closed: no data on a ready read')
+            self.close()
+            return
+        for frame in self._framer.packets():
+            self._receive_frame(frame)
+
+    def _write_ready(self):
+        try:
+            count = os.write(self._fd, self._tx_buf)
+        except BlockingIOError:
+            return
+        del self._tx_buf[:count]
+        if not self._tx_buf:
+            self.loop.remove_writer(self._fd)
 
     def write_data(self, data):
-        with self._write_lock:
-            if self.keep_running:
-                self.logger.debug("TX: %s", bytearray(data).hex())
-                self.serial.write(bytearray(data))
-                self.process_command(data)
+        self.logger.debug("TX: %s", LazyHex(data))
+        if self.capture:
+            self.capture.write(CAPTURE_TX, data)
+        if self._tx_buf:
+            # Keep the order behind what is already waiting for the port
+            self._tx_buf += data
+            return
+        try:
+            count = os.write(self._fd, data)
+        except BlockingIOError:
+            count = 0
+        if count < len(data):
+            self._tx_buf += data[count:]
+            self.loop.add_writer(self._fd, self._write_ready)
 
     def __repr__(self):
         return '%s(port="%s", baudrate=%s, device_name="%s")' % (self.__class__.__name__, self.serial.port, self.serial.baudrate, self.device_name)
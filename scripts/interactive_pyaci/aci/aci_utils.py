@@ -27,6 +27,9 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+import collections.abc
+
+
 STATUS_CODE_LUT = {
     0x00: {"code": "SUCCESS", "description": "The command completed successfully."},
     0x80: {"code": "ERROR_UNKNOWN", "description": "An unknown error occurred."},
@@ -41,6 +44,17 @@ STATUS_CODE_LUT = {
     0x93: {"code": "ERROR_TIMEOUT", "description": "The command processing was interrupted by a timeout, causing it to abort the command."},
     0x98: {"code": "ERROR_INVALID_KEY_DATA", "description": "The Key data given as part of the command parameters could not be verified."}}
 
+class LazyHex(object):
+    """Log argument that formats `data` as hex only when the record is emitted."""
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        self.data = data
+
+    def __str__(self):
+        return self.data.hex()
+
+
 def value_to_barray(value, size=4, big_endian=False):
     barray = bytearray([(value >> i) & 0xFF for i in range(0, size*8, 8)])
     if big_endian:
@@ -51,6 +65,9 @@ def value_to_barray(value, size=4, big_endian=False):
 def iterable_to_barray(iterable):
     if isinstance(iterable, str):
         return bytearray(iterable, 'ascii')
+    elif isinstance(iterable, (bytes, bytearray, memoryview)):
+        # Already bytes, the caller copies them into its own buffer
+        return iterable
     else:
         return bytearray(iterable)
 
@@ -63,37 +80,108 @@ def barray_pop(barray, size=4):
 
 
 class CommandPacket(object):
+    """Base of the generated commands.
+
+    `data` holds the parameters. A payload added with append() is kept by
+    reference, and is only copied when the command is serialized.
+    """
     def __init__(self, opcode, data):
         if not isinstance(data, bytearray):
             raise TypeError("Data should be a bytearray")
         else:
             self._opcode = opcode
-            self._data = data
+            self._params = data
+            self._payload = ()
+            self._length = len(data) + 1
+
+    @property
+    def _data(self):
+        if not self._payload:
+            return self._params
+        return self._params + b"".join(self._payload)
 
     def __str__(self):
-        raw_data = self.serialize()
-        return "".join("{:02X}".format(b) for b in raw_data)
+        # Formatted from the parts, as commands longer than one frame can't
+        # be serialized
+        parts = (bytes([self._opcode]), self._params) + self._payload
+        return "{:02X}".format(self._length) + "".join(bytes(part).hex().upper() for part in parts)
 
     def __repr__(self):
         return str(self)
 
     def __len__(self):
-        return len(self._data) + 1
+        return self._length
+
+    def append(self, data):
+        """Appends `data` to the parameters without copying it.
+
+        The data must not be modified until the command has been sent.
+        """
+        self._payload += (data,)
+        self._length += len(data)
 
     def serialize(self):
-        return bytearray([len(self), self._opcode]) + self._data
+        raw_data = bytearray(self._length + 1)
+        self.serialize_into(raw_data)
+        return raw_data
+
+    def serialize_into(self, buf, offset=0):
+        """Writes the command frame into `buf` at `offset`.
+
+        Returns the offset after the frame. Commands that don't fit in one
+        frame must be segmented instead, see aci_sar.command_frames().
+        """
+        buf[offset] = self._length
+        buf[offset + 1] = self._opcode
+        end = offset + 2 + len(self._params)
+        buf[offset + 2:end] = self._params
+        for part in self._payload:
+            offset, end = end, end + len(part)
+            buf[offset:end] = part
+        return end
+
+
+class PacketFields(collections.abc.Mapping):
+    """Dict-like view of the fields of an event or response, by name."""
+    __slots__ = ("_packet",)
+
+    def __init__(self, packet):
+        self._packet = packet
+
+    def __getitem__(self, key):
+        if key not in self._packet._fields:
+            raise KeyError(key)
+        return getattr(self._packet, key)
+
+    def __setitem__(self, key, value):
+        if key not in self._packet._fields:
+            raise KeyError(key)
+        setattr(self._packet, key, value)
+
+    def __iter__(self):
+        return iter(self._packet._fields)
+
+    def __len__(self):
+        return len(self._packet._fields)
+
+    def __repr__(self):
+        return repr(dict(self))
 
 
 class EventPacket(object):
-    def __init__(self, event_name, opcode, data):
-        if not isinstance(data, dict):
-            raise TypeError("Data should be a dict")
-        elif not isinstance(event_name, str):
-            raise TypeError("Event name should be a string")
-        else:
-            self._event_name = event_name
-            self._opcode = opcode
-            self._data = data
+    """Base of the generated events.
+
+    The fields are attributes, listed in order in `_fields`. `_data` gives
+    the same fields as a dict-like view.
+    """
+    __slots__ = ()
+    _event_name = None
+    _opcode = None
+    _fields = ()
+
+    @property
+    def _data(self):
+        return PacketFields(self)
 
     def __str__(self):
         return "{{event: {}, data: {}}}".format(self._event_name, self._data)
@@ -102,19 +190,19 @@ class EventPacket(object):
         return str(self)
 
     def __len__(self):
-        return len(self._data)
+        return len(self._fields)
 
 
 class ResponsePacket(object):
-    def __init__(self, command_name, opcode, data):
-        if not isinstance(data, dict):
-            raise TypeError("Data should be a dict")
-        elif not isinstance(command_name, str):
-            raise TypeError("Command name should be a string")
-        else:
-            self._command_name = command_name
-            self._opcode = opcode
-            self._data = data
+    """Base of the generated command responses, see EventPacket."""
+    __slots__ = ()
+    _command_name = None
+    _opcode = None
+    _fields = ()
+
+    @property
+    def _data(self):
+        return PacketFields(self)
 
     def __str__(self):
         return "{}: {}".format(self._command_name, self._data)
@@ -0,0 +1,365 @@
+# Copyright (c) 2010 - 2019, Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of Nordic Semiconductor ASA nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY, AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL NORDIC SEMICONDUCTOR ASA OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import sys
+
+if sys.version_info < (3, 5):
+    print(("ERROR: To use {} you need at least Python 3.5.\n" +
+           "You are currently using Python {}.{}").format(sys.argv[0], *sys.version_info))
+    sys.exit(1)
+
+import os
+import struct
+import threading
+import time
+import timeit
+
+from argparse import ArgumentParser
+
+from aci.aci_uart import Uart, FIRMWARE_RX_BUFFER_SIZE
+from aci.aci_stats import CommandLatency
+from aci.aci_evt import Event, event_deserialize
+from aci.aci_emulator import PtyEmulator
+import aci.aci_cmd as cmd
+
+
+# Start bit + 8 data bits + stop bit
+UART_BITS_PER_BYTE = 10
+
+
+def mesh_message_received_frame(payload_len):
+    """Builds a raw MeshMessageReceivedUnicast frame with the given payload length."""
+    payload = bytearray(struct.pack("<HHHHBB6sbH", 0x0002, 0x0001, 0, 0, 8, 0,
+                                    bytes(6), -40, payload_len))
+    payload += bytearray(payload_len)
+    return bytearray([len(payload) + 1, Event.MESH_MESSAGE_RECEIVED_UNICAST]) + payload
+
+
+def pty_open():
+    """Opens a pseudo terminal pair standing in for a serial device.
+
+    Returns the master file descriptor and the name of the slave device. The
+    slave file descriptor is kept open so that the master never sees a hangup.
+    """
+    master, slave = os.openpty()
+    return master, os.ttyname(slave)
+
+
+def pty_feed(master, data, baudrate):
+    """Writes data to the pty master, paced as a UART at the given baud rate.
+
+    A baud rate of 0 writes as fast as the reader keeps up.
+    """
+    view = memoryview(data)
+    sent = 0
+    start = time.monotonic()
+    while sent < len(data):
+        if baudrate:
+            allowed = int((time.monotonic() - start) * baudrate / UART_BITS_PER_BYTE)
+            if allowed <= sent:
+                time.sleep(0.001)
+                continue
+            sent += os.write(master, view[sent:min(allowed, len(data))])
+        else:
+            sent += os.write(master, view[sent:])
+
+
+def framer_benchmark(baudrate, frame_count, payload_len):
+    master, port = pty_open()
+    uart = Uart(port, device_name="bench")
+    done = threading.Event()
+    stats = {"count": 0, "first": None, "last": None}
+
+    def counter(event):
+        now = time.perf_counter()
+        if stats["first"] is None:
+            stats["first"] = now
+        stats["last"] = now
+        stats["count"] += 1
+        if stats["count"] == frame_count:
+            done.set()
+
+    uart.add_packet_recipient(counter)
+    frame = mesh_message_received_frame(payload_len)
+    feeder = threading.Thread(target=pty_feed,
+                              args=(master, frame * frame_count, baudrate))
+    feeder.start()
+    done.wait(timeout=frame_count * len(frame) * UART_BITS_PER_BYTE / max(baudrate, 9600) + 10)
+    feeder.join()
+    uart.stop()
+    uart.join()
+    os.close(master)
+
+    elapsed = (stats["last"] or 0) - (stats["first"] or 0)
+    fps = stats["count"] / elapsed if elapsed > 0 else float("inf")
+    if baudrate:
+        line_fps = baudrate / (UART_BITS_PER_BYTE * len(frame))
+        line = "{:10.0f}".format(line_fps)
+    else:
+        line = "{:>10}".format("-")
+    print("{:>9} {:>6} {:>8} {:>12.0f} {}".format(
+        baudrate or "unpaced", len(frame), stats["count"], fps, line))
+
+
+def tx_benchmark(baudrate, command_count, payload_len, window, batch_bytes, linger):
+    emulator = PtyEmulator(tx_complete=False, baudrate=baudrate)
+    uart = Uart(emulator.port, device_name="bench", rtscts=False, window=window)
+    uart.tx_batch_bytes = batch_bytes
+    uart.tx_linger = linger if batch_bytes else 0
+    for setup in [cmd.SubnetAdd(0, bytearray(16)),
+                  cmd.AppkeyAdd(0, 0, bytearray(16)),
+                  cmd.AddrLocalUnicastSet(1, 1),
+                  cmd.AddrPublicationAdd(2)]:
+        uart.write_aci_cmd(setup).result(timeout=2)
+
+    writes = [0]
+    write_frames = uart.write_frames
+
+    def counting_write_frames(frames, data=None):
+        writes[0] += 1
+        write_frames(frames, data)
+    uart.write_frames = counting_write_frames
+
+    data = bytearray(payload_len)
+    start = time.perf_counter()
+    futures = [uart.write_aci_cmd(cmd.PacketSend(0, 1, 0, 8, 0, 2, 0, data))
+               for _ in range(command_count)]
+    for future in futures:
+        future.result(timeout=10)
+    elapsed = time.perf_counter() - start
+    uart.stop()
+    uart.join()
+    emulator.stop()
+
+    print("{:>9} {:>6} {:>6} {:>8} {:>8} {:>12.0f}".format(
+        baudrate or "unpaced", window, batch_bytes or "off", command_count,
+        writes[0], command_count / elapsed))
+
+
+def echo_benchmark(port, baudrate, flow, echo_count, payload_len, depth):
+    """Echoes `echo_count` payloads with up to `depth` of them in flight.
+
+    Runs against the device on `port`, or the pty emulator if it is None.
+    `flow` is "none", "credits", "rtscts" or "both", see --flow.
+    """
+    emulator = None
+    if port is None:
+        emulator = PtyEmulator(tx_complete=False, baudrate=baudrate)
+        port = emulator.port
+    uart = Uart(port, baudrate=baudrate or 115200, device_name="bench",
+                rtscts=flow in ("rtscts", "both"), window=depth)
+    # The reset reports the device's receive buffer for credit based flow control
+    uart.write_aci_cmd(cmd.RadioReset()).result(timeout=5)
+    if flow not in ("credits", "both"):
+        uart.credits = None
+
+    data = bytearray(i & 0xFF for i in range(payload_len))
+    for _ in range(10):
+        uart.write_aci_cmd(cmd.Echo(data)).result(timeout=2)
+    uart.latency.reset()
+
+    start = time.perf_counter()
+    futures = [uart.write_aci_cmd(cmd.Echo(data)) for _ in range(echo_count)]
+    lost = 0
+    for future in futures:
+        try:
+            if future.result(timeout=10).data != data:
+                lost += 1
+        except Exception:
+            lost += 1
+    elapsed = time.perf_counter() - start
+    latency = uart.latency.stats()[CommandLatency.name(cmd.Echo(data))]
+    uart.stop()
+    uart.join()
+    if emulator:
+        emulator.stop()
+
+    echoed = echo_count - lost
+    print("{:>9} {:>6} {:>5} {:>5} {:>7} {:>5} {:>10.0f} {:>10.0f} {:>8.3f} {:>8.3f} {:>8.3f}".format(
+        baudrate or "unpaced", flow, payload_len, depth, echo_count, lost,
+        echoed / elapsed, echoed * payload_len / elapsed,
+        latency["p50"], latency["p99"], latency["max"]))
+
+
+def codec_benchmark(iterations, payload_len):
+    """Times decoding and encoding the packets on the data path, without any I/O."""
+    received = mesh_message_received_frame(payload_len)
+    response = bytearray([7, Event.CMD_RSP, 0xAB, 0, 0x01, 0x00, 0x00, 0x00])
+    data = bytearray(payload_len)
+    frame = bytearray(256)
+    cases = [
+        ("MeshMessageReceivedUnicast decode", lambda: event_deserialize(received)),
+        ("MeshMessageReceivedUnicast fields", lambda: event_deserialize(received).src),
+        ("PacketSendRsp decode", lambda: cmd.response_deserialize(event_deserialize(response))),
+        ("PacketSend encode", lambda: cmd.PacketSend(0, 1, 0, 8, 0, 2, 0, data).serialize()),
+        ("PacketSend serialize_into", lambda: cmd.PacketSend(0, 1, 0, 8, 0, 2, 0, data).serialize_into(frame)),
+    ]
+    for name, case in cases:
+        elapsed = min(timeit.repeat(case, number=iterations, repeat=3))
+        print("{:<36} {:>10.0f} {:>12.0f}".format(
+            name, elapsed / iterations * 1e9, iterations / elapsed))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(
+        description="nRF5 SDK for Mesh PyACI serial benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark")
+
+    framer = subparsers.add_parser(
+        "framer", help="Receive throughput of the UART reader over a pty")
+    framer.add_argument("-b", "--baudrate",
+                        dest="baudrates",
+                        type=int,
+                        nargs="+",
+                        default=[115200, 1000000],
+                        help=("Baud rates to emulate, 0 for unpaced. "
+                              + "Default: 115200 1000000"))
+    framer.add_argument("-n", "--frames",
+                        dest="frames",
+                        type=int,
+                        default=5000,
+                        help="Number of frames per run. Default: 5000")
+    framer.add_argument("-s", "--payload-size",
+                        dest="payload_len",
+                        type=int,
+                        default=16,
+                        help="Access payload length of each frame. Default: 16")
+
+    tx = subparsers.add_parser(
+        "tx", help="PacketSend throughput with and without TX coalescing, against the pty emulator")
+    tx.add_argument("-b", "--baudrate",
+                    dest="baudrates",
+                    type=int,
+                    nargs="+",
+                    default=[115200, 1000000],
+                    help=("Baud rates the emulated device answers at, 0 for unpaced. "
+                          + "Default: 115200 1000000"))
+    tx.add_argument("-n", "--commands",
+                    dest="commands",
+                    type=int,
+                    default=1000,
+                    help="Number of commands per run. Default: 1000")
+    tx.add_argument("-s", "--payload-size",
+                    dest="payload_len",
+                    type=int,
+                    default=8,
+                    help="Access payload length of each PacketSend. Default: 8")
+    tx.add_argument("-w", "--window",
+                    dest="windows",
+                    type=int,
+                    nargs="+",
+                    default=[1, 8, 32],
+                    help="Command windows to test. Default: 1 8 32")
+    tx.add_argument("-l", "--linger",
+                    dest="linger",
+                    type=float,
+                    default=0,
+                    help="Seconds to wait for a batch to fill when coalescing. Default: 0")
+
+    echo = subparsers.add_parser(
+        "echo", help="Serial link throughput and latency with Echo, against a device or the pty emulator")
+    echo.add_argument("-d", "--device",
+                      dest="device",
+                      default=None,
+                      help="Serial port of the device. Default: the pty emulator")
+    echo.add_argument("-b", "--baudrate",
+                      dest="baudrates",
+                      type=int,
+                      nargs="+",
+                      default=[115200, 1000000],
+                      help=("Baud rates to test, 0 for an unpaced emulator. "
+                            + "Default: 115200 1000000"))
+    echo.add_argument("-f", "--flow",
+                      dest="flows",
+                      nargs="+",
+                      choices=["none", "credits", "rtscts", "both"],
+                      default=["none", "credits"],
+                      help=("Flow control settings to test: none, credit based "
+                            + "(credits), hardware (rtscts) or both. Default: none credits"))
+    echo.add_argument("-n", "--echoes",
+                      dest="echoes",
+                      type=int,
+                      default=1000,
+                      help="Number of echoes per run. Default: 1000")
+    echo.add_argument("-s", "--payload-size",
+                      dest="payload_lens",
+                      type=int,
+                      nargs="+",
+                      default=[1, 32, 128, 254],
+                      help="Echo payload lengths to test. Default: 1 32 128 254")
+    echo.add_argument("-w", "--depth",
+                      dest="depths",
+                      type=int,
+                      nargs="+",
+                      default=[1, 4, 16],
+                      help="Number of echoes in flight to test. Default: 1 4 16")
+
+    codec = subparsers.add_parser(
+        "codec", help="Decode and encode speed of the generated aci_cmd and aci_evt packets")
+    codec.add_argument("-n", "--iterations",
+                       dest="iterations",
+                       type=int,
+                       default=100000,
+                       help="Number of iterations per packet. Default: 100000")
+    codec.add_argument("-s", "--payload-size",
+                       dest="payload_len",
+                       type=int,
+                       default=16,
+                       help="Access payload length of the mesh packets. Default: 16")
+
+    options = parser.parse_args()
+
+    if options.benchmark == "framer":
+        print("{:>9} {:>6} {:>8} {:>12} {:>10}".format(
+            "baudrate", "bytes", "frames", "frames/s", "line max"))
+        for baudrate in options.baudrates:
+            framer_benchmark(baudrate, options.frames, options.payload_len)
+    elif options.benchmark == "tx":
+        print("{:>9} {:>6} {:>6} {:>8} {:>8} {:>12}".format(
+            "baudrate", "window", "batch", "commands", "writes", "commands/s"))
+        for baudrate in options.baudrates:
+            for window in options.windows:
+                for batch_bytes in [0, FIRMWARE_RX_BUFFER_SIZE]:
+                    tx_benchmark(baudrate, options.commands, options.payload_len,
+                                 window, batch_bytes, options.linger)
+    elif options.benchmark == "echo":
+        print("{:>9} {:>6} {:>5} {:>5} {:>7} {:>5} {:>10} {:>10} {:>8} {:>8} {:>8}".format(
+            "baudrate", "flow", "bytes", "depth", "echoes", "lost", "frames/s",
+            "goodput", "p50 ms", "p99 ms", "max ms"))
+        for baudrate in options.baudrates:
+            for flow in options.flows:
+                for payload_len in options.payload_lens:
+                    for depth in options.depths:
+                        echo_benchmark(options.device, baudrate, flow, options.echoes,
+                                       payload_len, depth)
+    elif options.benchmark == "codec":
+        print("{:<36} {:>10} {:>12}".format("packet", "ns", "per second"))
+        codec_benchmark(options.iterations, options.payload_len)
+    else:
+        parser.print_help()
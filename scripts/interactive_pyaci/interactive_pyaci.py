@@ -35,6 +35,8 @@ if sys.version_info < (3, 5):
     sys.exit(1)
 
 import logging
+import logging.handlers
+import queue
 import IPython
 import DateTime
 import os
@@ -43,13 +45,16 @@ import colorama
 from argparse import ArgumentParser
 import traitlets.config
 
-from aci.aci_uart import Uart
+from aci.aci_uart import Uart, UartHub
+from aci.aci_capture import CaptureWriter
+from aci.aci_event_store import EventStore, EVENT_STORE_SIZE
 from aci.aci_utils import STATUS_CODE_LUT
 from aci.aci_config import ApplicationConfig
 import aci.aci_cmd as cmd
 import aci.aci_evt as evt
 
 from mesh import access
+from mesh.journal import StateJournal
 from mesh.provisioning import Provisioner, Provisionee  # NOQA: ignore unused import
 from mesh import types as mt                            # NOQA: ignore unused import
 from mesh.database import MeshDB                        # NOQA: ignore unused import
@@ -75,6 +80,19 @@ COLOR_LIST = [colorama.Fore.MAGENTA, colorama.Fore.CYAN,
               colorama.Fore.GREEN, colorama.Fore.YELLOW,
               colorama.Fore.BLUE, colorama.Fore.RED]
 COLOR_INDEX = 0
+# Started by configure_logger(), stopped on exit to flush the queued records
+LOG_LISTENERS = []
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queues records as they are, leaving the formatting to the listener.
+
+    The arguments of a record must not change after it is logged.
+    """
+    def prepare(self, record):
+        if record.exc_info:
+            return super().prepare(record)
+        return record
 
 
 def configure_logger(device_name):
@@ -82,7 +100,6 @@ def configure_logger(device_name):
     global COLOR_INDEX
 
     logger = logging.getLogger(device_name)
-    logger.setLevel(logging.DEBUG)
 
     stream_formatter = logging.Formatter(
         COLOR_LIST[COLOR_INDEX % len(COLOR_LIST)] + colorama.Style.BRIGHT
@@ -93,18 +110,28 @@ def configure_logger(device_name):
     stream_handler = logging.StreamHandler(sys.stdout)
     stream_handler.setFormatter(stream_formatter)
     stream_handler.setLevel(options.log_level)
-    logger.addHandler(stream_handler)
+    handlers = [stream_handler]
 
     if not options.no_logfile:
         dt = DateTime.DateTime()
         logfile = "{}_{}-{}-{}-{}_output.log".format(
             device_name, dt.yy(), dt.dayOfYear(), dt.hour(), dt.minute())
         logfile = os.path.join(LOG_DIR, logfile)
-        fh = logging.FileHandler(logfile)
+        fh = logging.handlers.RotatingFileHandler(
+            logfile, maxBytes=options.log_max_bytes, backupCount=options.log_backups)
         fh.setLevel(logging.DEBUG)
         file_formatter = logging.Formatter(FILE_LOG_FORMAT)
         fh.setFormatter(file_formatter)
-        logger.addHandler(fh)
+        handlers.append(fh)
+
+    # The handlers write from the listener's thread, so that a slow terminal
+    # or disk doesn't hold up the serial reader.
+    listener = logging.handlers.QueueListener(
+        queue.Queue(), *handlers, respect_handler_level=True)
+    logger.addHandler(DeferredQueueHandler(listener.queue))
+    logger.setLevel(min(handler.level for handler in handlers))
+    listener.start()
+    LOG_LISTENERS.append(listener)
     return logger
 
 
@@ -120,11 +147,11 @@ class Interactive(object):
                                   + "nrf_mesh_config_app.h")))
     PRINT_ALL_EVENTS = True
 
-    def __init__(self, acidev):
+    def __init__(self, acidev, journal=False):
         self.acidev = acidev
         self._event_filter = []
         self._event_filter_enabled = True
-        self._other_events = []
+        self._subscribed = False
 
         self.logger = configure_logger(self.acidev.device_name)
         self.send = self.acidev.write_aci_cmd
@@ -139,25 +166,45 @@ class Interactive(object):
         self.access = access.Access(self, self.local_unicast_address_start,
                                     self.CONFIG.ACCESS_ELEMENT_COUNT)
         self.model_add = self.access.model_add
+        # Restores keys and addresses when the device restarts, for firmware
+        # that doesn't keep them in flash itself
+        self.journal = StateJournal(self.acidev, self.access) if journal else None
 
         # Adding the packet recipient will start dynamic behavior.
         # We add it after all the member variables has been defined
-        self.acidev.add_packet_recipient(self.__event_handler)
+        self._subscribed = True
+        self._subscribe()
 
     def close(self):
         self.acidev.stop()
 
-    def events_get(self):
-        return self._other_events
+    def events_get(self, start=None, count=None):
+        """Returns received events, see EventStore.page() for the arguments."""
+        return [event for _, _, event in self.acidev.events.page(start, count)]
 
     def event_filter_add(self, event_filter):
         self._event_filter += event_filter
+        self._subscribe()
 
     def event_filter_disable(self):
         self._event_filter_enabled = False
+        self._subscribe()
 
     def event_filter_enable(self):
         self._event_filter_enabled = True
+        self._subscribe()
+
+    def _subscribe(self):
+        # The device applies the filter, so that the reader can skip decoding
+        # events no one else is interested in.
+        if self._subscribed:
+            self.acidev.add_packet_recipient(
+                self.__event_handler,
+                exclude=self._event_filter if self._event_filter_enabled else None)
+
+    def latency_dump(self):
+        """Prints the round trip time of the commands sent to the device."""
+        print(self.acidev.latency.dump())
 
     def device_port_get(self):
         return self.acidev.serial.port
@@ -170,17 +217,14 @@ class Interactive(object):
             self.CONFIG.ACCESS_ELEMENT_COUNT))
 
     def __event_handler(self, event):
-        if self._event_filter_enabled and event._opcode in self._event_filter:
-            # Ignore event
-            return
         if event._opcode == evt.Event.DEVICE_STARTED:
             self.logger.info("Device rebooted.")
 
         elif event._opcode == evt.Event.CMD_RSP:
-            if event._data["status"] != 0:
+            if event.status != 0:
                 self.logger.error("{}: {}".format(
                     cmd.response_deserialize(event),
-                    STATUS_CODE_LUT[event._data["status"]]["code"]))
+                    STATUS_CODE_LUT[event.status]["code"]))
             else:
                 text = str(cmd.response_deserialize(event))
                 if text == "None":
@@ -189,8 +233,6 @@ class Interactive(object):
         else:
             if self.PRINT_ALL_EVENTS and event is not None:
                 self.logger.info(str(event))
-            else:
-                self._other_events.append(event)
 
 
 def start_ipython(options):
@@ -211,10 +253,28 @@ def start_ipython(options):
         print("Creating log directory: {}".format(os.path.abspath(LOG_DIR)))
         os.mkdir(LOG_DIR)
 
+    hub = UartHub() if options.hub else None
     for dev_com in comports:
-        d.append(Interactive(Uart(port=dev_com,
-                                  baudrate=options.baudrate,
-                                  device_name=dev_com.split("/")[-1])))
+        device_name = dev_com.split("/")[-1]
+        spill_path = None
+        if options.event_spill:
+            spill_path = "{}-{}.events".format(options.event_spill, device_name)
+        events = EventStore(options.event_history, spill_path)
+        if hub:
+            acidev = hub.open(port=dev_com,
+                              baudrate=options.baudrate,
+                              device_name=device_name,
+                              events=events)
+        else:
+            acidev = Uart(port=dev_com,
+                          baudrate=options.baudrate,
+                          device_name=device_name,
+                          events=events)
+        acidev.segmentation = options.segmentation
+        if options.capture:
+            acidev.set_capture(CaptureWriter(
+                "{}-{}.acicap".format(options.capture, acidev.device_name)))
+        d.append(Interactive(acidev, journal=options.journal))
 
     device = d[0]
     send = device.acidev.write_aci_cmd  # NOQA: Ignore unused variable
@@ -240,6 +300,14 @@ def start_ipython(options):
     IPython.embed(config=ipython_config)
     for dev in d:
         dev.close()
+        capture = dev.acidev.set_capture(None)
+        if capture:
+            capture.close()
+        dev.acidev.events.close()
+    if hub:
+        hub.stop()
+    for listener in LOG_LISTENERS:
+        listener.stop()
     raise SystemExit(0)
 
 
@@ -259,12 +327,67 @@ if __name__ == '__main__':
                         required=False,
                         default='115200',
                         help="Baud rate. Default: 115200")
+    parser.add_argument("--hub",
+                        dest="hub",
+                        action="store_true",
+                        required=False,
+                        default=False,
+                        help=("Serve all devices from a single I/O thread "
+                              + "instead of two threads per device (POSIX only)."))
+    parser.add_argument("--capture",
+                        dest="capture",
+                        required=False,
+                        default=None,
+                        help=("Record the raw serial traffic of each device to "
+                              + "<CAPTURE>-<device>.acicap, see aci/aci_capture.py."))
+    parser.add_argument("--event-history",
+                        dest="event_history",
+                        type=int,
+                        required=False,
+                        default=EVENT_STORE_SIZE,
+                        help=("Number of received events kept in memory for each "
+                              + "device. Default: {}".format(EVENT_STORE_SIZE)))
+    parser.add_argument("--event-spill",
+                        dest="event_spill",
+                        required=False,
+                        default=None,
+                        help=("Move older events to the file <EVENT_SPILL>-<device>.events "
+                              + "instead of dropping them."))
+    parser.add_argument("--journal",
+                        dest="journal",
+                        action="store_true",
+                        required=False,
+                        default=False,
+                        help=("Restore the keys and addresses added to a device "
+                              + "when it restarts. Only for firmware built with "
+                              + "PERSISTENT_STORAGE=0, which loses them on reset."))
+    parser.add_argument("--sar",
+                        dest="segmentation",
+                        action="store_true",
+                        required=False,
+                        default=False,
+                        help=("Segment and reassemble packets longer than one "
+                              + "serial frame. Needs firmware that implements "
+                              + "the SarStart and SarContinue opcodes."))
     parser.add_argument("--no-logfile",
                         dest="no_logfile",
                         action="store_true",
                         required=False,
                         default=False,
                         help="Disables logging to file.")
+    parser.add_argument("--log-max-bytes",
+                        dest="log_max_bytes",
+                        type=int,
+                        required=False,
+                        default=10 * 1024 * 1024,
+                        help=("Size at which the log file is rotated, 0 to "
+                              + "never rotate it. Default: 10 MiB"))
+    parser.add_argument("--log-backups",
+                        dest="log_backups",
+                        type=int,
+                        required=False,
+                        default=5,
+                        help="Number of rotated log files to keep. Default: 5")
     parser.add_argument("-l", "--log-level",
                         dest="log_level",
                         type=int,
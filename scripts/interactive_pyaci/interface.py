@@ -7,11 +7,11 @@ if sys.version_info < (3, 5):
  
 
 import os
-import queue
 import threading
 import time
  
 from aci.aci_uart import Uart
+from aci.aci_executor import OrderedExecutor
 from aci.aci_utils import STATUS_CODE_LUT
 from aci.aci_config import ApplicationConfig
 import aci.aci_cmd as cmd
@@ -49,7 +49,7 @@ class Interactive(object):
         self.acidev = acidev
         self._event_filter = []
         self._event_filter_enabled = True
-        self._other_events = []
+        self._subscribed = False
  
         self.logger = Logger()
         self.send = self.acidev.write_aci_cmd
@@ -67,22 +67,35 @@ class Interactive(object):
  
         # Adding the packet recipient will start dynamic behavior.
         # We add it after all the member variables has been defined
-        self.acidev.add_packet_recipient(self.__event_handler)
+        self._subscribed = True
+        self._subscribe()
  
     def close(self):
         self.acidev.stop()
  
-    def events_get(self):
-        return self._other_events
+    def events_get(self, start=None, count=None):
+        """Returns received events, see EventStore.page() for the arguments."""
+        return [event for _, _, event in self.acidev.events.page(start, count)]
  
     def event_filter_add(self, event_filter):
         self._event_filter += event_filter
+        self._subscribe()
  
     def event_filter_disable(self):
         self._event_filter_enabled = False
+        self._subscribe()
  
     def event_filter_enable(self):
         self._event_filter_enabled = True
+        self._subscribe()
+
+    def _subscribe(self):
+        # The device applies the filter, so that the reader can skip decoding
+        # events no one else is interested in.
+        if self._subscribed:
+            self.acidev.add_packet_recipient(
+                self.__event_handler,
+                exclude=self._event_filter if self._event_filter_enabled else None)
  
     def device_port_get(self):
         return self.acidev.serial.port
@@ -95,17 +108,14 @@ class Interactive(object):
             self.CONFIG.ACCESS_ELEMENT_COUNT))
  
     def __event_handler(self, event):
-        if self._event_filter_enabled and event._opcode in self._event_filter:
-            # Ignore event
-            return
         if event._opcode == evt.Event.DEVICE_STARTED:
             self.logger.info("Device rebooted.")
  
         elif event._opcode == evt.Event.CMD_RSP:
-            if event._data["status"] != 0:
+            if event.status != 0:
                 self.logger.error("{}: {}".format(
                     cmd.response_deserialize(event),
-                    STATUS_CODE_LUT[event._data["status"]]["code"]))
+                    STATUS_CODE_LUT[event.status]["code"]))
             else:
                 text = str(cmd.response_deserialize(event))
                 if text == "None":
@@ -114,27 +124,34 @@ class Interactive(object):
         else:
             if self.PRINT_ALL_EVENTS and event is not None:
                 self.logger.info(str(event._event_name))
-            else:
-                self._other_events.append(event)
  
 class Interface:
     composition_data_event = threading.Event()
     provision_complete_event = threading.Event()
 
-    address_queue = queue.Queue(1)
-    devkey_queue = queue.Queue(1)
-
     def __init__(self, port):
         self.db = MeshDB("database/example_database.json")
 
         self.device = Interactive(Uart(port))
-        self.device.acidev.add_packet_recipient(self._event_handler)
  
         self.provisioner = Provisioner(self.device, self.db)
+        # Popped by _event_handler() when the node is provisioned
+        self.provisioner.node_handles = {}
  
         self.cc = ConfigurationClient(self.db)
         self.device.model_add(self.cc)
 
+        # Provisioning complete blocks until the composition data from the
+        # new node arrives, so handlers are keyed by provisioning context and
+        # source address and run on more than one worker.
+        self.executor = OrderedExecutor(workers=4, name="interface")
+
+        # Added after the provisioner, so that its handles for a newly
+        # provisioned node are in place when our handler sees the event.
+        self.device.acidev.add_packet_recipient(
+            self.executor.recipient(self._event_handler),
+            opcodes=[evt.Event.PROV_COMPLETE, evt.Event.MESH_MESSAGE_RECEIVED_UNICAST])
+
     def start_scan(self):
         self.provisioner.scan_start()
 
@@ -207,11 +224,11 @@ class Interface:
         return None
 
     def _get_handles(self, node):
-        self.device.send(cmd.DevkeyAdd(node.unicast_address, 0, node.device_key))
-        self.device.send(cmd.AddrPublicationAdd(node.unicast_address))
+        devkey = self.device.send(cmd.DevkeyAdd(node.unicast_address, 0, node.device_key))
+        address = self.device.send(cmd.AddrPublicationAdd(node.unicast_address))
  
-        address_handle = self.address_queue.get()
-        devkey_handle = self.devkey_queue.get()
+        address_handle = address.result().address_handle
+        devkey_handle = devkey.result().devkey_handle
  
         print('Got handle for node:', node.unicast_address, 'devkey_handle:', devkey_handle, 'address_handle:', address_handle)
 
@@ -222,17 +239,14 @@ class Interface:
         self.device.send(cmd.AddrPublicationRemove(address_handle))
  
     def _event_handler(self, event):
-        thread = threading.Thread(target = self._event_handler_thread, args=(event, ))
-        thread.start()  
- 
-    def _event_handler_thread(self, event):
         if event._opcode == evt.Event.PROV_COMPLETE:
-            print('Node provisioned with address:', hex(event._data["address"]))
+            print('Node provisioned with address:', hex(event.address))
 
-            address_handle = self.address_queue.get()
-            devkey_handle = self.devkey_queue.get()
+            devkey, address = self.provisioner.node_handles.pop(event.address)
+            address_handle = address.result().address_handle
+            devkey_handle = devkey.result().devkey_handle
  
-            unicast_address = event._data["address"]
+            unicast_address = event.address
 
             print('Got handle for node:', unicast_address, 'devkey_handle:', devkey_handle, 'address_handle:', address_handle)
  
@@ -264,15 +278,8 @@ class Interface:
 
             self.provision_complete_event.set()
 
-        if event._opcode == evt.Event.CMD_RSP:
-            result = cmd.response_deserialize(event)
-            if type(result) is cmd.AddrPublicationAddRsp:
-                self.address_queue.put(result._data["address_handle"])
-            if type(result) is cmd.DevkeyAddRsp:
-                self.devkey_queue.put(result._data["devkey_handle"])
-
         if event._opcode == evt.Event.MESH_MESSAGE_RECEIVED_UNICAST:
-            opcode = access.opcode_from_message_get(event._data["data"])          
+            opcode = access.opcode_from_message_get(event.data)          
 
             if (self.cc._COMPOSITION_DATA_STATUS.serialize() == opcode):
                 self.composition_data_event.set()
@@ -30,7 +30,7 @@
 import enum
 import logging
 
-from aci.aci_utils import value_to_barray
+from aci.aci_utils import value_to_barray, LazyHex
 from aci.aci_evt import Event
 import aci.aci_cmd as cmd
 
@@ -72,17 +72,17 @@ class Opcode(object):
 
         if company_id:
             self.length = 3
+            self._raw = bytes(value_to_barray(opcode, 1) +
+                              value_to_barray(company_id, 2, big_endian=False))
         elif opcode > 0x00FF:
             self.length = 2
+            self._raw = bytes(value_to_barray(opcode, 2, big_endian=True))
         else:
             self.length = 1
+            self._raw = bytes(value_to_barray(opcode, 1, big_endian=True))
 
     def serialize(self):
-        if self.company_id:
-            return (value_to_barray(self.opcode, 1) +
-                    value_to_barray(self.company_id, 2, big_endian=False))
-        else:
-            return value_to_barray(self.opcode, self.length, big_endian=True)
+        return bytearray(self._raw)
 
     def __str__(self):
         return self.serialize().hex()
@@ -112,9 +112,9 @@ def opcode_from_message_get(data):
 
 class AccessMessage(object):
     def __init__(self, event):
-        self.opcode_raw = opcode_from_message_get(event._data["data"])
-        self.meta = {k: v for k, v in event._data.items() if k is not "data"}
-        self.data = event._data["data"][len(self.opcode_raw):]
+        self.opcode_raw = opcode_from_message_get(event.data)
+        self.meta = {k: getattr(event, k) for k in event._fields if k != "data"}
+        self.data = event.data[len(self.opcode_raw):]
 
     def __str__(self):
         return "Opcode {}, Data {}".format(self.opcode_raw, self.data)
@@ -165,19 +165,18 @@ class Model(object):
         elif self.address_handle is None:
             raise RuntimeError("This model is not publishing to a valid address")
 
-        self.logger.debug("Sending opcode: %s, data: %s", opcode, data.hex())
-        message = opcode.serialize()
-        message += data
-
-        self.element.access.aci.send(
-            cmd.PacketSend(self.key_handle,
-                           self.element.address,
-                           self.address_handle,
-                           self.ttl,
-                           self.force_segmented,
-                           self.transmic_size,
-                           self.friendship_credentials_flag,
-                           message))
+        self.logger.debug("Sending opcode: %s, data: %s", opcode, LazyHex(data))
+        packet = cmd.PacketSend(self.key_handle,
+                                self.element.address,
+                                self.address_handle,
+                                self.ttl,
+                                self.force_segmented,
+                                self.transmic_size,
+                                self.friendship_credentials_flag,
+                                opcode._raw)
+        # The payload is copied once, into the frame on its way to the device
+        packet.append(data)
+        self.element.access.aci.send(packet)
 
 
 class Element(object):
@@ -200,7 +199,8 @@ class Access(object):
     def __init__(self, aci, element_address, num_elements=1):
         self.aci = aci
         self.elements = [Element(self, element_address + i) for i in range(num_elements)]
-        self.aci.acidev.add_packet_recipient(self.__event_handler)
+        self.aci.acidev.add_packet_recipient(self.__event_handler,
+                                             opcodes=[Event.MESH_MESSAGE_RECEIVED_UNICAST])
         self.aci.event_filter_add([Event.MESH_MESSAGE_RECEIVED_UNICAST])
 
     def model_add(self, model, idx=0):
@@ -209,7 +209,7 @@ class Access(object):
     def __event_handler(self, event):
         if event._opcode == Event.MESH_MESSAGE_RECEIVED_UNICAST:
             message = AccessMessage(event)
-            element_index = event._data["dst"] - self.elements[0].address
+            element_index = event.dst - self.elements[0].address
             assert(element_index < len(self.elements) and element_index >= 0)
             for model in self.elements[element_index].models:
                 try:
@@ -0,0 +1,229 @@
+# Copyright (c) 2010 - 2019, Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of Nordic Semiconductor ASA nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY, AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL NORDIC SEMICONDUCTOR ASA OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import logging
+import struct
+import threading
+import time
+
+import aci.aci_cmd as cmd
+from aci.aci_evt import Event
+from aci.aci_uart import PRIORITY_CRITICAL
+
+
+REPLAY_TIMEOUT = 5
+
+# Commands that add state: opcode -> (kind, parameter layout, handle in response)
+ADD_COMMANDS = {
+    0x92: ("subnet", "<H16s", "subnet_handle"),
+    0x97: ("appkey", "<HH16s", "appkey_handle"),
+    0x9C: ("devkey", "<HH16s", "devkey_handle"),
+    0xA1: ("subscription", "<H", "address_handle"),
+    0xA2: ("subscription_virtual", "<16s", "address_handle"),
+    0xA4: ("publication", "<H", "address_handle"),
+    0xA5: ("publication_virtual", "<16s", "address_handle"),
+}
+
+# Commands that drop state by handle: opcode -> kinds
+REMOVE_COMMANDS = {
+    0x94: ("subnet",),
+    0x99: ("appkey",),
+    0x9D: ("devkey",),
+    0xA3: ("subscription", "subscription_virtual"),
+    0xA6: ("publication", "publication_virtual"),
+}
+
+# Commands that replace a key: opcode -> kind
+UPDATE_COMMANDS = {
+    0x93: "subnet",
+    0x98: "appkey",
+}
+
+ADDR_LOCAL_UNICAST_SET = 0x9F
+STATE_CLEAR = 0xAC
+
+REPLAY_COMMANDS = {
+    "subnet": cmd.SubnetAdd,
+    "appkey": cmd.AppkeyAdd,
+    "devkey": cmd.DevkeyAdd,
+    "subscription": cmd.AddrSubscriptionAdd,
+    "subscription_virtual": cmd.AddrSubscriptionAddVirtual,
+    "publication": cmd.AddrPublicationAdd,
+    "publication_virtual": cmd.AddrPublicationAddVirtual,
+}
+
+
+class JournalEntry(object):
+    def __init__(self, kind, args, handle):
+        self.kind = kind
+        self.args = list(args)
+        self.handle = handle
+
+
+class StateJournal(object):
+    """Keeps the state the host has set up on the device, and restores it
+    when the device restarts.
+
+    Every confirmed command that adds keys or addresses is journaled, and
+    dropped again when the state is removed. On DeviceStarted the journal
+    is replayed as a burst: subnets, the local unicast range and addresses
+    first, then the application and device keys bound to the new subnet
+    handles. Handles held by the models of `access` are remapped to the new
+    values.
+
+    Only use it with firmware built with PERSISTENT_STORAGE=0. Otherwise the
+    device restores its state from flash, and the replay fails for keys that
+    exist already and adds references to addresses on every reset.
+    """
+    def __init__(self, device, access=None):
+        self.device = device
+        self.access = access
+        self.logger = logging.getLogger("%s.journal" % device.device_name)
+        self._lock = threading.Lock()
+        self._entries = []
+        self._unicast = None
+        self._replay_cmds = set()
+        # Seconds from the last DeviceStarted until the state was restored
+        self.ready_time = None
+        device.journal = self
+        device.add_packet_recipient(self.__event_handler, opcodes=[Event.DEVICE_STARTED])
+
+    def command(self, command, future):
+        """Called by the device for every command it queues."""
+        if command in self._replay_cmds:
+            return
+        opcode = command._opcode
+        if (opcode in ADD_COMMANDS or opcode in REMOVE_COMMANDS or opcode in UPDATE_COMMANDS
+                or opcode in (ADDR_LOCAL_UNICAST_SET, STATE_CLEAR)):
+            future.add_done_callback(lambda f: self._confirmed(command, f))
+
+    def entries(self):
+        with self._lock:
+            return list(self._entries)
+
+    def _confirmed(self, command, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+
+        opcode = command._opcode
+        data = bytes(command._data)
+        with self._lock:
+            if opcode in ADD_COMMANDS:
+                kind, layout, handle_name = ADD_COMMANDS[opcode]
+                handle = getattr(future.result(), handle_name)
+                self._entries.append(JournalEntry(kind, struct.unpack(layout, data), handle))
+            elif opcode in REMOVE_COMMANDS:
+                handle, = struct.unpack("<H", data)
+                for entry in self._entries:
+                    if entry.kind in REMOVE_COMMANDS[opcode] and entry.handle == handle:
+                        self._entries.remove(entry)
+                        break
+            elif opcode in UPDATE_COMMANDS:
+                handle, key = struct.unpack("<H16s", data)
+                for entry in self._entries:
+                    if entry.kind == UPDATE_COMMANDS[opcode] and entry.handle == handle:
+                        entry.args[-1] = key
+            elif opcode == ADDR_LOCAL_UNICAST_SET:
+                self._unicast = struct.unpack("<HH", data)
+            elif opcode == STATE_CLEAR:
+                self._entries = []
+                self._unicast = None
+
+    def __event_handler(self, event):
+        with self._lock:
+            if not self._entries and self._unicast is None:
+                return
+        # Waits for responses, so it can't run on the reader thread
+        threading.Thread(target=self._replay, args=(time.perf_counter(),)).start()
+
+    def _send(self, command):
+        self._replay_cmds.add(command)
+        return self.device.write_aci_cmd(command, priority=PRIORITY_CRITICAL)
+
+    def _burst(self, entries, subnets):
+        """Sends the entries' commands back to back, then waits for all of them.
+
+        Key entries are bound to the new subnet handles in `subnets`. Returns
+        (kind, old handle, new handle) for the entries that were restored.
+        """
+        sent = []
+        for entry in entries:
+            args = list(entry.args)
+            if entry.kind in ("appkey", "devkey"):
+                args[1] = subnets.get(args[1], args[1])
+            command = REPLAY_COMMANDS[entry.kind](*args)
+            sent.append((entry, args, command, self._send(command)))
+
+        restored = []
+        for entry, args, command, future in sent:
+            try:
+                handle = getattr(future.result(REPLAY_TIMEOUT), ADD_COMMANDS[command._opcode][2])
+            except Exception as e:
+                self.logger.error("Unable to restore %s: %r", entry.kind, e)
+                continue
+            finally:
+                self._replay_cmds.discard(command)
+            restored.append((entry.kind, entry.handle, handle))
+            with self._lock:
+                entry.args = args
+                entry.handle = handle
+        return restored
+
+    def _replay(self, started):
+        with self._lock:
+            entries = list(self._entries)
+            unicast = self._unicast
+
+        if unicast is not None:
+            unicast_cmd = cmd.AddrLocalUnicastSet(*unicast)
+            unicast_future = self._send(unicast_cmd)
+        restored = self._burst([e for e in entries if e.kind not in ("appkey", "devkey")], {})
+        if unicast is not None:
+            try:
+                unicast_future.result(REPLAY_TIMEOUT)
+            except Exception as e:
+                self.logger.error("Unable to restore the local unicast addresses: %r", e)
+            self._replay_cmds.discard(unicast_cmd)
+
+        subnets = {old: new for kind, old, new in restored if kind == "subnet"}
+        addresses = {old: new for kind, old, new in restored if kind != "subnet"}
+        keys = {old: new for kind, old, new in
+                self._burst([e for e in entries if e.kind in ("appkey", "devkey")], subnets)}
+
+        if self.access is not None:
+            for element in self.access.elements:
+                for model in element.models:
+                    if model.key_handle in keys:
+                        model.key_handle = keys[model.key_handle]
+                    if model.address_handle in addresses:
+                        model.address_handle = addresses[model.address_handle]
+
+        self.ready_time = time.perf_counter() - started
+        self.logger.info("State restored after reset: %d commands in %.1f ms",
+                         len(entries) + (unicast is not None), self.ready_time * 1000)
@@ -119,11 +119,25 @@ class OOBInputAction(object):
     ENTER_STRING = 0x03
 
 
+# Events handled by the provisioning devices
+PROV_EVENTS = [Event.PROV_UNPROVISIONED_RECEIVED,
+               Event.PROV_LINK_ESTABLISHED,
+               Event.PROV_LINK_CLOSED,
+               Event.PROV_CAPS_RECEIVED,
+               Event.PROV_INVITE_RECEIVED,
+               Event.PROV_COMPLETE,
+               Event.PROV_AUTH_REQUEST,
+               Event.PROV_ECDH_REQUEST,
+               Event.PROV_OUTPUT_REQUEST,
+               Event.PROV_FAILED,
+               Event.PROV_START_RECEIVED]
+
+
 class ProvDevice(object):
     def __init__(self, interactive_device, context_id, auth_data,
                  event_handler, enable_event_filter):
         self.iaci = interactive_device
-        self.iaci.acidev.add_packet_recipient(event_handler)
+        self.iaci.acidev.add_packet_recipient(event_handler, opcodes=PROV_EVENTS)
         self.logger = self.iaci.logger
         self.__context_id = context_id
         self.__private_key = None
@@ -163,23 +177,23 @@ class ProvDevice(object):
     def default_handler(self, event):
         if event._opcode == Event.PROV_ECDH_REQUEST:
             self.logger.info("ECDH request received")
-            public_key_peer = raw_to_public_key(event._data["peer_public"])
-            private_key = raw_to_private_key(event._data["node_private"])
+            public_key_peer = raw_to_public_key(event.peer_public)
+            private_key = raw_to_private_key(event.node_private)
             shared_secret = private_key.exchange(ec.ECDH(), public_key_peer)
-            self.iaci.send(cmd.EcdhSecret(event._data["context_id"],
+            self.iaci.send(cmd.EcdhSecret(event.context_id,
                                           shared_secret))
 
         elif event._opcode == Event.PROV_AUTH_REQUEST:
             self.logger.info("Authentication request")
-            if event._data["method"] == OOBMethod.NONE:
+            if event.method == OOBMethod.NONE:
                 pass
-            elif event._data["method"] == OOBMethod.STATIC:
+            elif event.method == OOBMethod.STATIC:
                 self.logger.info("Providing static data")
                 self.iaci.send(cmd.AuthData(self.__context_id,
                                             self.__auth_data))
             else:
                 self.logger.error("Unsupported authetication method {}".format(
-                    event._data["method"]))
+                    event.method))
 
         elif event._opcode == Event.PROV_LINK_ESTABLISHED:
             self.logger.info("Link established")
@@ -194,8 +208,8 @@ class ProvDevice(object):
             self.logger.error("Unsupported output request")
         elif event._opcode == Event.PROV_FAILED:
             self.logger.error("Provisioning failed with error {} ({})".format
-                              (PROV_FAILED_ERRORS[int(event._data["error_code"])],
-                               event._data["error_code"]))
+                              (PROV_FAILED_ERRORS[int(event.error_code)],
+                               event.error_code))
 
         else:
             pass
@@ -214,6 +228,13 @@ class Provisioner(ProvDevice):
         self.prov_db = None
         self.__session_data = {}
         self.__next_free_address = None
+        # Set to a dict to collect the futures for the devkey and address
+        # handles of each new node, by unicast address. Whoever sets it owns
+        # the entries and pops them. They are cleared when the device
+        # restarts, as the handles are gone then.
+        self.node_handles = None
+        self.iaci.acidev.add_packet_recipient(self.__device_started,
+                                              opcodes=[Event.DEVICE_STARTED])
         self.load(prov_db)
 
     def load(self, prov_db):
@@ -300,40 +321,42 @@ class Provisioner(ProvDevice):
 
     def __event_handler(self, event):
         if event._opcode == Event.PROV_UNPROVISIONED_RECEIVED:
-            uuid = event._data["uuid"]
-            rssi = event._data["rssi"]
+            uuid = event.uuid
+            rssi = event.rssi
             if uuid not in self.unprov_list:
                 self.logger.info(
                     "Received UUID {} with RSSI: {} dB".format(uuid.hex(), rssi))
                 self.unprov_list.append(uuid)
 
         elif event._opcode == Event.PROV_CAPS_RECEIVED:
-            element_count = event._data["num_elements"]
+            element_count = event.num_elements
             self.logger.info("Received capabilities")
             self.logger.info("Number of elements: {}".format(element_count))
 
-            self.iaci.send(cmd.OobUse(event._data["context_id"], OOBMethod.NONE, 0, 0))
+            self.iaci.send(cmd.OobUse(event.context_id, OOBMethod.NONE, 0, 0))
             self.__session_data["elements"] = [mt.Element(i) for i in range(element_count)]
 
         elif event._opcode == Event.PROV_COMPLETE:
             num_elements = len(self.__session_data["elements"])
-            address_range = "{}-{}".format(hex(event._data["address"]),
-                                           hex(event._data["address"]
+            address_range = "{}-{}".format(hex(event.address),
+                                           hex(event.address
                                                + num_elements - 1))
 
             self.logger.info("Provisioning complete")
             self.logger.info("\tAddress(es): " + address_range)
-            self.logger.info("\tDevice key: {}".format(event._data["device_key"].hex()))
-            self.logger.info("\tNetwork key: {}".format(event._data["net_key"].hex()))
-            self.logger.info("Adding device key to subnet %d", event._data["net_key_index"])
+            self.logger.info("\tDevice key: {}".format(event.device_key.hex()))
+            self.logger.info("\tNetwork key: {}".format(event.net_key.hex()))
+            self.logger.info("Adding device key to subnet %d", event.net_key_index)
             # Devkey added to subnet 0.
-            self.iaci.send(cmd.DevkeyAdd(event._data["address"], 0,
-                                         event._data["device_key"]))
+            devkey = self.iaci.send(cmd.DevkeyAdd(event.address, 0,
+                                                  event.device_key))
 
             self.logger.info("Adding publication address of root element")
-            self.iaci.send(cmd.AddrPublicationAdd(event._data["address"]))
+            address = self.iaci.send(cmd.AddrPublicationAdd(event.address))
+            if self.node_handles is not None:
+                self.node_handles[event.address] = (devkey, address)
 
-            self.__session_data["device_key"] = event._data["device_key"]
+            self.__session_data["device_key"] = event.device_key
             self.store(self.__session_data)
 
             # Update address to the next in range
@@ -342,6 +365,10 @@ class Provisioner(ProvDevice):
         else:
             self.default_handler(event)
 
+    def __device_started(self, event):
+        if self.node_handles:
+            self.node_handles.clear()
+
     def store(self, data):
         self.prov_db.nodes.append(mt.Node(**self.__session_data))
         self.prov_db.store()
@@ -363,7 +390,7 @@ class Provisionee(ProvDevice):
 
     def __event_handler(self, event):
         if event._opcode == Event.PROV_INVITE_RECEIVED:
-            attention_duration_s = event._data["attention_duration_s"]
+            attention_duration_s = event.attention_duration_s
             self.logger.info("Provisioning Invite received")
             self.logger.info("\tAttention Duration [s]: {}".format(attention_duration_s))
 
@@ -371,31 +398,31 @@ class Provisionee(ProvDevice):
             self.logger.info("Provisioning Start received")
 
         elif event._opcode == Event.PROV_COMPLETE:
-            address_range = "{}-{}".format(hex(event._data["address"]),
-                                           hex(event._data["address"]
+            address_range = "{}-{}".format(hex(event.address),
+                                           hex(event.address
                                                + self.__num_elements - 1))
             self.logger.info("Provisioning complete")
             self.logger.info("\tAddress(es): " + address_range)
             self.logger.info("\tDevice key: {}".format(
-                event._data["device_key"].hex()))
+                event.device_key.hex()))
             self.logger.info("\tNetwork key: {}".format(
-                event._data["net_key"].hex()))
+                event.net_key.hex()))
 
             self.logger.info("Adding network key (subnet)")
-            self.iaci.send(cmd.SubnetAdd(event._data["net_key_index"],
-                                         event._data["net_key"]))
+            self.iaci.send(cmd.SubnetAdd(event.net_key_index,
+                                         event.net_key))
 
             self.logger.info("Adding device key to subnet 0")
-            self.iaci.send(cmd.DevkeyAdd(event._data["address"], 0,
-                                         event._data["device_key"]))
+            self.iaci.send(cmd.DevkeyAdd(event.address, 0,
+                                         event.device_key))
             self.logger.info("Setting the local unicast address range")
-            self.iaci.send(cmd.AddrLocalUnicastSet(event._data["address"],
+            self.iaci.send(cmd.AddrLocalUnicastSet(event.address,
                                                    self.__num_elements))
 
             # A slight hack to update the access "layer" in case
             # anyone wants to try to run this as a provisionee
             for index, element in enumerate(self.iaci.access.elements):
-                element.address = event._data["address"] + index
+                element.address = event.address + index
 
         else:
             self.default_handler(event)
@@ -0,0 +1,71 @@
+# Copyright (c) 2010 - 2019, Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of Nordic Semiconductor ASA nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY, AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL NORDIC SEMICONDUCTOR ASA OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""Tests of the responses of aci_emulator.AciEmulator against the firmware's
+serial handlers in mesh/serial/src.
+"""
+
+import unittest
+
+import aci.aci_cmd as cmd
+from aci.aci_emulator import EmulatedDevice
+from aci.aci_evt import Event
+
+
+class TestKeyResponses(unittest.TestCase):
+    def setUp(self):
+        self.dev = EmulatedDevice()
+        self.addCleanup(self.dev.stop)
+        self.responses = []
+        self.dev.add_packet_recipient(self.responses.append, opcodes=[Event.CMD_RSP])
+
+    def send(self, command):
+        return self.dev.write_aci_cmd(command).result(1)
+
+    def test_devkey_delete_returns_handle(self):
+        subnet = self.send(cmd.SubnetAdd(0, bytearray(16))).subnet_handle
+        devkey = self.send(cmd.DevkeyAdd(0x0010, subnet, bytearray(16))).devkey_handle
+        self.assertEqual(self.send(cmd.DevkeyDelete(devkey)).devkey_handle, devkey)
+
+    def test_appkey_get_all_without_keys_has_no_data(self):
+        subnet = self.send(cmd.SubnetAdd(0, bytearray(16))).subnet_handle
+        self.send(cmd.AppkeyGetAll(subnet))
+        self.assertEqual(self.responses[-1].status, 0)
+        self.assertEqual(bytes(self.responses[-1].data), b"")
+
+    def test_appkey_get_all_lists_indexes(self):
+        subnet = self.send(cmd.SubnetAdd(0, bytearray(16))).subnet_handle
+        self.send(cmd.AppkeyAdd(3, subnet, bytearray(16)))
+        response = self.send(cmd.AppkeyGetAll(subnet))
+        self.assertEqual(response.subnet_handle, subnet)
+        self.assertEqual(bytes(response.appkey_key_index), b"\x03\x00")
+
+
+if __name__ == "__main__":
+    unittest.main()
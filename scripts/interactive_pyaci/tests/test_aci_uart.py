@@ -0,0 +1,179 @@
+# Copyright (c) 2010 - 2019, Nordic Semiconductor ASA
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+#    list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of Nordic Semiconductor ASA nor the names of its
+#    contributors may be used to endorse or promote products derived from this
+#    software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY, AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL NORDIC SEMICONDUCTOR ASA OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+"""Tests of the command queue of aci_uart.Device, run from
+scripts/interactive_pyaci with `python -m unittest discover tests`.
+"""
+
+import asyncio
+import concurrent.futures
+import os
+import struct
+import time
+import unittest
+from unittest import mock
+
+import aci.aci_cmd as cmd
+import aci.aci_uart as aci_uart
+from aci.aci_evt import Event
+from serial import SerialException
+
+
+def addr_get_rsp(handle):
+    """A CmdRsp frame answering AddrGet for `handle`."""
+    payload = struct.pack("<HBBH", handle, 0, 0, 0x1000 + handle) + bytes(16)
+    return bytes([len(payload) + 3, Event.CMD_RSP, cmd.AddrGet(handle)._opcode, 0]) + payload
+
+
+class ScriptedDevice(aci_uart.Device):
+    """A Device without a transport, that records the written frames."""
+    def __init__(self, window=4):
+        self.written = []
+        aci_uart.Device.__init__(self, "scripted", window, start_writer=False)
+
+    def write_data(self, data):
+        self.written.append(bytes(data))
+
+    def _writer_notify(self):
+        pass
+
+
+class TestLanes(unittest.TestCase):
+    def setUp(self):
+        self.dev = ScriptedDevice()
+        self.addCleanup(self.dev.kill_writer)
+
+    def test_held_bulk_lane_does_not_block_critical(self):
+        dev = self.dev
+        dev.rtt.timeout = lambda opcode: 0.05
+        dev.write_aci_cmd(cmd.PacketSend(0, 1, 0, 8, 0, 0, 0, bytearray(4)))
+        dev.service_writes()
+        time.sleep(0.06)
+        # The late response to the timed out PacketSend is awaited for long
+        dev.rtt.timeout = lambda opcode: 5.0
+        with mock.patch.object(aci_uart, "STARVATION_TIMEOUT", 0.0):
+            dev.write_aci_cmd(cmd.PacketSend(0, 1, 0, 8, 0, 0, 0, bytearray(4)))
+            dev.service_writes()
+            self.assertEqual(len(dev.written), 1)
+
+            dev.write_aci_cmd(cmd.EcdhSecret(0, bytearray(32)))
+            dev.service_writes()
+        self.assertEqual(len(dev.written), 2)
+        self.assertEqual(dev.written[1][1], cmd.EcdhSecret(0, bytearray(32))._opcode)
+
+
+@unittest.skipUnless(os.name == "posix", "needs a pty")
+class TestAsyncUart(unittest.TestCase):
+    def setUp(self):
+        import pty
+        import tty
+        self.master, slave = pty.openpty()
+        tty.setraw(self.master)
+        self.port = os.ttyname(slave)
+        self.addCleanup(os.close, slave)
+        self.addCleanup(os.close, self.master)
+
+    def run_async(self, test):
+        async def main():
+            dev = aci_uart.AsyncUart(self.port, rtscts=False)
+            try:
+                await test(dev)
+            finally:
+                dev.close()
+        asyncio.run(main())
+
+    def written(self):
+        return os.read(self.master, 1024)
+
+    def test_late_response_does_not_answer_next_command(self):
+        async def test(dev):
+            with self.assertRaises(asyncio.TimeoutError):
+                await dev.send(cmd.AddrGet(1), timeout=0.05)
+            second = asyncio.ensure_future(dev.send(cmd.AddrGet(2), timeout=1))
+            await asyncio.sleep(0.02)
+            # Held until the late response comes
+            self.assertEqual(len(self.written()), len(cmd.AddrGet(1).serialize()))
+            os.write(self.master, addr_get_rsp(1))
+            await asyncio.sleep(0.02)
+            self.assertEqual(self.written(), bytes(cmd.AddrGet(2).serialize()))
+            os.write(self.master, addr_get_rsp(2))
+            self.assertEqual((await second).address_handle, 2)
+            self.assertEqual(dev.late_responses, 1)
+        self.run_async(test)
+
+    def test_hold_expires_when_response_is_lost(self):
+        async def test(dev):
+            with self.assertRaises(asyncio.TimeoutError):
+                await dev.send(cmd.AddrGet(1), timeout=0.05)
+            self.written()
+            second = asyncio.ensure_future(dev.send(cmd.AddrGet(2), timeout=1))
+            await asyncio.sleep(0.1)
+            self.assertEqual(self.written(), bytes(cmd.AddrGet(2).serialize()))
+            os.write(self.master, addr_get_rsp(2))
+            self.assertEqual((await second).address_handle, 2)
+            self.assertEqual(dev.late_responses, 0)
+        self.run_async(test)
+
+
+@unittest.skipUnless(os.name == "posix", "needs a pty")
+class TestUartHub(unittest.TestCase):
+    def open_pty(self):
+        import pty
+        import tty
+        master, slave = pty.openpty()
+        tty.setraw(master)
+        self.addCleanup(os.close, slave)
+        self.addCleanup(os.close, master)
+        return master, os.ttyname(slave)
+
+    def test_failing_device_does_not_stop_the_others(self):
+        _, broken_port = self.open_pty()
+        master, port = self.open_pty()
+        hub = aci_uart.UartHub()
+        self.addCleanup(hub.join, 2)
+        self.addCleanup(hub.stop)
+        broken = hub.open(broken_port, rtscts=False)
+        dev = hub.open(port, rtscts=False)
+
+        def write(data):
+            raise SerialException("write failed")
+        broken.serial.write = write
+        with self.assertRaises(concurrent.futures.CancelledError):
+            broken.write_aci_cmd(cmd.AddrGet(1)).result(1)
+        self.assertNotIn(broken, hub.devices)
+
+        future = dev.write_aci_cmd(cmd.AddrGet(2))
+        self.assertEqual(os.read(master, 1024), bytes(cmd.AddrGet(2).serialize()))
+        os.write(master, addr_get_rsp(2))
+        self.assertEqual(future.result(1).address_handle, 2)
+        self.assertTrue(hub.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
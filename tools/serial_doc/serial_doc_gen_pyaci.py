@@ -65,7 +65,7 @@ LICENSE_TEXT ="""# Copyright (c) 2010 - 2019, Nordic Semiconductor ASA
 CMD_HEADER = """{}
 
 # This file was autogenerated by {} at {}.
-from aci.aci_utils import CommandPacket, ResponsePacket, value_to_barray, iterable_to_barray, barray_pop
+from aci.aci_utils import CommandPacket, ResponsePacket, iterable_to_barray
 from aci.aci_evt import CmdRsp
 import struct
 
@@ -76,54 +76,64 @@ import struct
 EVT_HEADER = """{}
 
 # This file was autogenerated by {} at {}.
-from aci.aci_utils import EventPacket, barray_pop
+from aci.aci_utils import EventPacket
 import struct
 
 """.format(LICENSE_TEXT,
            os.path.basename(sys.argv[0]),
            datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
 
-CMD_CLASS_FMT = """class {camel_name}(CommandPacket):
+CMD_CLASS_FMT = """{structs}class {camel_name}(CommandPacket):
     \"\"\"{description}\"\"\"
-    def __init__(self{param_list}):
-        __data = bytearray(){param_inits}
+    def __init__(self{param_list}):{param_inits}
         super({camel_name}, self).__init__(0x{opcode:02X}, __data)
 
 
 """
 
-CMD_RSP_CLASS_FMT = """class {camel_name}Rsp(ResponsePacket):
+CMD_RSP_CLASS_FMT = """{structs}class {camel_name}Rsp(ResponsePacket):
     \"\"\"Response to a(n) {camel_name} command.\"\"\"
-    def __init__(self, raw_data):
-        __data = {{}}{deserialize}
-        super({camel_name}Rsp, self).__init__(\"{camel_name}\", 0x{opcode:02X}, __data)
+    _command_name = \"{camel_name}\"
+    _opcode = 0x{opcode:02X}
+    _fields = {fields}
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):{deserialize}
 
 
 """
 
 
-RSP_LUT_FUNCTION_FMT = """def response_deserialize(rsp):
+RSP_LUT_FUNCTION_FMT = """# Response classes indexed by command opcode
+RESPONSE_TABLE = tuple(RESPONSE_LUT[opcode]["object"] if opcode in RESPONSE_LUT else None
+                       for opcode in range(256))
+
+
+def response_deserialize(rsp):
     if not isinstance(rsp, CmdRsp):
         raise TypeError("Expected a CmdRsp object.")
-    elif not rsp._data["opcode"] in RESPONSE_LUT:
-        return None
 
-    response = RESPONSE_LUT[rsp._data["opcode"]]
+    response = RESPONSE_TABLE[rsp.opcode]
+    if response is None:
+        return None
     # Response is always {opcode, status, [...]}
-    if len(rsp._data["data"]) > 0:
-        return response["object"](rsp._data["data"])
+    if len(rsp.data) > 0:
+        return response(rsp.data)
     else:
-        return response["name"]
+        return response._command_name
 
 
 """
 
 
-EVT_CLASS_FMT = """class {camel_name}(EventPacket):
+EVT_CLASS_FMT = """{structs}class {camel_name}(EventPacket):
     \"\"\"{description}\"\"\"
-    def __init__(self, raw_data):
-        __data = {{}}{deserialize}
-        super({camel_name}, self).__init__(\"{camel_name}\", 0x{opcode:02X}, __data)
+    _event_name = \"{camel_name}\"
+    _opcode = 0x{opcode:02X}
+    _fields = {fields}
+    __slots__ = _fields
+
+    def __init__(self, raw_data, offset=0):{deserialize}
 
 
 """
@@ -132,10 +142,10 @@ EVT_DESERIALIZE_FMT = """def event_deserialize(data):
     if not isinstance(data, bytearray):
         raise TypeError(\"Expected bytearray\")
 
-    if data[1] in EVENT_LUT:
-        return EVENT_LUT[data[1]](data[2:])
-    else:
+    event = EVENT_TABLE[data[1]]
+    if event is None:
         return None
+    return event(data, 2)
 
 
 """
@@ -220,70 +230,132 @@ def get_variable_fmt(param):
 
 
 
-def serialize_variable(outname, param):
-    fmt = get_variable_fmt(param)
-    if fmt:
-        return "{outname} += struct.pack(\"{fmt}\", {param_name})".format(
-            outname=outname, fmt="<" + fmt, param_name=snakeify(param.name))
-    else:
-        return "{outname} += {param_name}".format(outname=outname, param_name=snakeify(param.name))
+def struct_name(name, index=None):
+    name = "_" + snakeify(name).upper()
+    if index is not None:
+        name += "_{}".format(index)
+    return name
+
+
+def struct_fmt(name, fmt):
+    return "{} = struct.Struct(\"{}\")\n\n\n".format(name, fmt)
 
-def build_data(params):
+
+def serialize_runs(params):
+    """Splits command parameters into runs of struct packed values and single arrays.
+
+    Returns a list of (format, params) for the runs and (None, [param]) for
+    the arrays, which are copied as they are.
+    """
+    runs = []
+    for p in params:
+        fmt = get_variable_fmt(p) if p.array_len <= 1 else None
+        if fmt and runs and runs[-1][0]:
+            runs[-1] = (runs[-1][0] + fmt, runs[-1][1] + [p])
+        elif fmt:
+            runs.append(("<" + fmt, [p]))
+        else:
+            runs.append((None, [p]))
+    return runs
+
+
+def serialize_structs(name, params):
+    runs = serialize_runs(params)
+    packed = [fmt for fmt, _ in runs if fmt]
+    if len(packed) == 1:
+        return struct_fmt(struct_name(name), packed[0])
+    return "".join(struct_fmt(struct_name(name, i), fmt) for i, fmt in enumerate(packed))
+
+
+def build_data(name, params):
     if len(params) == 0:
-        return ""
+        return "\n        __data = bytearray()"
 
     eol = "\n"
-    ret = eol
+    ret = ""
     indent = " " * 4
     outname = "__data"
-    for p in params:
+    runs = serialize_runs(params)
+    packed = len([fmt for fmt, _ in runs if fmt])
+    index = 0
+    for fmt, run in runs:
+        if fmt:
+            sname = struct_name(name, index if packed > 1 else None)
+            values = ", ".join(snakeify(p.name) for p in run)
+            index += 1
+            if not ret:
+                ret += eol + indent * 2 + "{} = bytearray({}.size)".format(outname, sname)
+                ret += eol + indent * 2 + "{}.pack_into({}, 0, {})".format(sname, outname, values)
+                continue
+            ret += eol + indent * 2 + "{} += {}.pack({})".format(outname, sname, values)
+            continue
+        if not ret:
+            ret += eol + indent * 2 + "{} = bytearray()".format(outname)
+        p = run[0]
         if p.array_len > 1:
-            ret += indent * 2 + outname + " += iterable_to_barray({})".format(snakeify(p.name))
+            ret += eol + indent * 2 + outname + " += iterable_to_barray({})".format(snakeify(p.name))
         else:
-            ret += indent * 2 + serialize_variable(outname, p)
-        ret += eol
-    return ret.rstrip()
+            ret += eol + indent * 2 + "{} += {}".format(outname, snakeify(p.name))
+    return ret
+
+
+def is_array(param):
+    return param.array_len > 1 or param.length > 4
+
 
+def deserialize_fmt(params):
+    """Returns the struct format of the fixed prefix of the parameters.
 
-def deserialize_variable(outname, inname, index, param):
-    fmt = None
-    outname = outname.strip()
-    inname = inname.strip()
-    fmt = "<" + get_variable_fmt(param)
-    return "{outname}[\"{param_name}\"], = struct.unpack(\"{fmt}\", {inname}[{begin}:{end}])".format(
-        outname=outname, param_name=snakeify(param.name), inname=inname, fmt=fmt, begin=index, end=index + param.length)
+    The prefix ends with the last value, arrays within it are skipped with
+    pad bytes and sliced from the raw data. None if there are no values.
+    """
+    values = [i for i, p in enumerate(params) if not is_array(p)]
+    if not values:
+        return None
+    fmt = "<"
+    for p in params[:values[-1] + 1]:
+        fmt += "{}x".format(p.length) if is_array(p) else get_variable_fmt(p)
+    return fmt
+
+
+def deserialize_structs(name, params):
+    fmt = deserialize_fmt(params)
+    return struct_fmt(struct_name(name), fmt) if fmt else ""
 
-def deserialize_array(outname, inname, index, param):
+
+def deserialize_array(index, param):
     if param.name.lower() == "data":
         end = ""
     else:
-        end = str(index + max(param.array_len, param.length))
-    return "{outname}[\"{param_name}\"] = raw_data[{begin}:{end}]".format(
-        outname=outname, param_name=snakeify(param.name), inname=inname, begin=index, end=end)
+        end = "offset + " + str(index + max(param.array_len, param.length))
+    return "raw_data[offset + {begin}:{end}]".format(begin=index, end=end)
 
 
-def deserialize(params):
-    if len(params) == 0:
-        return ""
+def fields(params):
+    names = ["\"{}\"".format(snakeify(p.name)) for p in params]
+    if len(names) == 1:
+        return "({},)".format(names[0])
+    return "({})".format(", ".join(names))
+
 
-    start = " " * 8 + "__data"
+def deserialize(name, params):
     indent = " " * 4
     eol = "\n"
-    index = 0
-    input_name = "raw_data"
-    output_name = "__data"
+    if len(params) == 0:
+        return eol + indent * 2 + "pass"
 
-    ret = eol
-    for p in params:
-        if p.array_len > 1 or p.length > 4:
-            ret += indent * 2 + deserialize_array("__data", "raw_data", index, p)
-        else:
-            ret += indent * 2 + deserialize_variable("__data", "raw_data", index, p)
+    ret = ""
+    if deserialize_fmt(params):
+        values = ["self." + snakeify(p.name) for p in params if not is_array(p)]
+        ret += eol + indent * 2 + "{}{} = {}.unpack_from(raw_data, offset)".format(
+            ", ".join(values), "," if len(values) == 1 else "", struct_name(name))
 
-        ret += eol
+    index = 0
+    for p in params:
+        if is_array(p):
+            ret += eol + indent * 2 + "self.{} = {}".format(snakeify(p.name), deserialize_array(index, p))
         index += p.length
-
-    return ret.rstrip()
+    return ret
 
 
 class AciCommand(object):
@@ -294,10 +366,11 @@ class AciCommand(object):
         self.opcode = opcode
 
     def __str__(self):
-        return CMD_CLASS_FMT.format(camel_name=camelify(self.name),
+        return CMD_CLASS_FMT.format(structs=serialize_structs(self.name, self.params),
+                                    camel_name=camelify(self.name),
                                     description=description_fmt(self.description, self.params),
                                     param_list=paramify(self.params),
-                                    param_inits=build_data(self.params),
+                                    param_inits=build_data(self.name, self.params),
                                     opcode=self.opcode)
 
 
@@ -308,8 +381,10 @@ class AciResponse(object):
         self.params = params
 
     def __str__(self):
-        return CMD_RSP_CLASS_FMT.format(camel_name=camelify(self.name),
-                                        deserialize=deserialize(self.params),
+        return CMD_RSP_CLASS_FMT.format(structs=deserialize_structs(self.name + " rsp", self.params),
+                                        camel_name=camelify(self.name),
+                                        fields=fields(self.params),
+                                        deserialize=deserialize(self.name + " rsp", self.params),
                                         opcode=self.opcode)
 
 
@@ -321,9 +396,11 @@ class AciEvent(object):
         self.params = params
 
     def __str__(self):
-        return EVT_CLASS_FMT.format(camel_name=camelify(self.name),
+        return EVT_CLASS_FMT.format(structs=deserialize_structs(self.name, self.params),
+                                    camel_name=camelify(self.name),
                                     description=description_fmt(self.description, self.params),
-                                    deserialize=deserialize(self.params),
+                                    fields=fields(self.params),
+                                    deserialize=deserialize(self.name, self.params),
                                     opcode=self.opcode)
 
 
@@ -392,7 +469,9 @@ class AciGenerator(gen.DocGenerator):
         events = ["    Event.{}: {}".format(snakeify(evt.raw_name).upper(),
                                                   camelify(evt.raw_name))
                   for evt in parser.events]
-        buf += ",\n".join(sorted(events)) + "\n}\n\n\n"
+        buf += ",\n".join(sorted(events)) + "\n}\n\n"
+        buf += "# Event classes indexed by opcode\n"
+        buf += "EVENT_TABLE = tuple(EVENT_LUT.get(opcode) for opcode in range(256))\n\n\n"
 
         # Make lookup function
         buf += EVT_DESERIALIZE_FMT